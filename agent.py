@@ -1,11 +1,61 @@
 # WumpusWorldGame/agent.py
 
+import random
 from config import Config
-from knowledgebase import KnowledgeBase # Assuming a KB for advanced reasoning
+from cow import copy_attributes
+from knowledgebase import KnowledgeBase, STATUS_SAFE, STATUS_PIT, STATUS_WUMPUS # Assuming a KB for advanced reasoning
+from known_map import KnownMap
+from probability import ProbabilityEngine
+from planner import DStarLite
+from expectimax import ENTER, SHOOT, shared_planner
+
+# Row/column offset of one step in each facing direction
+DIRECTION_OFFSETS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
 
 class WumpusAgent:
-    def __init__(self, config: Config):
+    # __dict__ stays available (allocated only on first use) so instrumentation and the
+    # trajectory recorder can still wrap methods on individual agents
+    __slots__ = ("config", "row", "col", "direction", "has_gold", "has_arrow", "score", "percepts",
+                 "known_map", "changed_cells", "knowledge_base", "probability_engine",
+                 "explore_planner", "home_planner", "task_planner", "risky_cell", "rng", "__dict__")
+
+    def __init__(self, config: Config, rng=None):
         self.config = config
+
+        # Agent's internal map of what it knows, as status codes, percept bits and a visited
+        # bitset; every cell starts out Unknown
+        self.known_map = KnownMap(config)
+        self.changed_cells = set() # Cells of known_grid modified since the GUI last redrew
+
+        self.knowledge_base = KnowledgeBase(config, sat=config.SAT_ENTAILMENT) # For logical inference
+        self.probability_engine = ProbabilityEngine(config) # Pit/Wumpus probabilities for risky choices
+
+        # Incremental planners over known-safe cells: towards unvisited safe cells, back to
+        # the start, and towards one-off targets (a spot to shoot from, a risky cell to try)
+        start = config.AGENT_START
+        self.explore_planner = DStarLite(config.GRID_SIZE, start)
+        self.home_planner = DStarLite(config.GRID_SIZE, start, goals=[start])
+        self.task_planner = DStarLite(config.GRID_SIZE, start)
+        self._start(rng)
+
+    def reset(self, rng=None):
+        """
+        Puts the agent back at the start of a new game on the same grid, knowing nothing.
+        The map, knowledge base and planners are emptied in place rather than rebuilt.
+        """
+        self.known_map.reset()
+        self.changed_cells.clear()
+        self.knowledge_base.reset()
+        self.probability_engine.reset()
+        start = self.config.AGENT_START
+        self.explore_planner.reset(start)
+        self.home_planner.reset(start, goals=[start])
+        self.task_planner.reset(start)
+        self._start(rng)
+
+    def _start(self, rng):
+        config = self.config
+        self.rng = rng if rng is not None else random # random.Random-like source for any random choices
         self.row, self.col = config.AGENT_START
         self.direction = "right" # Initial direction: right, up, left, down
         self.has_gold = False
@@ -13,21 +63,27 @@ class WumpusAgent:
         self.score = 0
         self.percepts = [] # Current percepts (Breeze, Stench, Glitter, Bump, Scream)
 
-        # Agent's internal map of what it knows
-        # Values could be: "Unknown", "Safe", "Breeze", "Stench", "Pit?", "Wumpus?"
-        # Initialize as all "Unknown"
-        self.known_grid = {}
-        for r in range(self.config.GRID_SIZE):
-            for c in range(self.config.GRID_SIZE):
-                self.known_grid[(r, c)] = {"status": "Unknown", "percepts": [], "visited": False}
-        self.known_grid[self.row, self.col]["visited"] = True
-        self.known_grid[self.row, self.col]["status"] = "Safe"
-
-        self.knowledge_base = KnowledgeBase(config) # For logical inference
+        start_index = self.known_map.index(self.row, self.col)
+        self.known_map.mark_visited(start_index)
+        self.known_map.set_status(start_index, STATUS_SAFE)
         self.knowledge_base.tell(f"Safe({self.row},{self.col})")
 
+        start = (self.row, self.col)
+        for planner in (self.explore_planner, self.home_planner, self.task_planner):
+            planner.set_passable(start)
+        self.risky_cell = None # The one unproven cell task_planner may walk into, if any
+
+    @property
+    def known_grid(self):
+        """Read-only known_grid[(r, c)]["status" | "percepts" | "visited"] view of known_map."""
+        return self.known_map
+
     def update_percepts(self, percepts):
         self.percepts = percepts
+        if self.config.SCREAM in percepts:
+            # The Wumpus is dead, so stench-based suspicions no longer apply
+            self.probability_engine.wumpus_dead = True
+            self._refresh_statuses(self.knowledge_base.tell_wumpus_dead())
 
     def update_score(self, amount):
         self.score += amount
@@ -36,7 +92,11 @@ class WumpusAgent:
         self.row = new_row
         self.col = new_col
         self.score += self.config.MOVE_COST
-        self.known_grid[(self.row, self.col)]["visited"] = True
+        self.known_map.mark_visited(self.known_map.index(self.row, self.col))
+        self.changed_cells.add((self.row, self.col))
+        self.explore_planner.remove_goal((self.row, self.col))
+        for planner in (self.explore_planner, self.home_planner, self.task_planner):
+            planner.move_start((self.row, self.col))
 
     def shoot(self):
         if self.has_arrow:
@@ -70,61 +130,57 @@ class WumpusAgent:
         self.direction = directions[(current_index - 1 + 4) % 4]
 
     def infer_from_percepts(self):
-        # This is where the agent's logical reasoning happens.
-        # It updates its 'known_grid' based on current percepts and rules.
-        # Example: If a square is safe and has a breeze, its neighbors *might* have pits.
-        # If a square is safe and has a stench, its neighbors *might* have a wumpus.
-
+        # The knowledge base does the logical reasoning: the current percepts are added as
+        # clauses and forward chaining derives which cells are safe, pits or the Wumpus.
+        # Only the cells whose knowledge changed are written back to known_map.
         r, c = self.row, self.col
-        self.known_grid[(r, c)]["percepts"] = self.percepts # Store current percepts
-
-        # Mark current cell as safe if not already marked as such (e.g., if it was just visited)
-        if self.known_grid[(r, c)]["status"] != "Wumpus?" and self.known_grid[(r, c)]["status"] != "Pit?":
-            self.known_grid[(r, c)]["status"] = "Safe"
-            self.knowledge_base.tell(f"Safe({r},{c})")
-
-        neighbors = self._get_neighbors(r, c)
-
-        if self.config.BREEZE in self.percepts:
-            # If breeze, mark neighbors as potentially having a pit
-            for nr, nc in neighbors:
-                if self.known_grid[(nr, nc)]["status"] == "Unknown":
-                    self.known_grid[(nr, nc)]["status"] = "Pit?"
-                    self.knowledge_base.tell(f"MaybePit({nr},{nc})")
-
-        if self.config.STENCH in self.percepts:
-            # If stench, mark neighbors as potentially having a wumpus
-            for nr, nc in neighbors:
-                if self.known_grid[(nr, nc)]["status"] == "Unknown":
-                    self.known_grid[(nr, nc)]["status"] = "Wumpus?"
-                    self.knowledge_base.tell(f"MaybeWumpus({nr},{nc})")
-
-        if not self.config.BREEZE in self.percepts:
-            # If no breeze, neighbors are safe from pits
-            for nr, nc in neighbors:
-                if self.known_grid[(nr, nc)]["status"] == "Pit?":
-                    self.known_grid[(nr, nc)]["status"] = "Safe"
-                    self.knowledge_base.tell(f"Safe({nr},{nc})")
-                elif self.known_grid[(nr, nc)]["status"] == "Unknown":
-                    self.known_grid[(nr, nc)]["status"] = "Safe"
-                    self.knowledge_base.tell(f"Safe({nr},{nc})")
-
-        if not self.config.STENCH in self.percepts:
-            # If no stench, neighbors are safe from wumpus
-            for nr, nc in neighbors:
-                if self.known_grid[(nr, nc)]["status"] == "Wumpus?":
-                    self.known_grid[(nr, nc)]["status"] = "Safe"
-                    self.knowledge_base.tell(f"Safe({nr},{nc})")
-                elif self.known_grid[(nr, nc)]["status"] == "Unknown":
-                    self.known_grid[(nr, nc)]["status"] = "Safe"
-                    self.knowledge_base.tell(f"Safe({nr},{nc})")
-
-        # More complex inferences using the KB (e.g., if A is safe, and B is adjacent to A,
-        # and A has a breeze, then if C is another safe neighbor of A, and C has no breeze,
-        # then the pit must be near B). This is where the KB shines.
-        # This is a placeholder for more advanced logical inference.
-        # For example, if KB says "NOT Pit(x,y)", update known_grid accordingly.
-        # self.knowledge_base.ask("Pit(x,y)") etc.
+        self.known_map.set_percepts(self.known_map.index(r, c), self.percepts) # Store current percepts
+        self.changed_cells.add((r, c))
+
+        self._refresh_statuses(self.knowledge_base.tell_percepts(r, c, self.percepts))
+        self.probability_engine.observe(r, c, self.percepts)
+
+    def beliefs(self):
+        """Exact pit and Wumpus probabilities for every cell, given everything perceived so far."""
+        return self.probability_engine.compute()
+
+    def _refresh_statuses(self, changed_cells):
+        # KB cell indices are r * grid_size + c, the same as known_map's
+        known_map = self.known_map
+        for index in changed_cells:
+            cell = self.knowledge_base.cell_of(index)
+            status = self.knowledge_base.cell_status_code(index)
+            known_map.set_status(index, status)
+            self.changed_cells.add(cell)
+            if status == STATUS_SAFE:
+                for planner in (self.explore_planner, self.home_planner, self.task_planner):
+                    planner.set_passable(cell)
+                if not known_map.is_visited(index):
+                    self.explore_planner.add_goal(cell)
+
+    def fork(self):
+        """
+        An independent copy of this agent. The map, knowledge base, probability engine and
+        planners are forked copy-on-write, so the copy costs little until either agent
+        learns something, when each part it writes is copied whole once. Method wrappers
+        installed on this instance are not carried over.
+        """
+        cls = type(self)
+        clone = cls.__new__(cls)
+        copy_attributes(self, clone, skip_functions=True)
+        clone.changed_cells = set(self.changed_cells)
+        clone.known_map = self.known_map.fork()
+        clone.knowledge_base = self.knowledge_base.fork()
+        clone.probability_engine = self.probability_engine.fork()
+        clone.explore_planner = self.explore_planner.fork()
+        clone.home_planner = self.home_planner.fork()
+        clone.task_planner = self.task_planner.fork()
+        return clone
+
+    def take_changed_cells(self):
+        """Returns the cells changed since the last call and starts a new change set."""
+        changed, self.changed_cells = self.changed_cells, set()
+        return changed
 
     def _get_neighbors(self, r, c):
         neighbors = []
@@ -134,11 +190,189 @@ class WumpusAgent:
                 neighbors.append((nr, nc))
         return neighbors
 
-    # Placeholder for AI agent's decision-making
+    # Maximum probability of dying the agent accepts when no safe cell is left to explore
+    risk_tolerance = 0.5
+
+    def choose_action(self):
+        """
+        Built-in autonomous policy. Grabs the gold when it glitters and walks back to the
+        start to climb out once it has it. Otherwise explores the nearest unvisited cell
+        known to be safe, shoots a Wumpus whose location is proven, and as a last resort
+        steps into the least dangerous frontier cell. Returns an (action_type, direction)
+        tuple, or None when there is nothing worth doing.
+        """
+        position = (self.row, self.col)
+        if self.config.GLITTER in self.percepts and not self.has_gold:
+            return ("grab", None)
+        if self.has_gold:
+            if position == self.config.AGENT_START:
+                return ("climb", None)
+            return self._step_towards(self.home_planner)
+
+        action = self._step_towards(self.explore_planner)
+        if action is None and self._prove_frontier():
+            action = self._step_towards(self.explore_planner)
+        if action is None:
+            action = self._hunt_wumpus()
+        if action is None:
+            action = self._try_risky_cell()
+        if action is None and position != self.config.AGENT_START:
+            action = self._step_towards(self.home_planner)
+        return action
+
+    def _step_towards(self, planner):
+        step = planner.next_step()
+        if step is None:
+            return None
+        for direction, (dr, dc) in DIRECTION_OFFSETS.items():
+            if (self.row + dr, self.col + dc) == step:
+                return ("move", direction)
+        return None
+
+    def _face(self, direction):
+        # Turn towards direction (None once facing it); turn_left goes right -> up -> left -> down
+        order = ["right", "up", "left", "down"]
+        left_turns = (order.index(direction) - order.index(self.direction)) % 4
+        if left_turns == 0:
+            return None
+        return ("turn", "right") if left_turns == 3 else ("turn", "left")
+
+    def _prove_frontier(self):
+        """
+        With the SAT backend (Config.SAT_ENTAILMENT), settles the frontier cells forward
+        chaining left open: whatever the solver proves safe, a pit or the Wumpus is told to
+        the KB like a percept-derived fact. Returns True if a cell was proven safe.
+        """
+        kb = self.knowledge_base
+        if kb.solver is None:
+            return False
+        known_map = self.known_map
+        proven_safe = False
+        seen = set()
+        for r, c in self.probability_engine.visited:
+            for cell in self._get_neighbors(r, c):
+                # status is read each time: telling the KB rewrites it (and may copy it after a fork)
+                if cell in seen or known_map.status[known_map.index(*cell)] in (STATUS_SAFE, STATUS_PIT, STATUS_WUMPUS):
+                    continue
+                seen.add(cell)
+                for name in ("Safe", "Pit", "Wumpus"):
+                    if kb.entails(name, *cell):
+                        self._refresh_statuses(kb.tell(f"{name}({cell[0]},{cell[1]})"))
+                        proven_safe = proven_safe or name == "Safe"
+                        break
+        return proven_safe
+
+    def _set_risky_cell(self, cell):
+        # task_planner walks on proven-safe cells plus at most the one risky cell being
+        # tried, so routes (and shooting spots) never lead through earlier unproven targets
+        previous = self.risky_cell
+        if previous == cell:
+            return
+        if previous is not None and self.known_map.status[self.known_map.index(*previous)] != STATUS_SAFE:
+            self.task_planner.set_passable(previous, False)
+        self.risky_cell = cell
+        if cell is not None:
+            self.task_planner.set_passable(cell)
+
+    def _hunt_wumpus(self):
+        kb = self.knowledge_base
+        if not self.has_arrow or kb.wumpus_dead or not kb.wumpus_candidates or len(kb.wumpus_candidates) != 1:
+            return None
+        wumpus = kb.cell_of(next(iter(kb.wumpus_candidates)))
+        if kb.values[kb.wumpus_var(kb.cell_index(*wumpus))] != 1:
+            return None
+        for direction, (dr, dc) in DIRECTION_OFFSETS.items():
+            if (self.row + dr, self.col + dc) == wumpus:
+                return self._face(direction) or ("shoot", None)
+        self._set_risky_cell(None)
+        spots = [cell for cell in self._get_neighbors(*wumpus) if cell in self.task_planner.passable]
+        self.task_planner.set_goals(spots)
+        return self._step_towards(self.task_planner)
+
+    def _try_risky_cell(self):
+        beliefs = self.beliefs()
+        status = self.known_map.status
+        best, best_danger = None, self.risk_tolerance
+        for r, c in self.probability_engine.visited:
+            for cell in self._get_neighbors(r, c):
+                if status[self.known_map.index(*cell)] in (STATUS_SAFE, STATUS_PIT, STATUS_WUMPUS):
+                    continue
+                danger = beliefs.danger(*cell)
+                if danger < best_danger - 1e-9: # Ties up to rounding keep the first cell found
+                    best, best_danger = cell, danger
+        if best is None:
+            return None
+        self._set_risky_cell(best)
+        self.task_planner.set_goals([best])
+        return self._step_towards(self.task_planner)
+
+
+class RandomAgent(WumpusAgent):
+    """
+    Baseline policy for headless runs: grabs gold when it glitters, climbs out when
+    it can, and otherwise moves in a random direction.
+    """
+
+    __slots__ = ()
+
     def choose_action(self):
-        # This function would contain the AI's logic to decide its next move.
-        # For a human-played game, this function is not needed.
-        # For an AI, it would use self.known_grid and self.percepts
-        # to decide whether to move, shoot, grab, or climb.
-        # E.g., if glitter, grab gold. If safe path, move. If wumpus suspected, shoot.
-        pass
\ No newline at end of file
+        if self.config.GLITTER in self.percepts and not self.has_gold:
+            return ("grab", None)
+        if self.has_gold and (self.row, self.col) == self.config.AGENT_START:
+            return ("climb", None)
+        return ("move", self.rng.choice(["up", "down", "left", "right"]))
+
+
+class ExpectimaxAgent(WumpusAgent):
+    """
+    The built-in policy, except that once no safe cell is left to explore the choice
+    between stepping into an unknown cell, shooting at a suspected Wumpus and giving up is
+    made by a bounded-depth expectimax search over belief states (see expectimax.py).
+    """
+
+    __slots__ = ("planner",)
+
+    def __init__(self, config: Config, planner=None, rng=None):
+        super().__init__(config, rng)
+        self.planner = planner or shared_planner(config)
+
+    def choose_action(self):
+        position = (self.row, self.col)
+        if self.config.GLITTER in self.percepts and not self.has_gold:
+            return ("grab", None)
+        if self.has_gold:
+            if position == self.config.AGENT_START:
+                return ("climb", None)
+            return self._step_towards(self.home_planner)
+
+        action = self._step_towards(self.explore_planner)
+        if action is None and self._prove_frontier():
+            action = self._step_towards(self.explore_planner)
+        if action is None:
+            action = self._hunt_wumpus()
+        if action is None:
+            action = self._plan_risky()
+        if action is None and position != self.config.AGENT_START:
+            action = self._step_towards(self.home_planner)
+        return action
+
+    def _plan_risky(self):
+        _, decision = self.planner.decide(self)
+        if decision is None:
+            return None
+        if decision[0] == ENTER:
+            cell = decision[1]
+            self._set_risky_cell(cell)
+            self.task_planner.set_goals([cell])
+            return self._step_towards(self.task_planner)
+        if decision[0] == SHOOT:
+            _, target, spot = decision
+            self._set_risky_cell(None)
+            if (self.row, self.col) == spot:
+                dr, dc = target[0] - self.row, target[1] - self.col
+                for direction, offset in DIRECTION_OFFSETS.items():
+                    if offset == (dr, dc):
+                        return self._face(direction) or ("shoot", None)
+            self.task_planner.set_goals([spot])
+            return self._step_towards(self.task_planner)
+        return None
@@ -0,0 +1,303 @@
+# WumpusWorldGame/benchmark.py
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from config import Config
+from environment import WumpusEnvironment
+from agent import WumpusAgent
+from simulation import SimulationEngine, apply_action
+
+DEFAULT_GRID_SIZES = (4, 8, 16, 32)
+DEFAULT_PIT_DENSITIES = (0.1, 0.2)
+DEFAULT_TOLERANCE = 0.25 # Flag a regression when a benchmark gets 25% slower than the baseline
+
+
+def make_config(grid_size, pit_density):
+    config = Config()
+    config.GRID_SIZE = grid_size
+    config.NUM_PITS = max(0, min(round(pit_density * (grid_size * grid_size - 1)), grid_size * grid_size - 3))
+    return config
+
+
+def _timed(func, repeat, number):
+    """Runs func number times per sample, repeat samples; returns per-call times in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return samples
+
+
+def _reference_work():
+    table = {}
+    for i in range(2000):
+        table[(i, i & 7)] = i * 3
+    sorted(table.items(), key=lambda item: -item[1])
+
+
+def calibrate():
+    """
+    Fastest time in microseconds of a fixed pure-Python workload, measured next to every
+    benchmark so compare() can factor out how fast the machine was at the time (shared or
+    throttled CPUs easily drift by half between runs).
+    """
+    return min(_timed(_reference_work, 10, 3))
+
+
+def _summary(samples, **extra):
+    result = {"median_us": statistics.median(samples), "min_us": min(samples), "samples": len(samples)}
+    result.update(extra)
+    return result
+
+
+# --- Individual benchmarks ------------------------------------------------
+
+def bench_environment_construction(config, seed, repeat):
+    seeds = iter(range(seed, seed + 10 ** 9))
+    return _summary(_timed(lambda: WumpusEnvironment(config, seed=next(seeds)), repeat, 50))
+
+
+def bench_get_percepts(config, seed, repeat):
+    environment = WumpusEnvironment(config, seed=seed)
+    cells = [(r, c) for r in range(config.GRID_SIZE) for c in range(config.GRID_SIZE)]
+
+    def run():
+        for r, c in cells:
+            environment.get_percepts_at_location(r, c)
+    samples = _timed(run, repeat, 5)
+    return _summary([s / len(cells) for s in samples])
+
+
+def bench_kill_wumpus(config, seed, repeat):
+    environments = [WumpusEnvironment(config, seed=seed + i) for i in range(repeat * 20)]
+    pending = iter(environments)
+    return _summary(_timed(lambda: next(pending).kill_wumpus(), repeat, 20))
+
+
+def bench_infer_from_percepts(config, seed, repeat):
+    # Time only the agent's inference along episodes played by the built-in policy
+    samples = []
+    engine = SimulationEngine(config, WumpusAgent)
+    for episode in range(repeat):
+        game_logic = engine.new_game(seed + episode)
+        agent = game_logic.agent
+        timings = []
+        infer = agent.infer_from_percepts
+
+        def timed_infer():
+            start = time.perf_counter()
+            infer()
+            timings.append(time.perf_counter() - start)
+        agent.infer_from_percepts = timed_infer
+
+        steps = 0
+        while game_logic.game_state == config.GAME_RUNNING and steps < engine.max_steps:
+            action = agent.choose_action()
+            if action is None:
+                break
+            apply_action(game_logic, *action)
+            steps += 1
+        if timings:
+            samples.append(sum(timings) / len(timings) * 1e6)
+    return _summary(samples or [0.0])
+
+
+def bench_episode_throughput(config, seed, repeat):
+    # Every sample plays the same episodes, so samples differ only by timing noise
+    engine = SimulationEngine(config, WumpusAgent)
+    samples = []
+    for _ in range(repeat):
+        steps = 0
+        start = time.perf_counter()
+        for episode in range(5):
+            steps += engine.play_episode(seed + episode).steps
+        samples.append((time.perf_counter() - start) / max(steps, 1) * 1e6)
+    return _summary(samples, steps_per_second=1e6 / min(samples) if min(samples) else 0.0, episodes=5)
+
+
+def bench_update_grid(config, seed, repeat):
+    """Full and incremental WumpusGUI.update_grid, under a virtual display when none is available."""
+    display = None
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        try:
+            from pyvirtualdisplay import Display
+        except ImportError:
+            return {"skipped": "no DISPLAY and pyvirtualdisplay is not installed"}
+        try:
+            display = Display(visible=False, size=(1600, 1200))
+            display.start()
+        except Exception as e:
+            return {"skipped": f"could not start a virtual display: {e}"}
+    try:
+        import tkinter as tk
+        from ui import WumpusGUI
+        root = tk.Tk()
+        try:
+            game_logic = SimulationEngine(config, WumpusAgent).new_game(seed)
+            gui = WumpusGUI(root, game_logic, config)
+            gui.pack()
+            root.update()
+            agent = game_logic.agent
+
+            def full():
+                gui.cell_appearance.clear()
+                gui.update_grid(agent.known_grid)
+                root.update_idletasks()
+            full_samples = _timed(full, repeat, 3)
+
+            incremental_samples = []
+            for _ in range(repeat):
+                action = agent.choose_action()
+                if action is None or game_logic.game_state != config.GAME_RUNNING:
+                    break
+                apply_action(game_logic, *action)
+                start = time.perf_counter()
+                gui.update_grid(agent.known_grid, agent.take_changed_cells())
+                root.update_idletasks()
+                incremental_samples.append((time.perf_counter() - start) * 1e6)
+            result = _summary(full_samples)
+            if incremental_samples:
+                result["incremental_median_us"] = statistics.median(incremental_samples)
+            return result
+        finally:
+            root.destroy()
+    finally:
+        if display is not None:
+            display.stop()
+
+
+BENCHMARKS = {
+    "environment_construction": bench_environment_construction,
+    "get_percepts_at_location": bench_get_percepts,
+    "kill_wumpus": bench_kill_wumpus,
+    "infer_from_percepts": bench_infer_from_percepts,
+    "episode_throughput": bench_episode_throughput,
+    "update_grid": bench_update_grid,
+}
+
+
+# --- Suite, storage and comparison ----------------------------------------
+
+def run_suite(grid_sizes=DEFAULT_GRID_SIZES, pit_densities=DEFAULT_PIT_DENSITIES, seed=1234, repeat=5,
+              only=None, log=print, keys=None):
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for grid_size in grid_sizes:
+            for density in pit_densities:
+                key = f"{name}[grid={grid_size},density={density}]"
+                if keys is not None and key not in keys:
+                    continue
+                # As in timeit, collection pauses (which depend on whatever earlier benchmarks
+                # left alive) are kept out of the timings
+                gc.collect()
+                gc.disable()
+                try:
+                    calibration_us = calibrate()
+                    results[key] = bench(make_config(grid_size, density), seed, repeat)
+                finally:
+                    gc.enable()
+                results[key]["calibration_us"] = calibration_us
+                if log:
+                    entry = results[key]
+                    log(f"{key}: " + (entry["skipped"] if "skipped" in entry else f"{entry['median_us']:.2f} us (min {entry['min_us']:.2f})"))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def save_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares the fastest sample of every benchmark against a baseline run (noise only ever
+    adds time, so the minimum is the steadiest statistic). A benchmark counts as slower only
+    if it is slower both as measured and scaled by the calibration times of both runs, so
+    neither a slow machine nor a noisy calibration is reported. The allowed slowdown is tolerance plus the relative spread between median
+    and minimum of both runs, so noisy benchmarks need a larger change to be flagged.
+    Returns a list of (key, baseline_us, current_us, ratio) for every benchmark slower
+    than that.
+    """
+    regressions = []
+    for key, entry in current["results"].items():
+        old = baseline["results"].get(key)
+        if not old or "min_us" not in old or "min_us" not in entry or old["min_us"] <= 0:
+            continue
+        ratio = entry["min_us"] / old["min_us"]
+        if entry.get("calibration_us") and old.get("calibration_us"):
+            ratio = min(ratio, ratio * old["calibration_us"] / entry["calibration_us"])
+        noise = max(entry["median_us"] / entry["min_us"] - 1.0 if entry["min_us"] > 0 else 0.0,
+                    old["median_us"] / old["min_us"] - 1.0)
+        if ratio > 1.0 + tolerance + noise:
+            regressions.append((key, old["min_us"], entry["min_us"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wumpus World performance benchmarks")
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=list(DEFAULT_GRID_SIZES))
+    parser.add_argument("--pit-densities", type=float, nargs="+", default=list(DEFAULT_PIT_DENSITIES))
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write this run's results")
+    parser.add_argument("--baseline", help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write this run to --baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.grid_sizes, args.pit_densities, args.seed, args.repeat, args.only)
+    save_results(results, args.output)
+
+    if args.baseline:
+        if args.save_baseline or not os.path.exists(args.baseline):
+            save_results(results, args.baseline)
+            print(f"Baseline written to {args.baseline}")
+            return 0
+        baseline = load_results(args.baseline)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            # Time the flagged benchmarks once more and keep the faster run, so a burst of
+            # machine noise during one benchmark is not reported as a regression
+            retry = run_suite(args.grid_sizes, args.pit_densities, args.seed, args.repeat, args.only,
+                              log=None, keys={key for key, *_ in regressions})
+            for key, entry in retry["results"].items():
+                if entry.get("min_us", float("inf")) < results["results"][key]["min_us"]:
+                    results["results"][key] = entry
+            save_results(results, args.output)
+            regressions = compare(results, baseline, args.tolerance)
+        for key, old, new, ratio in regressions:
+            print(f"REGRESSION {key}: {old:.2f} us -> {new:.2f} us ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
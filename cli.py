@@ -0,0 +1,135 @@
+# WumpusWorldGame/cli.py
+
+# Headless entry point. Only config is imported up front; everything else, and tkinter/PIL
+# above all, is imported inside the command that needs it, so a short scripted job pays
+# for interpreter startup and the game modules it actually uses.
+
+import argparse
+import sys
+
+from config import Config
+
+
+def _make_config(args):
+    config = Config()
+    config.GRID_SIZE = args.grid_size
+    if args.pits is not None:
+        config.NUM_PITS = args.pits
+    config.SAT_ENTAILMENT = args.sat
+    return config
+
+
+def _play(args):
+    from environment import LazyWumpusEnvironment, WumpusEnvironment
+    from simulation import EpisodeResult, SimulationEngine, apply_action, load_agent_class
+
+    config = _make_config(args)
+    environment_class = LazyWumpusEnvironment if args.lazy_world else WumpusEnvironment
+    engine = SimulationEngine(config, load_agent_class(args.agent), args.max_steps, environment_class=environment_class)
+    results = []
+    for seed in range(args.seed, args.seed + args.episodes):
+        if not args.verbose:
+            results.append(engine.play_episode(seed))
+            continue
+        game_logic = engine.new_game(seed)
+        agent = game_logic.agent
+        steps = 0
+        while game_logic.game_state == config.GAME_RUNNING and steps < engine.max_steps:
+            action = agent.choose_action()
+            if action is None:
+                break
+            _, message = apply_action(game_logic, *action)
+            steps += 1
+            print(f"{steps:>5} {action[0]:<6}{action[1] or '':<6} ({agent.row},{agent.col}) "
+                  f"score {agent.score:>6} {message}")
+        results.append(EpisodeResult(seed, agent.score, game_logic.game_state, steps))
+
+    rows = [{"seed": r.seed, "score": r.score, "state": r.game_state, "steps": r.steps} for r in results]
+    if args.json:
+        import json
+        print(json.dumps(rows))
+    else:
+        for row in rows:
+            print(f"seed {row['seed']}: {row['state']} with score {row['score']} after {row['steps']} steps")
+    return 0
+
+
+def _batch(args):
+    from simulation import run_batch, load_agent_class
+
+    result = run_batch(args.episodes, _make_config(args), load_agent_class(args.agent), args.seed,
+                       args.processes, args.chunk_size, args.max_steps)
+    summary = result.summary()
+    if args.json:
+        import json
+        print(json.dumps(summary))
+    else:
+        for key, value in summary.items():
+            print(f"{key:<20}{value:.4g}" if isinstance(value, float) else f"{key:<20}{value}")
+    return 0
+
+
+def _bench(args):
+    import benchmark
+    return benchmark.main(args.benchmark_args)
+
+
+def _gui(args):
+    import tkinter as tk
+    from main import WumpusGameApp
+
+    root = tk.Tk()
+    app = WumpusGameApp(root)
+    app.config = _make_config(args)
+    app.setup_initial_config_ui() # Show the command-line settings in the start form
+    root.mainloop()
+    return 0
+
+
+def build_parser():
+    defaults = Config()
+    world = argparse.ArgumentParser(add_help=False)
+    world.add_argument("--grid-size", type=int, default=defaults.GRID_SIZE)
+    world.add_argument("--pits", type=int, help=f"Number of pits (default {defaults.NUM_PITS})")
+    world.add_argument("--sat", action="store_true", help="Let the agent prove frontier cells with the SAT solver")
+
+    runs = argparse.ArgumentParser(add_help=False, parents=[world])
+    runs.add_argument("--agent", default="WumpusAgent", help='Agent class as "module:Class" or a class in agent.py')
+    runs.add_argument("--seed", type=int, default=0, help="Seed of the first episode; episodes use consecutive seeds")
+    runs.add_argument("--episodes", type=int, default=1)
+    runs.add_argument("--max-steps", type=int)
+    runs.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    parser = argparse.ArgumentParser(description="Headless Wumpus World runner")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("play", parents=[runs], help="Play episodes in this process")
+    play.add_argument("--verbose", action="store_true", help="Print every action")
+    play.add_argument("--lazy-world", action="store_true", help="Generate cells on demand (for huge grids)")
+    play.set_defaults(func=_play)
+
+    batch = commands.add_parser("batch", parents=[runs], help="Play episodes across a process pool")
+    batch.add_argument("--processes", type=int)
+    batch.add_argument("--chunk-size", type=int, default=1000)
+    batch.set_defaults(func=_batch)
+
+    bench = commands.add_parser("bench", help="Run benchmark.py; any further arguments are passed on to it")
+    bench.set_defaults(func=_bench)
+
+    gui = commands.add_parser("gui", parents=[world], help="Open the Tkinter game")
+    gui.set_defaults(func=_gui)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "bench":
+        args.benchmark_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
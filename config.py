@@ -7,6 +7,9 @@ class Config:
         self.WUMPUS_COUNT = 1
         self.GOLD_COUNT = 1
         self.AGENT_START = (0, 0) # Agent always starts at (0,0) in Wumpus World
+        # Let the built-in agents ask the CDCL solver about frontier cells that forward
+        # chaining could not settle (complete, but slower per decision)
+        self.SAT_ENTAILMENT = False
 
         # Score parameters
         self.MOVE_COST = -1
@@ -0,0 +1,143 @@
+# WumpusWorldGame/corpus.py
+
+import mmap
+import os
+import random
+import struct
+
+from config import Config
+from environment import WumpusEnvironment, generate_layout
+
+MAGIC = b"WUMPUSC1"
+# magic, grid size, reserved, record size, record count
+_HEADER = struct.Struct("<8sHHIQ")
+# Wumpus cell index, gold cell index; the pit bitmask follows
+_POSITIONS = struct.Struct("<II")
+
+
+def record_size(grid_size):
+    return _POSITIONS.size + (grid_size * grid_size + 7) // 8
+
+
+def encode_world(grid_size, wumpus_pos, gold_pos, pit_mask):
+    """Packs a world layout into its fixed-width binary record."""
+    mask_bytes = (grid_size * grid_size + 7) // 8
+    return (_POSITIONS.pack(wumpus_pos[0] * grid_size + wumpus_pos[1], gold_pos[0] * grid_size + gold_pos[1])
+            + pit_mask.to_bytes(mask_bytes, "little"))
+
+
+def decode_world(grid_size, record):
+    """Unpacks a binary record into (wumpus_pos, gold_pos, pit_mask)."""
+    wumpus_index, gold_index = _POSITIONS.unpack_from(record)
+    pit_mask = int.from_bytes(record[_POSITIONS.size:], "little")
+    return divmod(wumpus_index, grid_size), divmod(gold_index, grid_size), pit_mask
+
+
+class WorldCorpusWriter:
+    """
+    Appends worlds to a corpus file: a small header followed by fixed-width records, so any
+    world can later be read by index without scanning. The record count in the header is
+    rewritten on close().
+    """
+
+    def __init__(self, path, grid_size, append=False):
+        self.grid_size = grid_size
+        self.record_size = record_size(grid_size)
+        if append and os.path.exists(path):
+            self._file = open(path, "r+b")
+            magic, size, _, rec_size, count = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != MAGIC or size != grid_size or rec_size != self.record_size:
+                self._file.close()
+                raise ValueError(f"{path} is not a {grid_size}x{grid_size} world corpus")
+            self.count = count
+            self._file.seek(_HEADER.size + count * self.record_size)
+        else:
+            self._file = open(path, "wb")
+            self.count = 0
+            self._write_header()
+
+    def _write_header(self):
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, self.grid_size, 0, self.record_size, self.count))
+        self._file.seek(max(position, _HEADER.size))
+
+    def write(self, wumpus_pos, gold_pos, pit_mask):
+        self._file.write(encode_world(self.grid_size, wumpus_pos, gold_pos, pit_mask))
+        self.count += 1
+
+    def write_environment(self, environment: WumpusEnvironment):
+        # Records hold the full pit mask, so a LazyWumpusEnvironment is materialized here
+        self.write(*environment.layout())
+
+    def close(self):
+        if not self._file.closed:
+            self._write_header()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WorldCorpus:
+    """Read-only, memory-mapped view of a corpus file with random access by index."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.grid_size, _, self.record_size, self.count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a world corpus")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("world index out of range")
+        offset = _HEADER.size + index * self.record_size
+        return decode_world(self.grid_size, self._map[offset:offset + self.record_size])
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def environment(self, index, config: Config):
+        """Builds the WumpusEnvironment for world number index. config.GRID_SIZE must match the corpus."""
+        if config.GRID_SIZE != self.grid_size:
+            raise ValueError(f"Corpus holds {self.grid_size}x{self.grid_size} worlds, config asks for {config.GRID_SIZE}")
+        return WumpusEnvironment(config, layout=self[index])
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_corpus(path, config: Config, count, seed=0, minimum=None):
+    """
+    Generates count worlds from one seeded generator and writes them to path. With minimum
+    set to a solvability class, worlds below it are rejected and replaced; ValueError is
+    raised (with the worlds found so far written) if too few candidates reach it.
+    """
+    rng = random.Random(seed)
+    with WorldCorpusWriter(path, config.GRID_SIZE) as writer:
+        if minimum is None:
+            layouts = (generate_layout(config, rng) for _ in range(count))
+        else:
+            from solvability import generate_solvable_layouts
+            layouts = generate_solvable_layouts(config, count, rng, minimum)
+        for layout in layouts:
+            writer.write(*layout)
+    return path
@@ -0,0 +1,201 @@
+# WumpusWorldGame/cow.py
+
+from types import FunctionType
+
+
+_slot_names = {} # Class -> names of the slots it and its bases define
+
+
+def _slots_of(cls):
+    names = _slot_names.get(cls)
+    if names is None:
+        names = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__"):
+                    names.append(name)
+        names = _slot_names[cls] = tuple(names)
+    return names
+
+
+def copy_attributes(source, target, skip_functions=False):
+    """
+    Copies every attribute of source onto target by reference: slots from the whole class
+    hierarchy, then the instance __dict__. skip_functions leaves out plain functions stored
+    on the instance, which are wrappers (instrumentation, trajectory recording) bound to
+    source.
+    """
+    for name in _slots_of(type(source)):
+        try:
+            setattr(target, name, getattr(source, name))
+        except AttributeError:
+            pass # Slot never assigned
+    instance_dict = getattr(source, "__dict__", None)
+    if instance_dict:
+        if skip_functions:
+            instance_dict = {name: value for name, value in instance_dict.items()
+                             if not isinstance(value, FunctionType)}
+        target.__dict__.update(instance_dict)
+
+
+class CopyOnWrite:
+    """
+    Mixin for game-state components that are forked often and written rarely.
+
+    fork() returns a new instance sharing every container with this one and marks both as
+    shared. The containers named in _cow_fields are copied (each with its own copy function)
+    the first time either instance writes after a fork, so forking costs a handful of
+    reference copies and a branch that never writes never copies anything. Every mutator
+    of a subclass starts with "if self._cow_shared: self._own()", and __init__ sets
+    _cow_shared to False.
+    """
+
+    __slots__ = ("_cow_shared",)
+    _cow_fields = {} # Attribute name -> function returning a private copy of its value
+
+    def fork(self):
+        cls = type(self)
+        clone = cls.__new__(cls)
+        copy_attributes(self, clone)
+        self._cow_shared = clone._cow_shared = True
+        return clone
+
+    def _own(self):
+        for name, copy in self._cow_fields.items():
+            setattr(self, name, copy(getattr(self, name)))
+        self._cow_shared = False
+
+
+def copy_optional_set(value):
+    return None if value is None else set(value)
+
+
+# --- Undo records -------------------------------------------------------------
+
+_BLOCK = 256 # Bytes of an array compared, and kept when they differ, at a time
+_NONE = frozenset() # Shared stand-in for the empty half of a set or dict delta
+
+
+def _bytearray_delta(old, new):
+    if len(old) != len(new):
+        return None
+    # Halve the differing ranges down to blocks; each comparison is a memcmp
+    blocks = []
+    ranges = [(0, len(old))]
+    while ranges:
+        start, end = ranges.pop()
+        if old[start:end] == new[start:end]:
+            continue
+        if end - start <= _BLOCK:
+            blocks.append((start, bytes(old[start:end])))
+        else:
+            middle = start + (end - start) // 2
+            ranges.append((middle, end))
+            ranges.append((start, middle))
+    return blocks
+
+
+def _undo_bytearray(array, blocks):
+    for start, data in blocks:
+        array[start:start + len(data)] = data
+
+
+def _set_delta(old, new):
+    added, removed = new - old, old - new
+    return (added or _NONE, removed or _NONE) if added or removed else ()
+
+
+def _undo_set(values, delta):
+    added, removed = delta
+    values -= added
+    values |= removed
+
+
+def _dict_delta(old, new):
+    try:
+        changed = dict(old.items() - new.items())
+    except TypeError: # Unhashable values
+        changed = {key: value for key, value in old.items() if key not in new or new[key] != value}
+    added = new.keys() - old.keys()
+    return (added or _NONE, changed or _NONE) if added or changed else ()
+
+
+def _undo_dict(mapping, delta):
+    added, changed = delta
+    for key in added:
+        del mapping[key]
+    if changed:
+        mapping.update(changed)
+
+
+def _list_delta(old, new):
+    common = min(len(old), len(new))
+    changed = [(i, x) for i, (x, y) in enumerate(zip(old, new)) if x is not y]
+    return (changed, common, old[common:]) if changed or len(old) != len(new) else ()
+
+
+def _undo_list(values, delta):
+    changed, common, tail = delta
+    for i, value in changed:
+        values[i] = value
+    values[common:] = tail
+
+
+_PLAIN = (int, float, str, tuple, list, set, frozenset) # Compared by value: reassigned but equal is unchanged
+
+_DELTAS = {bytearray: (_bytearray_delta, _undo_bytearray), set: (_set_delta, _undo_set),
+           dict: (_dict_delta, _undo_dict), list: (_list_delta, _undo_list)}
+
+
+def undo_record(before, after):
+    """
+    What it takes to turn after back into before, where one was forked from the other:
+    name -> ("value", old value) for attributes that were reassigned, ("delta", delta) for
+    copy-on-write containers changed in place and ("record", nested record) for
+    copy-on-write parts that were forked along with the object. Only what differs is kept,
+    so a record is about as large as the change, where before itself holds a full copy of
+    every container after has written since the fork. Wrappers stored on after are ignored.
+    """
+    record = {}
+    fields = getattr(before, "_cow_fields", {})
+    names = [name for name in _slots_of(type(before)) if name != "_cow_shared"]
+    names.extend(name for name, value in getattr(before, "__dict__", {}).items()
+                 if not isinstance(value, FunctionType))
+    for name in names:
+        try:
+            old = getattr(before, name)
+        except AttributeError:
+            continue # Slot never assigned
+        new = getattr(after, name, None)
+        if old is new:
+            continue
+        if isinstance(old, CopyOnWrite) and type(old) is type(new):
+            nested = undo_record(old, new)
+            if nested:
+                record[name] = ("record", nested)
+            continue
+        if name in fields and type(old) is type(new) and type(old) in _DELTAS:
+            delta = _DELTAS[type(old)][0](old, new)
+            if delta is not None:
+                if delta:
+                    record[name] = ("delta", delta)
+                continue
+        elif type(old) is type(new) and isinstance(old, _PLAIN) and old == new:
+            continue
+        record[name] = ("value", old)
+    return record
+
+
+def apply_undo(target, record):
+    """Applies undo_record(before, after) to after, or to an object in the same state, in place."""
+    if record and getattr(target, "_cow_shared", False):
+        target._own()
+    for name, (kind, change) in record.items():
+        if kind == "value":
+            setattr(target, name, change)
+        elif kind == "record":
+            apply_undo(getattr(target, name), change)
+        else:
+            value = getattr(target, name)
+            _DELTAS[type(value)][1](value, change)
@@ -1,98 +1,383 @@
 # WumpusWorldGame/environment.py
 
 import random
+from collections import OrderedDict
 from config import Config
+from cow import CopyOnWrite
 
-class WumpusEnvironment:
-    def __init__(self, config: Config):
+def generate_layout(config: Config, rng):
+    """
+    Draws a world as (wumpus_pos, gold_pos, pit_mask): distinct cells other than the agent's
+    start for the Wumpus, the gold and NUM_PITS pits. pit_mask has bit r * GRID_SIZE + c set
+    for every pit.
+    """
+    n = config.GRID_SIZE
+    start = config.AGENT_START[0] * n + config.AGENT_START[1]
+    available = n * n - 1
+    num_pits = config.NUM_PITS
+    if 2 + num_pits > available:
+        print("Warning: Not enough unique locations for all pits.")
+        num_pits = max(available - 2, 0)
+    # Sample indices among the non-start cells, then skip over the start cell
+    picks = [i + 1 if i >= start else i for i in rng.sample(range(available), 2 + num_pits)]
+    # Set the pit bits in a byte buffer; or-ing into a growing int would copy it per pit
+    pit_bytes = bytearray((n * n + 7) // 8)
+    for index in picks[2:]:
+        pit_bytes[index >> 3] |= 1 << (index & 7)
+    pit_mask = int.from_bytes(pit_bytes, "little")
+    return divmod(picks[0], n), divmod(picks[1], n), pit_mask
+
+
+# Flag bits of WumpusEnvironment.cells. The three percept bits come first so a cell's
+# byte masked with PERCEPT_MASK indexes its precomputed percept tuple directly.
+STENCH_FLAG = 1
+GLITTER_FLAG = 2
+BREEZE_FLAG = 4
+PERCEPT_MASK = 7
+PIT_FLAG = 8
+WUMPUS_FLAG = 16
+GOLD_FLAG = 32
+
+# Byte b of a bitmask expanded to one 0/1 byte per bit, lowest bit first
+_EXPAND_BITS = [bytes((b >> bit) & 1 for bit in range(8)) for b in range(256)]
+
+_percept_tables = {} # (stench, glitter, breeze) names -> percept tuple per combination of percept bits
+
+
+def _percept_table(config: Config):
+    # Percept tuples in the order Stench, Glitter, Breeze that get_percepts_at_location
+    # has always used, shared by every world with the same names
+    names = (config.STENCH, config.GLITTER, config.BREEZE)
+    table = _percept_tables.get(names)
+    if table is None:
+        table = _percept_tables[names] = tuple(
+            tuple(name for bit, name in enumerate(names) if code >> bit & 1)
+            for code in range(PERCEPT_MASK + 1)
+        )
+    return table
+
+
+_shift_mask_cache = {} # grid_size -> (full, not first column, not last column) masks
+
+
+def _shift_masks(grid_size):
+    masks = _shift_mask_cache.get(grid_size)
+    if masks is None:
+        full = (1 << (grid_size * grid_size)) - 1
+        # Masks that drop bits which would wrap from one row into the next on a horizontal shift
+        first_col = 0
+        for r in range(grid_size):
+            first_col |= 1 << (r * grid_size)
+        last_col = first_col << (grid_size - 1)
+        masks = _shift_mask_cache[grid_size] = (full, full & ~first_col, full & ~last_col)
+    return masks
+
+
+class WumpusEnvironment(CopyOnWrite):
+    """
+    The world is stored as one byte of flags per cell (bytearray indexed by
+    r * grid_size + c) holding what the cell contains and what is perceived there, so every
+    per-step query is a single lookup. The pits are also kept as a bitmask for layout().
+    A fork shares the cell array until gold is taken or the Wumpus killed in either world.
+    """
+
+    _cow_fields = {"cells": bytearray.copy}
+
+    def __init__(self, config: Config, rng=None, seed=None, layout=None):
+        """
+        rng is any random.Random-like object used to place the Wumpus, gold and pits; seed
+        builds a private random.Random(seed) instead, so the same seed always gives the same
+        world. Passing both raises ValueError; with neither, the global random module is used.
+        layout=(wumpus_pos, gold_pos, pit_mask) rebuilds a known world (e.g., one read from a
+        corpus) without any randomness.
+        """
         self.config = config
         self.grid_size = config.GRID_SIZE
-        self.grid = self._initialize_grid()
+        self.num_cells = self.grid_size * self.grid_size
+        self._percept_table = _percept_table(config)
+        self._full_mask, self._not_first_col, self._not_last_col = _shift_masks(self.grid_size)
+
+        if rng is not None and seed is not None:
+            raise ValueError("Pass either rng or seed, not both")
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        self.rng = rng
+
+        self.cells = bytearray(self.num_cells)
+        self.pits = 0
+        if layout is None:
+            layout = generate_layout(config, self.rng)
+        self._initialize_grid(*layout)
         self.wumpus_alive = True
         self.gold_collected = False
+        self._cow_shared = False
 
-    def _initialize_grid(self):
-        grid = {}
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                grid[(r, c)] = [] # Each cell can contain multiple items/percepts
-
-        # Place Wumpus, Pits, Gold ensuring no overlap and not at (0,0)
-        possible_locations = [(r, c) for r in range(self.grid_size) for c in range(self.grid_size) if (r, c) != self.config.AGENT_START]
-        random.shuffle(possible_locations)
+    def reset(self, rng=None, layout=None):
+        """
+        Lays out a new world of the same size in place, drawn from rng (the global random
+        module when None) unless layout is given; the cell array is reused.
+        """
+        if self._cow_shared:
+            self._own()
+        self.rng = rng if rng is not None else random
+        if layout is None:
+            layout = generate_layout(self.config, self.rng)
+        self._initialize_grid(*layout)
+        self.wumpus_alive = True
+        self.gold_collected = False
 
-        # Place Wumpus
-        wumpus_pos = possible_locations.pop(0)
-        grid[wumpus_pos].append("Wumpus")
+    def _initialize_grid(self, wumpus_pos, gold_pos, pit_mask):
+        cells = self.cells
         self.wumpus_location = wumpus_pos
-        self._add_stench_percepts(wumpus_pos, grid)
-
-        # Place Gold
-        gold_pos = possible_locations.pop(0)
-        grid[gold_pos].append("Gold")
         self.gold_location = gold_pos
-        grid[gold_pos].append(self.config.GLITTER) # Glitter at gold location
+        self.pits = pit_mask
 
-        # Place Pits
-        for _ in range(self.config.NUM_PITS):
-            if not possible_locations:
-                print("Warning: Not enough unique locations for all pits.")
-                break
-            pit_pos = possible_locations.pop(0)
-            grid[pit_pos].append("Pit")
-            self._add_breeze_percepts(pit_pos, grid)
+        # Pits and breezes are laid out with whole-board shifts on the pit bitmask, then each
+        # plane is expanded to one byte per cell, so building never loops over single pits
+        pit_bytes = self._expand(pit_mask)
+        breeze_bytes = self._expand(self._neighbor_mask(pit_mask))
+        cells[:] = ((pit_bytes * PIT_FLAG) | (breeze_bytes * BREEZE_FLAG)).to_bytes(self.num_cells, "little")
 
-        return grid
+        wumpus_index = self._index(*wumpus_pos)
+        cells[wumpus_index] |= WUMPUS_FLAG
+        self._stench_cells = self._neighbor_indices(wumpus_index) # All kill_wumpus has to clear
+        for neighbor in self._stench_cells:
+            cells[neighbor] |= STENCH_FLAG
+        cells[self._index(*gold_pos)] |= GOLD_FLAG | GLITTER_FLAG # Glitter at gold location
+
+    def layout_seed(self):
+        """Compact descriptor that rebuilds this world; None here, since the whole layout() is needed."""
+        return None
+
+    def layout(self):
+        """The (wumpus_pos, gold_pos, pit_mask) triple that rebuilds this world."""
+        return self.wumpus_location, self.gold_location, self.pits
 
-    def _add_stench_percepts(self, pos, grid):
-        r, c = pos
-        # Neighbors (up, down, left, right)
-        neighbors = [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]
-        for nr, nc in neighbors:
-            if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                if self.config.STENCH not in grid[(nr, nc)]:
-                    grid[(nr, nc)].append(self.config.STENCH)
-
-    def _add_breeze_percepts(self, pos, grid):
-        r, c = pos
-        neighbors = [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]
-        for nr, nc in neighbors:
-            if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                if self.config.BREEZE not in grid[(nr, nc)]:
-                    grid[(nr, nc)].append(self.config.BREEZE)
+    def _expand(self, plane):
+        """Bitmask -> int whose byte i (little-endian) is bit i of plane."""
+        expanded = b"".join([_EXPAND_BITS[b] for b in plane.to_bytes((self.num_cells + 7) // 8, "little")])
+        return int.from_bytes(expanded[:self.num_cells], "little")
+
+    def _neighbor_mask(self, plane):
+        """Returns the plane of cells orthogonally adjacent to any set cell, using whole-board shifts."""
+        n = self.grid_size
+        up = plane >> n
+        down = (plane << n) & self._full_mask
+        left = (plane >> 1) & self._not_last_col
+        right = (plane << 1) & self._not_first_col
+        return up | down | left | right
+
+    def _index(self, row, col):
+        return row * self.grid_size + col
+
+    def _neighbor_indices(self, index):
+        n = self.grid_size
+        row, col = divmod(index, n)
+        neighbors = []
+        if row > 0:
+            neighbors.append(index - n)
+        if row < n - 1:
+            neighbors.append(index + n)
+        if col > 0:
+            neighbors.append(index - 1)
+        if col < n - 1:
+            neighbors.append(index + 1)
+        return neighbors
+
+    def _test(self, flag, row, col):
+        if not self.is_valid_location(row, col):
+            return False
+        return self.cells[row * self.grid_size + col] & flag != 0
+
+    @property
+    def grid(self):
+        """
+        Dict-of-lists view of the world keyed by (r, c), built on demand from the cell flags.
+        Kept for callers that still want to inspect the world cell by cell.
+        """
+        grid = {}
+        for r in range(self.grid_size):
+            for c in range(self.grid_size):
+                items = []
+                if self._test(WUMPUS_FLAG, r, c):
+                    items.append("Wumpus")
+                if self._test(GOLD_FLAG, r, c):
+                    items.append("Gold")
+                if self._test(PIT_FLAG, r, c):
+                    items.append("Pit")
+                items.extend(self.get_percepts_at_location(r, c))
+                grid[(r, c)] = items
+        return grid
 
     def get_percepts_at_location(self, row, col):
-        if (row, col) in self.grid:
-            percepts = []
-            for item in self.grid[(row, col)]:
-                if item in [self.config.BREEZE, self.config.STENCH, self.config.GLITTER]:
-                    percepts.append(item)
-            return percepts
-        return []
+        """Percepts at (row, col) as a new list the caller may keep or change; empty outside the grid."""
+        if not (0 <= row < self.grid_size and 0 <= col < self.grid_size):
+            return []
+        return list(self._percept_table[self.cells[row * self.grid_size + col] & PERCEPT_MASK])
 
     def has_wumpus(self, row, col):
-        return "Wumpus" in self.grid.get((row, col), []) and self.wumpus_alive
+        return self.wumpus_alive and self._test(WUMPUS_FLAG, row, col)
 
     def has_pit(self, row, col):
-        return "Pit" in self.grid.get((row, col), [])
+        return self._test(PIT_FLAG, row, col)
 
     def has_gold(self, row, col):
-        return "Gold" in self.grid.get((row, col), []) and not self.gold_collected
+        return not self.gold_collected and self._test(GOLD_FLAG, row, col)
 
     def remove_gold(self, row, col):
-        if "Gold" in self.grid.get((row, col), []):
-            self.grid[(row, col)].remove("Gold")
-            if self.config.GLITTER in self.grid.get((row,col), []):
-                self.grid[(row,col)].remove(self.config.GLITTER)
+        if self._test(GOLD_FLAG, row, col):
+            if self._cow_shared:
+                self._own()
+            self.cells[self._index(row, col)] &= ~(GOLD_FLAG | GLITTER_FLAG) & 0xFF
             self.gold_collected = True
 
     def kill_wumpus(self):
+        if self._cow_shared:
+            self._own()
         self.wumpus_alive = False
-        # Remove Stench from all cells when Wumpus is dead
+        # Only the cells next to the Wumpus can smell it
+        cells = self.cells
+        for neighbor in self._stench_cells:
+            cells[neighbor] &= ~STENCH_FLAG & 0xFF
+
+    def is_valid_location(self, row, col):
+        return 0 <= row < self.grid_size and 0 <= col < self.grid_size
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x):
+    # splitmix64 finalizer: a cheap, well-spread 64-bit hash
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+
+class LazyWumpusEnvironment(WumpusEnvironment):
+    """
+    A world whose cells are derived on demand instead of laid out up front, for maps far
+    larger than an agent will ever explore. The Wumpus and the gold are drawn from the seed;
+    every other cell except the start holds a pit when a hash of (seed, r, c) falls below
+    NUM_PITS / (cells - 3), so the expected number of pits matches the config but the exact
+    count varies. Cell flags are cached in a bounded LRU table, so memory stays flat however
+    much of the map is visited. Queries behave exactly as in WumpusEnvironment. Nothing is
+    written per cell, so forks share the cache and never copy anything.
+
+    layout_seed() describes the world in a few numbers; passing it back as layout_seed=
+    rebuilds the same world without drawing anything from rng.
+    """
+
+    _cow_fields = {}
+
+    def __init__(self, config: Config, rng=None, seed=None, layout=None, cache_size=65536, layout_seed=None):
+        if layout is not None:
+            raise ValueError("A lazy world is generated from its seed; use WumpusEnvironment for a fixed layout")
+        self.config = config
+        self.grid_size = config.GRID_SIZE
+        self.num_cells = self.grid_size * self.grid_size
+        self._percept_table = _percept_table(config)
+
+        if rng is not None and seed is not None:
+            raise ValueError("Pass either rng or seed, not both")
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        self.rng = rng
+        self.cache_size = cache_size
+        self._cache = OrderedDict() # Cell index -> static flags, least recently used first
+
+        n = self.grid_size
+        start = config.AGENT_START[0] * n + config.AGENT_START[1]
+        if layout_seed is None:
+            self.seed = rng.getrandbits(64)
+            wumpus_index, gold_index = (i + 1 if i >= start else i for i in rng.sample(range(self.num_cells - 1), 2))
+        else:
+            self.seed, wumpus_pos, gold_pos = layout_seed
+            wumpus_index, gold_index = self._index(*wumpus_pos), self._index(*gold_pos)
+        self.wumpus_location = divmod(wumpus_index, n)
+        self.gold_location = divmod(gold_index, n)
+        self._reserved = {start, wumpus_index, gold_index}
+        density = config.NUM_PITS / max(self.num_cells - 3, 1)
+        self._pit_threshold = min(int(density * (1 << 64)), 1 << 64)
+        self.wumpus_alive = True
+        self.gold_collected = False
+        self._cow_shared = False
+
+    def reset(self, rng=None, layout=None):
+        """A new world from rng; nothing per cell is kept, so this is the same as building one."""
+        self.__init__(self.config, rng=rng, layout=layout, cache_size=self.cache_size)
+
+    def _is_pit(self, row, col):
+        if row * self.grid_size + col in self._reserved:
+            return False
+        return _mix64((self.seed + row * 0x9E3779B97F4A7C15 + col * 0xD1B54A32D192ED03) & _MASK64) < self._pit_threshold
+
+    def _flags(self, row, col):
+        """Static flags of (row, col): contents and percepts as if the Wumpus and gold were untouched."""
+        index = row * self.grid_size + col
+        cache = self._cache
+        flags = cache.get(index)
+        if flags is not None:
+            cache.move_to_end(index)
+            return flags
+        flags = PIT_FLAG if self._is_pit(row, col) else 0
+        n = self.grid_size
+        is_pit = self._is_pit
+        wumpus_row, wumpus_col = self.wumpus_location
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < n and 0 <= c < n:
+                if is_pit(r, c):
+                    flags |= BREEZE_FLAG
+                if r == wumpus_row and c == wumpus_col:
+                    flags |= STENCH_FLAG
+        if (row, col) == self.wumpus_location:
+            flags |= WUMPUS_FLAG
+        if (row, col) == self.gold_location:
+            flags |= GOLD_FLAG | GLITTER_FLAG
+        cache[index] = flags
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return flags
+
+    def _live_flags(self, row, col):
+        # A dead Wumpus no longer smells and collected gold no longer glitters
+        flags = self._flags(row, col)
+        if not self.wumpus_alive:
+            flags &= ~STENCH_FLAG
+        if self.gold_collected:
+            flags &= ~(GOLD_FLAG | GLITTER_FLAG)
+        return flags
+
+    def _test(self, flag, row, col):
+        if not self.is_valid_location(row, col):
+            return False
+        return self._live_flags(row, col) & flag != 0
+
+    def layout_seed(self):
+        """(world seed, wumpus_pos, gold_pos): everything that determines this world, in O(1)."""
+        return self.seed, self.wumpus_location, self.gold_location
+
+    def layout(self):
+        """
+        Materializes the pit mask of the whole map. This hashes every one of the
+        grid_size * grid_size cells, so it takes seconds on multi-million-cell maps; use
+        layout_seed() to record or transmit a lazy world.
+        """
+        pit_mask = 0
         for r in range(self.grid_size):
             for c in range(self.grid_size):
-                if self.config.STENCH in self.grid[(r, c)]:
-                    self.grid[(r, c)].remove(self.config.STENCH)
+                if self._is_pit(r, c):
+                    pit_mask |= 1 << (r * self.grid_size + c)
+        return self.wumpus_location, self.gold_location, pit_mask
 
-    def is_valid_location(self, row, col):
-        return 0 <= row < self.grid_size and 0 <= col < self.grid_size
\ No newline at end of file
+    def get_percepts_at_location(self, row, col):
+        if not (0 <= row < self.grid_size and 0 <= col < self.grid_size):
+            return []
+        return list(self._percept_table[self._live_flags(row, col) & PERCEPT_MASK])
+
+    def remove_gold(self, row, col):
+        if self._test(GOLD_FLAG, row, col):
+            self.gold_collected = True
+
+    def kill_wumpus(self):
+        self.wumpus_alive = False
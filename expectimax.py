@@ -0,0 +1,370 @@
+# WumpusWorldGame/expectimax.py
+
+from collections import OrderedDict
+
+from config import Config
+
+# Decisions returned by ExpectimaxPlanner.decide
+ENTER = "enter" # ("enter", cell): walk over known-safe cells and step into cell
+SHOOT = "shoot" # ("shoot", target, spot): walk to spot, face target and shoot
+
+
+class BeliefNode:
+    """
+    Knowledge at one node of the search: the agent's real knowledge (root Beliefs from the
+    ProbabilityEngine) plus the hypothetical events assumed on the way down. Events are
+    ("visit", cell, breeze, stench) and ("shot", cell, hit). A child is its parent's beliefs
+    with one more event applied; nodes are keyed by their event set, so the same events
+    reached in another order share one transposition table entry.
+    """
+
+    __slots__ = ("planner", "position", "has_arrow", "wumpus_dead", "events", "visited",
+                 "pit", "wumpus", "wumpus_default", "wumpus_default_cells", "_survey")
+
+    def __init__(self, planner, position, has_arrow, wumpus_dead, events, parent=None, event=None):
+        self.planner = planner
+        self.position = position
+        self.has_arrow = has_arrow
+        self.wumpus_dead = wumpus_dead
+        self.events = events
+        self._survey = None
+        if parent is None:
+            root = planner.root
+            self.visited = planner.root_visited
+            self.pit = root.pit
+            self.wumpus = root.wumpus
+            self.wumpus_default = root.wumpus_default
+            self.wumpus_default_cells = planner.root_wumpus_default_cells
+            return
+        # A child copies its parent's beliefs and applies the one new event
+        self.visited = set(parent.visited)
+        self.pit = dict(parent.pit)
+        self.wumpus = dict(parent.wumpus)
+        self.wumpus_default = parent.wumpus_default
+        self.wumpus_default_cells = parent.wumpus_default_cells
+        if event[0] == "visit":
+            self._apply_visit(*event[1:])
+        elif not event[2]: # A miss: the Wumpus is not there
+            self._zero_wumpus([event[1]])
+
+    def key(self):
+        return (self.position, self.has_arrow, self.wumpus_dead, self.events)
+
+    def pit_probability(self, cell):
+        p = self.pit.get(cell)
+        if p is None:
+            return 0.0 if cell in self.planner.root.no_pit else self.planner.root.pit_default
+        return p
+
+    def wumpus_probability(self, cell):
+        if self.wumpus_dead:
+            return 0.0
+        p = self.wumpus.get(cell)
+        if p is None:
+            return 0.0 if cell in self.planner.root.no_wumpus else self.wumpus_default
+        return p
+
+    def _zero_wumpus(self, cells):
+        # Rules the Wumpus out of cells and renormalizes the rest of its distribution
+        removed = 0.0
+        for cell in cells:
+            p = self.wumpus_probability(cell)
+            if cell not in self.wumpus and cell not in self.planner.root.no_wumpus:
+                self.wumpus_default_cells -= 1
+            self.wumpus[cell] = 0.0
+            removed += p
+        remaining = 1.0 - removed
+        if 0.0 < remaining < 1.0:
+            for cell, p in self.wumpus.items():
+                self.wumpus[cell] = p / remaining
+            self.wumpus_default /= remaining
+
+    def _apply_visit(self, cell, breeze, stench):
+        self.visited.add(cell)
+        self.pit[cell] = 0.0
+        self._zero_wumpus([cell])
+        neighbors = self.planner.neighbors(cell)
+        unknown = [n for n in neighbors if self.pit_probability(n) > 0.0]
+        if not breeze:
+            for n in unknown:
+                self.pit[n] = 0.0
+        else:
+            # P(p_n | at least one pit around), treating the neighbors as independent
+            none = 1.0
+            for n in unknown:
+                none *= 1.0 - self.pit_probability(n)
+            if none < 1.0:
+                for n in unknown:
+                    self.pit[n] = min(1.0, self.pit_probability(n) / (1.0 - none))
+        if self.wumpus_dead:
+            return
+        if not stench:
+            self._zero_wumpus(neighbors)
+        else:
+            kept = {n: self.wumpus_probability(n) for n in neighbors}
+            total = sum(kept.values())
+            self.wumpus = {n: p / total for n, p in kept.items()} if total > 0.0 else kept
+            self.wumpus_default = 0.0
+            self.wumpus_default_cells = 0
+
+    def danger(self, cell):
+        return 1.0 - (1.0 - self.pit_probability(cell)) * (1.0 - self.wumpus_probability(cell))
+
+    def survey(self):
+        """
+        Breadth-first search over known-safe cells from the agent. Returns (distances to
+        safe cells, entry options as {cell: steps}, number of safe unvisited cells),
+        computed once per node.
+        """
+        if self._survey is not None:
+            return self._survey
+        # The hot loop of the search, so danger() is inlined over local names
+        root = self.planner.root
+        pit, no_pit, pit_default = self.pit, root.no_pit, root.pit_default
+        wumpus, no_wumpus, wumpus_default = self.wumpus, root.no_wumpus, self.wumpus_default
+        wumpus_dead = self.wumpus_dead
+        neighbors = self.planner.neighbors
+        visited = self.visited
+        distances = {self.position: 0}
+        frontier = {}
+        queue = [self.position]
+        safe_unvisited = 0
+        for cell in queue:
+            if cell not in visited:
+                safe_unvisited += 1
+                frontier.setdefault(cell, distances[cell])
+            steps = distances[cell] + 1
+            for n in neighbors(cell):
+                if n in distances:
+                    continue
+                p = pit.get(n)
+                if p is None:
+                    p = 0.0 if n in no_pit else pit_default
+                if wumpus_dead:
+                    w = 0.0
+                else:
+                    w = wumpus.get(n)
+                    if w is None:
+                        w = 0.0 if n in no_wumpus else wumpus_default
+                danger = 1.0 - (1.0 - p) * (1.0 - w)
+                if danger == 0.0:
+                    distances[n] = steps
+                    queue.append(n)
+                elif danger < 1.0 and n not in frontier:
+                    frontier[n] = steps
+        self._survey = distances, frontier, safe_unvisited
+        return self._survey
+
+    def safe_unvisited_count(self):
+        """Safe unvisited cells, counted only where they can appear: around the root's or the hypothetical visits."""
+        cells = set(self.planner.root_safe_unvisited)
+        for event in self.events:
+            if event[0] == "visit":
+                cells.update(self.planner.neighbors(event[1]))
+        return sum(1 for cell in cells if cell not in self.visited and self.danger(cell) == 0.0)
+
+
+class ExpectimaxPlanner:
+    """
+    Bounded-depth expectimax over belief states. At each node the agent may stop (value 0),
+    walk into a frontier cell (chance node: death, glitter, or one of the four
+    breeze/stench outcomes) or shoot at a Wumpus candidate from a safe neighbor (chance node:
+    hit or miss). Scores come from the Config; leaves are valued by the chance that the gold
+    lies in a safe cell still to explore. Percept probabilities treat neighboring cells as
+    independent, so only the root beliefs are exact.
+
+    Values are stored in an LRU transposition table keyed by the agent's real knowledge (pit
+    and Wumpus evidence, including the Wumpus candidates) and the node's canonical key, so
+    a belief state reached again (by another order of events, or on the next move while
+    walking to a target) is evaluated once. Root beliefs and the
+    knowledge key are likewise rebuilt only when the agent learns something, so a decision
+    with unchanged knowledge is a survey and a table hit. A full search after new knowledge
+    surveys the known-safe area once per node: it stays within a few milliseconds up to
+    about 16x16, and grows with the safe area on larger grids.
+    """
+
+    def __init__(self, config: Config, max_depth=2, max_branching=2, table_size=65536):
+        self.config = config
+        self.grid_size = config.GRID_SIZE
+        self.max_depth = max_depth
+        self.max_branching = max_branching
+        self.table_size = table_size
+        self._table = OrderedDict() # (knowledge key, node key, depth) -> (value, decision)
+        self.table_hits = 0
+        self.table_misses = 0
+        self._neighbor_cache = {}
+        self.root = None              # Exact Beliefs for the agent's real knowledge
+        self.root_visited = frozenset()
+        self.root_safe_unvisited = ()
+        self.root_wumpus_default_cells = 0
+        self._home_distances = {}
+        self._knowledge_key = None
+        self._gold_reward = config.GRAB_GOLD_REWARD + config.CLIMB_OUT_REWARD
+
+    def neighbors(self, cell):
+        neighbors = self._neighbor_cache.get(cell)
+        if neighbors is None:
+            r, c = cell
+            n = self.grid_size
+            neighbors = self._neighbor_cache[cell] = [(nr, nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                                                      if 0 <= nr < n and 0 <= nc < n]
+        return neighbors
+
+    def decide(self, agent):
+        """Returns (expected value, decision) for the agent's current knowledge; decision None means stop."""
+        engine = agent.probability_engine
+        root = engine.compute()
+        if root is not self.root:
+            # compute() returns the same Beliefs until the agent learns something, so what
+            # depends on knowledge alone is only rebuilt when it does
+            self.root = root
+            self.root_visited = frozenset(engine.visited)
+            if engine.wumpus_candidates is None and not engine.wumpus_dead:
+                self.root_wumpus_default_cells = self.grid_size * self.grid_size - len(engine.no_wumpus)
+            else:
+                self.root_wumpus_default_cells = 0
+            candidates = engine.wumpus_candidates
+            self._knowledge_key = (self.root_visited, frozenset(engine.breeze_cells),
+                                   frozenset(engine.no_wumpus), engine.wumpus_dead,
+                                   None if candidates is None else frozenset(candidates))
+            self._home_distances = None
+        node = BeliefNode(self, (agent.row, agent.col), agent.has_arrow, engine.wumpus_dead, frozenset())
+        self.root_safe_unvisited = [cell for cell, steps in node.survey()[1].items() if node.danger(cell) == 0.0]
+        if self._home_distances is None:
+            self._home_distances = self._safe_distances_from_start(node)
+        return self._value(node, self.max_depth)
+
+    def _value(self, node, depth):
+        key = (self._knowledge_key, node.key(), depth)
+        cached = self._table.get(key)
+        if cached is not None:
+            self.table_hits += 1
+            self._table.move_to_end(key)
+            return cached
+        self.table_misses += 1
+        result = self._evaluate(node, depth)
+        self._table[key] = result
+        if len(self._table) > self.table_size:
+            self._table.popitem(last=False)
+        return result
+
+    def _child(self, node, position, event, has_arrow=None, wumpus_dead=None):
+        return BeliefNode(self, position, node.has_arrow if has_arrow is None else has_arrow,
+                          node.wumpus_dead if wumpus_dead is None else wumpus_dead, node.events | {event}, node, event)
+
+    def _gold_cells(self, node):
+        # Cells that may hold the gold: unvisited cells other than the pits and the Wumpus
+        hazards = self.config.NUM_PITS + (0 if node.wumpus_dead else 1)
+        return max(1, self.grid_size * self.grid_size - len(node.visited) - hazards)
+
+    def _evaluate(self, node, depth):
+        if depth == 0:
+            return self._gold_reward * node.safe_unvisited_count() / self._gold_cells(node), None
+        distances, frontier, _ = node.survey()
+
+        config = self.config
+        best_value, best_decision = 0.0, None # Stopping is always possible
+
+        options = sorted(frontier.items(), key=lambda item: (node.danger(item[0]), item[1], item[0]))
+        for cell, steps in options[:self.max_branching]:
+            value = steps * config.MOVE_COST + self._enter_value(node, cell, depth)
+            if value > best_value:
+                best_value, best_decision = value, (ENTER, cell)
+
+        if node.has_arrow and not node.wumpus_dead:
+            for value, decision in self._shoot_options(node, distances, depth):
+                if value > best_value:
+                    best_value, best_decision = value, decision
+        return best_value, best_decision
+
+    def _enter_value(self, node, cell, depth):
+        config = self.config
+        p_pit = node.pit_probability(cell)
+        p_wumpus = node.wumpus_probability(cell)
+        survive = (1.0 - p_pit) * (1.0 - p_wumpus)
+        value = p_pit * config.FALL_IN_PIT_COST + (1.0 - p_pit) * p_wumpus * config.WUMPUS_KILL_COST
+        if survive <= 0.0:
+            return value
+
+        unknown = [n for n in self.neighbors(cell) if n not in node.visited]
+        none = 1.0
+        for n in unknown:
+            none *= 1.0 - node.pit_probability(n)
+        p_breeze = 1.0 - none
+        if node.wumpus_dead:
+            p_stench = 0.0
+        else:
+            alive_elsewhere = 1.0 - p_wumpus
+            p_stench = min(1.0, sum(node.wumpus_probability(n) for n in unknown) / alive_elsewhere) if alive_elsewhere > 0 else 0.0
+
+        p_gold = 1.0 / self._gold_cells(node)
+        home = self._home_distance(cell)
+        gold_value = config.GRAB_GOLD_REWARD + config.CLIMB_OUT_REWARD + home * config.MOVE_COST
+        outcomes = survive * p_gold * gold_value
+        rest = survive * (1.0 - p_gold)
+        for breeze, p_b in ((True, p_breeze), (False, 1.0 - p_breeze)):
+            for stench, p_s in ((True, p_stench), (False, 1.0 - p_stench)):
+                p = rest * p_b * p_s
+                if p > 0.0:
+                    child = self._child(node, cell, ("visit", cell, breeze, stench))
+                    outcomes += p * self._value(child, depth - 1)[0]
+        return value + outcomes
+
+    def _home_distance(self, cell):
+        # Steps back to the start: one step onto the nearest cell already known to be safe,
+        # then the shortest walk over known-safe cells computed once per decision
+        home = self._home_distances
+        if cell in home:
+            return home[cell]
+        steps = [home[n] for n in self.neighbors(cell) if n in home]
+        if steps:
+            return min(steps) + 1
+        start = self.config.AGENT_START
+        return abs(cell[0] - start[0]) + abs(cell[1] - start[1])
+
+    def _safe_distances_from_start(self, node):
+        start = self.config.AGENT_START
+        distances = {start: 0}
+        queue = [start]
+        for current in queue:
+            for n in self.neighbors(current):
+                if n not in distances and (n in node.visited or node.danger(n) == 0.0):
+                    distances[n] = distances[current] + 1
+                    queue.append(n)
+        return distances
+
+    def _shoot_options(self, node, distances, depth):
+        config = self.config
+        candidates = []
+        for target in {n for cell in distances for n in self.neighbors(cell)}:
+            p = node.wumpus_probability(target)
+            if p <= 0.0 or target in distances:
+                continue
+            spot = min((cell for cell in self.neighbors(target) if cell in distances), key=lambda cell: (distances[cell], cell))
+            candidates.append((-p, distances[spot], target, spot))
+        candidates.sort()
+        for neg_p, steps, target, spot in candidates[:self.max_branching]:
+            p = -neg_p
+            hit = self._child(node, spot, ("shot", target, True), has_arrow=False, wumpus_dead=True)
+            miss = self._child(node, spot, ("shot", target, False), has_arrow=False)
+            value = (steps * config.MOVE_COST + config.SHOOT_COST
+                     + p * (config.WUMPUS_DEFEAT_REWARD + self._value(hit, depth - 1)[0])
+                     + (1.0 - p) * self._value(miss, depth - 1)[0])
+            yield value, (SHOOT, target, spot)
+
+
+_shared_planners = {}
+
+
+def shared_planner(config: Config, **options):
+    """
+    One planner per rule set, so every agent playing under the same rules shares a
+    transposition table (values depend only on knowledge, not on the hidden world).
+    """
+    key = (config.GRID_SIZE, config.NUM_PITS, config.AGENT_START, config.MOVE_COST, config.SHOOT_COST,
+           config.GRAB_GOLD_REWARD, config.CLIMB_OUT_REWARD, config.FALL_IN_PIT_COST, config.WUMPUS_KILL_COST,
+           config.WUMPUS_DEFEAT_REWARD, tuple(sorted(options.items())))
+    planner = _shared_planners.get(key)
+    if planner is None:
+        planner = _shared_planners[key] = ExpectimaxPlanner(config, **options)
+    return planner
@@ -0,0 +1,209 @@
+# WumpusWorldGame/instrumentation.py
+
+import cProfile
+import json
+import pstats
+import sys
+import time
+
+# GameLogic methods wrapped by Instrumentation.attach, plus the agent's inference
+GAME_LOGIC_ACTIONS = ["move_agent", "shoot_arrow", "grab_gold", "climb_out", "perceive_current_location"]
+AGENT_ACTIONS = ["infer_from_percepts"]
+GUI_ACTIONS = ["update_grid"]
+
+
+class Collector:
+    """Receives one record per instrumented call. Subclasses override what they need."""
+
+    def record(self, name, elapsed_ns, allocated_blocks):
+        pass
+
+    def episode_started(self, episode):
+        pass
+
+    def episode_finished(self, episode):
+        pass
+
+    def close(self):
+        pass
+
+
+class ActionStats:
+    """Call count, total latency, a power-of-two latency histogram and net allocated blocks for one action."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = {} # bucket b counts calls with 2**(b-1) <= elapsed_ns < 2**b
+        self.allocated_blocks = 0
+
+    def add(self, elapsed_ns, allocated_blocks):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = elapsed_ns.bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        self.allocated_blocks += allocated_blocks
+
+    def percentile_ns(self, fraction):
+        """Upper bound of the histogram bucket holding the given fraction of calls."""
+        target = fraction * self.calls
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= target:
+                return 1 << bucket
+        return 0
+
+    def summary(self):
+        return {
+            "calls": self.calls,
+            "mean_us": self.total_ns / self.calls / 1000 if self.calls else 0.0,
+            "p50_us_upper": self.percentile_ns(0.5) / 1000,
+            "p99_us_upper": self.percentile_ns(0.99) / 1000,
+            "max_us": self.max_ns / 1000,
+            "allocated_blocks_per_call": self.allocated_blocks / self.calls if self.calls else 0.0,
+            "histogram_ns_log2": {str(bucket): count for bucket, count in sorted(self.histogram.items())},
+        }
+
+
+class InMemoryCollector(Collector):
+    def __init__(self):
+        self.stats = {}
+        self.episodes = 0
+
+    def record(self, name, elapsed_ns, allocated_blocks):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = ActionStats()
+        stats.add(elapsed_ns, allocated_blocks)
+
+    def episode_finished(self, episode):
+        self.episodes += 1
+
+    def summary(self):
+        return {"episodes": self.episodes, "actions": {name: stats.summary() for name, stats in self.stats.items()}}
+
+
+class FileDumpCollector(InMemoryCollector):
+    """Keeps in-memory stats and rewrites them as JSON to path at most every interval seconds."""
+
+    def __init__(self, path, interval=10.0):
+        super().__init__()
+        self.path = path
+        self.interval = interval
+        self._next_dump = time.monotonic() + interval
+
+    def record(self, name, elapsed_ns, allocated_blocks):
+        super().record(name, elapsed_ns, allocated_blocks)
+        if time.monotonic() >= self._next_dump:
+            self.dump()
+
+    def dump(self):
+        with open(self.path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        self._next_dump = time.monotonic() + self.interval
+
+    def close(self):
+        self.dump()
+
+
+class CProfileCollector(Collector):
+    """Runs cProfile only for episodes first_episode .. first_episode + num_episodes - 1."""
+
+    def __init__(self, first_episode=0, num_episodes=1, output_path=None):
+        self.first_episode = first_episode
+        self.last_episode = first_episode + num_episodes - 1
+        self.output_path = output_path
+        self.profiler = cProfile.Profile()
+        self._active = False
+
+    def episode_started(self, episode):
+        if self.first_episode <= episode <= self.last_episode and not self._active:
+            self.profiler.enable()
+            self._active = True
+
+    def episode_finished(self, episode):
+        if self._active and episode >= self.last_episode:
+            self.profiler.disable()
+            self._active = False
+            if self.output_path:
+                self.profiler.dump_stats(self.output_path)
+
+    def stats(self):
+        return pstats.Stats(self.profiler)
+
+    def close(self):
+        if self._active:
+            self.profiler.disable()
+            self._active = False
+
+
+class Instrumentation:
+    """
+    Optional timing layer around the GameLogic actions, the agent's inference and, if
+    attached, the GUI redraw. Methods are wrapped per instance only when attach() is
+    called, so games that are not instrumented run the original methods untouched.
+    """
+
+    def __init__(self, *collectors, track_allocations=True):
+        self.collectors = list(collectors) or [InMemoryCollector()]
+        self.track_allocations = track_allocations
+        self.episode = 0
+
+    def _wrap(self, owner, name):
+        method = getattr(owner, name)
+        collectors = self.collectors
+        clock = time.perf_counter_ns
+        blocks = sys.getallocatedblocks if self.track_allocations else (lambda: 0)
+
+        def wrapper(*args, **kwargs):
+            blocks_before = blocks()
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                allocated = blocks() - blocks_before
+                for collector in collectors:
+                    collector.record(name, elapsed, allocated)
+        wrapper.__wrapped__ = method
+        setattr(owner, name, wrapper)
+
+    @staticmethod
+    def _unwrap(owner, name):
+        if hasattr(getattr(owner, name), "__wrapped__"):
+            delattr(owner, name) # Drop the instance attribute; the class method shows through again
+
+    def attach(self, game_logic):
+        for name in GAME_LOGIC_ACTIONS:
+            self._wrap(game_logic, name)
+        for name in AGENT_ACTIONS:
+            self._wrap(game_logic.agent, name)
+        return game_logic
+
+    def detach(self, game_logic):
+        for name in GAME_LOGIC_ACTIONS:
+            self._unwrap(game_logic, name)
+        for name in AGENT_ACTIONS:
+            self._unwrap(game_logic.agent, name)
+
+    def attach_gui(self, gui):
+        for name in GUI_ACTIONS:
+            self._wrap(gui, name)
+        return gui
+
+    def episode_started(self):
+        for collector in self.collectors:
+            collector.episode_started(self.episode)
+
+    def episode_finished(self):
+        for collector in self.collectors:
+            collector.episode_finished(self.episode)
+        self.episode += 1
+
+    def close(self):
+        for collector in self.collectors:
+            collector.close()
@@ -1,44 +1,467 @@
 # WumpusWorldGame/kb.py
 
+import copy
+
 from config import Config
+from cow import CopyOnWrite, copy_optional_set
+from sat import CDCLSolver
+
+# Truth values stored per variable
+UNKNOWN = 0
+TRUE = 1
+FALSE = 2
+
+# Compact status codes for the agent's map, and the names the GUI shows for them
+STATUS_UNKNOWN = 0
+STATUS_SAFE = 1
+STATUS_PIT_SUSPECTED = 2
+STATUS_WUMPUS_SUSPECTED = 3
+STATUS_PIT = 4
+STATUS_WUMPUS = 5
+STATUS_NAMES = ("Unknown", "Safe", "Pit?", "Wumpus?", "Pit", "Wumpus")
+
+
+def _parse_fact(fact):
+    """Splits "Name(r,c)" into (name, r, c); None for anything else. Plain string methods keep re out of startup."""
+    name, open_paren, rest = fact.partition("(")
+    if not open_paren or not rest.endswith(")"):
+        return None
+    r, comma, c = rest[:-1].partition(",")
+    if not (name and name.replace("_", "a").isalnum() and r.isdecimal() and c.isdecimal() and comma):
+        return None
+    return name, int(r), int(c)
+
+
+class KnowledgeBase(CopyOnWrite):
+    """
+    Propositional knowledge about pits and the Wumpus, with incremental forward chaining.
 
-class KnowledgeBase:
-    def __init__(self, config: Config):
+    Each cell i = r * grid_size + c owns two variables: Pit(i) = 2 * i and Wumpus(i) = 2 * i + 1.
+    A literal is 2 * var for the positive form and 2 * var + 1 for the negated one. Breeze and
+    stench percepts become clauses over the neighbors' variables; every clause is indexed by
+    its literals, so a new assignment only revisits the handful of clauses that mention it
+    instead of rescanning everything the KB knows.
+
+    Forward chaining is sound but not complete. With sat=True the KB also keeps the full
+    rules as CNF in an incremental CDCL solver (see entails()), and ask() falls back to it
+    for whatever forward chaining could not prove.
+
+    fork() shares everything until one of the two knowledge bases is told something or
+    (with the solver) asked to search. Clause lists are never changed once added and the
+    watch lists are tuples, so one level of copying makes the fork independent; the solver
+    rewrites its clauses in place and is deep-copied.
+    """
+
+    _cow_fields = {"facts": set.copy, "values": bytearray.copy, "clauses": list.copy,
+                   "satisfied": list.copy, "watches": dict.copy, "_agenda": list.copy,
+                   "_told": set.copy, "wumpus_candidates": copy_optional_set,
+                   "_pit_free_open": set.copy, "_wumpus_clauses": list.copy,
+                   "solver": copy.deepcopy, "_witnessed": set.copy}
+
+    def __init__(self, config: Config, sat=False):
         self.config = config
-        self.facts = set() # Store known facts (e.g., "Safe(0,0)", "HasBreeze(1,0)")
+        self.grid_size = config.GRID_SIZE
+        self.facts = set() # Free-form facts told by callers (e.g., "Safe(0,0)")
+
+        self.values = bytearray(2 * self.grid_size * self.grid_size)
+        self.clauses = []     # List of literal lists
+        self.satisfied = []   # Parallel to clauses
+        self.watches = {}     # literal -> tuple of ids of clauses containing it
+        self._agenda = []     # Variables assigned but not yet propagated
+        self._told = set()    # Cells whose percepts were already added
+
+        # Exactly one Wumpus: once a stench is perceived only the intersection of the
+        # stench neighborhoods can hold it. None means nothing has been smelled yet.
+        self.wumpus_candidates = None
+        self.wumpus_dead = False
+        self._pit_free_open = set() # Cells proven pit-free whose Wumpus variable is still open
+        self._wumpus_clauses = []
+        self.solver = self._build_solver() if sat else None
+        self._witnessed = set()     # Literals true in some model found since the solver's last change
+        self._witness_version = -1
+        self._cow_shared = False
+
+    def reset(self):
+        """Forgets everything told so far, keeping the containers, for a new game on the same grid."""
+        if self._cow_shared:
+            self._own()
+        self.facts.clear()
+        self.values[:] = bytes(len(self.values))
+        self.clauses.clear()
+        self.satisfied.clear()
+        self.watches.clear()
+        self._agenda.clear()
+        self._told.clear()
+        self.wumpus_candidates = None
+        self.wumpus_dead = False
+        self._pit_free_open.clear()
+        self._wumpus_clauses.clear()
+        if self.solver is not None:
+            self.solver = self._build_solver() # Learned clauses may depend on the old percepts
+        self._witnessed.clear()
+        self._witness_version = -1
+
+    # --- Encoding helpers -------------------------------------------------
+
+    def cell_index(self, r, c):
+        return r * self.grid_size + c
+
+    def cell_of(self, index):
+        return divmod(index, self.grid_size)
+
+    @staticmethod
+    def pit_var(index):
+        return 2 * index
+
+    @staticmethod
+    def wumpus_var(index):
+        return 2 * index + 1
+
+    def _neighbor_indices(self, r, c):
+        n = self.grid_size
+        neighbors = []
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < n and 0 <= nc < n:
+                neighbors.append(nr * n + nc)
+        return neighbors
+
+    def _build_solver(self):
+        """
+        The rules that hold before anything is perceived, as CNF: exactly one cell has the
+        Wumpus (dead or alive). Breeze(i) <-> a neighbor has a pit and Stench(i) <-> a neighbor
+        has the Wumpus only matter where the percept is known, so tell_percepts adds them
+        instantiated for the cell; the formula only grows and learned clauses carry over.
+        """
+        cells = self.grid_size * self.grid_size
+        solver = CDCLSolver(2 * cells)
+        # Exactly one Wumpus through a sequential counter: aux variable k is true iff the
+        # Wumpus is in one of cells 0..k. Every clause is short, so propagation stays linear
+        # where one clause over all cells would be rescanned for each cell ruled out.
+        counter = solver.new_vars(cells - 1)
+        for i in range(cells):
+            wumpus = 2 * self.wumpus_var(i)
+            here = 2 * (counter + i)        # "in cells 0..i"
+            before = 2 * (counter + i - 1)  # "in cells 0..i-1"
+            if i < cells - 1:
+                solver.add_clause([wumpus + 1, here])
+            if i == 0:
+                solver.add_clause([here + 1, wumpus])
+                continue
+            solver.add_clause([wumpus + 1, before + 1]) # At most one
+            if i < cells - 1:
+                solver.add_clause([before + 1, here])
+                solver.add_clause([here + 1, before, wumpus])
+            else:
+                solver.add_clause([before, wumpus]) # At least one
+        for i in range(cells):
+            # Deciding "the Wumpus is here" settles every other Wumpus and counter variable
+            # by propagation, where deciding "not here" would take one decision per cell
+            solver.prefer(2 * self.wumpus_var(i))
+        return solver
+
+    def _tell_solver(self, var, value):
+        if self.solver is not None:
+            self.solver.add_clause([2 * var + (0 if value == TRUE else 1)])
+
+    def _tell_solver_percepts(self, index, neighbors, percepts):
+        solver = self.solver
+        solver.add_clause([2 * self.pit_var(index) + 1])
+        if self.config.BREEZE in percepts:
+            solver.add_clause([2 * self.pit_var(i) for i in neighbors])
+        else:
+            for i in neighbors:
+                solver.add_clause([2 * self.pit_var(i) + 1])
+        if self.wumpus_dead:
+            return # A dead Wumpus no longer smells, and its cell may be walked into
+        solver.add_clause([2 * self.wumpus_var(index) + 1])
+        if self.config.STENCH in percepts:
+            solver.add_clause([2 * self.wumpus_var(i) for i in neighbors])
+        else:
+            for i in neighbors:
+                solver.add_clause([2 * self.wumpus_var(i) + 1])
+
+    # --- Telling ----------------------------------------------------------
 
     def tell(self, fact):
-        """Adds a fact to the knowledge base."""
+        """Adds a fact to the knowledge base. Pit/Wumpus/Safe facts are also fed to the inference engine."""
+        if self._cow_shared:
+            self._own()
         self.facts.add(fact)
+        parsed = _parse_fact(fact)
+        if parsed is None:
+            return set()
+        name, r, c = parsed
+        index = self.cell_index(r, c)
+        changed = set()
+        if name == "Safe":
+            self._assign(self.pit_var(index), FALSE, changed)
+            self._assign(self.wumpus_var(index), FALSE, changed)
+            self._tell_solver(self.pit_var(index), FALSE)
+            if not self.wumpus_dead: # The dead Wumpus's cell is safe too
+                self._tell_solver(self.wumpus_var(index), FALSE)
+        elif name == "Pit":
+            self._assign(self.pit_var(index), TRUE, changed)
+            self._tell_solver(self.pit_var(index), TRUE)
+        elif name == "Wumpus":
+            self._assign(self.wumpus_var(index), TRUE, changed)
+            self._tell_solver(self.wumpus_var(index), TRUE)
+        self._propagate(changed)
+        return changed
+
+    def tell_percepts(self, r, c, percepts):
+        """
+        Adds what was perceived while standing (alive) on (r, c) and runs forward chaining.
+        Returns the set of cell indices whose knowledge changed.
+        """
+        if self._cow_shared:
+            self._own()
+        index = self.cell_index(r, c)
+        changed = set()
+        self._assign(self.pit_var(index), FALSE, changed)
+        self._assign(self.wumpus_var(index), FALSE, changed)
+        if index not in self._told:
+            self._told.add(index)
+            neighbors = self._neighbor_indices(r, c)
+            if self.solver is not None:
+                self._tell_solver_percepts(index, neighbors, percepts)
+            if self.config.BREEZE in percepts:
+                self._add_clause([2 * self.pit_var(i) for i in neighbors], changed)
+            else:
+                for i in neighbors:
+                    self._assign(self.pit_var(i), FALSE, changed)
+            if not self.wumpus_dead:
+                if self.config.STENCH in percepts:
+                    self._wumpus_clauses.append(len(self.clauses))
+                    self._add_clause([2 * self.wumpus_var(i) for i in neighbors], changed)
+                    self._restrict_wumpus(neighbors, changed)
+                else:
+                    for i in neighbors:
+                        self._assign(self.wumpus_var(i), FALSE, changed)
+        self._propagate(changed)
+        return changed
+
+    def tell_wumpus_dead(self):
+        """The Wumpus screamed: no cell holds a live Wumpus any more."""
+        changed = set()
+        if self.wumpus_dead:
+            return changed
+        if self._cow_shared:
+            self._own()
+        self.wumpus_dead = True
+        for index in self.wumpus_candidates or ():
+            if self.values[self.wumpus_var(index)] == TRUE:
+                self.values[self.wumpus_var(index)] = FALSE
+                changed.add(index)
+        # Stench clauses no longer constrain anything
+        for clause_id in self._wumpus_clauses:
+            self._satisfy(clause_id, changed)
+        self._restrict_wumpus([], changed)
+        self._propagate(changed)
+        return changed
+
+    def _add_clause(self, literals, changed):
+        clause_id = len(self.clauses)
+        self.clauses.append(literals)
+        self.satisfied.append(False)
+        for lit in literals:
+            self.watches[lit] = self.watches.get(lit, ()) + (clause_id,)
+            changed.add((lit >> 1) >> 1)
+        self._check_clause(clause_id, changed)
+
+    def _restrict_wumpus(self, neighbors, changed):
+        if self.wumpus_candidates is None:
+            self.wumpus_candidates = set(neighbors)
+        else:
+            self.wumpus_candidates &= set(neighbors)
+        self._settle_wumpus(changed)
+
+    def _settle_wumpus(self, changed):
+        candidates = {i for i in self.wumpus_candidates if self.values[self.wumpus_var(i)] != FALSE}
+        self.wumpus_candidates = candidates
+        if len(candidates) == 1 and not self.wumpus_dead:
+            self._assign(self.wumpus_var(next(iter(candidates))), TRUE, changed)
+        # Pit-free cells outside the candidate set are now fully safe
+        for i in list(self._pit_free_open):
+            if i not in candidates:
+                self._assign(self.wumpus_var(i), FALSE, changed)
+
+    # --- Forward chaining -------------------------------------------------
+
+    def _assign(self, var, value, changed):
+        if self.values[var] != UNKNOWN:
+            return # Already known; a conflicting value can only come from a changed world
+        if value == TRUE and var & 1 and self.wumpus_dead:
+            return
+        self.values[var] = value
+        self._agenda.append(var)
+        changed.add(var >> 1)
+
+    def _satisfy(self, clause_id, changed):
+        if not self.satisfied[clause_id]:
+            self.satisfied[clause_id] = True
+            # The other cells in the clause are no longer suspects because of it
+            changed.update((lit >> 1) >> 1 for lit in self.clauses[clause_id])
+
+    def _check_clause(self, clause_id, changed):
+        if self.satisfied[clause_id]:
+            return
+        open_literal = None
+        open_count = 0
+        for lit in self.clauses[clause_id]:
+            value = self.values[lit >> 1]
+            if value == UNKNOWN:
+                open_literal = lit
+                open_count += 1
+            elif (value == TRUE) != (lit & 1 == 1):
+                self._satisfy(clause_id, changed)
+                return
+        if open_count == 1:
+            self._assign(open_literal >> 1, FALSE if open_literal & 1 else TRUE, changed)
+
+    def _propagate(self, changed):
+        while self._agenda:
+            var = self._agenda.pop()
+            value = self.values[var]
+            false_literal = 2 * var + (1 if value == TRUE else 0)
+            true_literal = false_literal ^ 1
+            for clause_id in self.watches.get(true_literal, ()):
+                self._satisfy(clause_id, changed)
+            for clause_id in self.watches.get(false_literal, ()):
+                self._check_clause(clause_id, changed)
+
+            index = var >> 1
+            if var & 1: # Wumpus variable
+                if value == TRUE:
+                    self.wumpus_candidates = {index}
+                    self._settle_wumpus(changed)
+                elif self.wumpus_candidates is not None and index in self.wumpus_candidates:
+                    self._settle_wumpus(changed)
+                self._pit_free_open.discard(index)
+            elif value == FALSE and self.values[self.wumpus_var(index)] == UNKNOWN:
+                if self.wumpus_dead or (self.wumpus_candidates is not None and index not in self.wumpus_candidates):
+                    self._assign(self.wumpus_var(index), FALSE, changed)
+                else:
+                    self._pit_free_open.add(index)
+
+    # --- Asking -----------------------------------------------------------
+
+    def is_pit(self, r, c):
+        return self.values[self.pit_var(self.cell_index(r, c))] == TRUE
+
+    def is_wumpus(self, r, c):
+        return self.values[self.wumpus_var(self.cell_index(r, c))] == TRUE
+
+    def is_safe(self, r, c):
+        index = self.cell_index(r, c)
+        return self.values[self.pit_var(index)] == FALSE and self.values[self.wumpus_var(index)] == FALSE
+
+    def _in_open_clause(self, var):
+        return any(not self.satisfied[clause_id] for clause_id in self.watches.get(2 * var, ()))
+
+    def cell_status_code(self, index):
+        """Status code for the agent's map; see STATUS_NAMES."""
+        pit = self.values[self.pit_var(index)]
+        wumpus = self.values[self.wumpus_var(index)]
+        if pit == FALSE and wumpus == FALSE:
+            return STATUS_SAFE
+        if pit == TRUE:
+            return STATUS_PIT
+        if wumpus == TRUE:
+            return STATUS_WUMPUS
+        if pit == UNKNOWN and self._in_open_clause(self.pit_var(index)):
+            return STATUS_PIT_SUSPECTED
+        if wumpus == UNKNOWN and self._in_open_clause(self.wumpus_var(index)):
+            return STATUS_WUMPUS_SUSPECTED
+        return STATUS_UNKNOWN
+
+    def cell_status(self, index):
+        """Status string for the agent's map: Safe, Pit, Wumpus, Pit?, Wumpus? or Unknown."""
+        return STATUS_NAMES[self.cell_status_code(index)]
+
+    def entails(self, name, r, c):
+        """
+        Whether Safe/Pit/Wumpus(r,c) holds in every world consistent with what was told,
+        decided by the SAT solver: the KB entails a fact iff the KB plus the fact's negation
+        (passed as assumptions) is unsatisfiable. None without a solver, or if the tells
+        contradict each other.
+        """
+        solver = self.solver
+        if solver is None or not solver.ok:
+            return None
+        if self._cow_shared:
+            self._own() # Searching rewrites the solver's clauses and learns new ones
+            solver = self.solver
+        index = self.cell_index(r, c)
+        pit = 2 * self.pit_var(index)
+        wumpus = 2 * self.wumpus_var(index)
+        if name == "Pit":
+            result = not self._satisfiable(pit + 1)
+        elif name == "Wumpus":
+            result = not self.wumpus_dead and not self._satisfiable(wumpus + 1)
+        elif name == "Safe":
+            result = not self._satisfiable(pit) and (self.wumpus_dead or not self._satisfiable(wumpus))
+        else:
+            raise ValueError(f"Unknown query: {name}")
+        return result if self.solver.ok else None
+
+    def _satisfiable(self, literal):
+        # Every model the solver finds is remembered until the next tell changes the formula,
+        # so a query whose literal already held in one of them needs no search
+        solver = self.solver
+        if self._witness_version != solver.version:
+            self._witness_version = solver.version
+            self._witnessed.clear()
+        if literal in self._witnessed:
+            return True
+        if not solver.solve([literal]):
+            return False
+        # Literals the model left unassigned are unconstrained, so they hold in a model too
+        lit_values = solver.lit_values
+        self._witnessed.update(lit for lit in range(4 * self.grid_size * self.grid_size) if lit_values[lit] != FALSE)
+        return True
 
     def ask(self, query):
         """
-        Queries the knowledge base for a fact.
-        For a more advanced KB, this would involve inference rules.
-        For now, it's a simple lookup.
+        Queries the knowledge base for a fact. Safe(r,c), Pit(r,c) and Wumpus(r,c) are
+        answered from what the inference engine has proven, and with the SAT backend from
+        full entailment when forward chaining falls short; anything else is a lookup of
+        facts told directly.
         """
+        parsed = _parse_fact(query)
+        if parsed is not None:
+            name, r, c = parsed
+            if 0 <= r < self.grid_size and 0 <= c < self.grid_size:
+                proven = None
+                if name == "Safe":
+                    proven = self.is_safe(r, c)
+                elif name == "Pit":
+                    proven = self.is_pit(r, c)
+                elif name == "Wumpus":
+                    proven = self.is_wumpus(r, c)
+                if proven is not None:
+                    return proven or bool(self.entails(name, r, c))
         return query in self.facts
 
+    # --- Older entry points -----------------------------------------------
+
     def infer_safe_from_no_percepts(self, r, c, neighbors_percepts):
         """
-        Example inference: If a cell (r,c) has no breeze and no stench,
-        then its neighbors are safe from pits and Wumpus.
+        Tells the KB what was perceived on (r, c); with no breeze and no stench every
+        neighbor becomes safe. Same as tell_percepts, and returns the changed cells too.
         """
-        # This is typically called by the agent's infer_from_percepts method
-        # but the KB could also contain more general rules.
-        pass
+        return self.tell_percepts(r, c, neighbors_percepts)
 
     def apply_wumpus_logic(self, known_grid):
         """
-        More complex inference rules for Wumpus location.
-        E.g., if a Wumpus? cell is adjacent to a non-stench cell, it cannot be a Wumpus.
+        Wumpus rules now run on every tell, so nothing is left to apply; known_grid is
+        ignored. Returns the (empty) set of changed cells.
         """
-        # This is where a more sophisticated inference engine would live.
-        # For example, using resolution or forward/backward chaining.
-        pass
+        changed = set()
+        self._propagate(changed)
+        return changed
 
     def apply_pit_logic(self, known_grid):
-        """
-        More complex inference rules for Pit location.
-        """
-        pass
\ No newline at end of file
+        """Like apply_wumpus_logic, for pits."""
+        changed = set()
+        self._propagate(changed)
+        return changed
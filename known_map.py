@@ -0,0 +1,111 @@
+# WumpusWorldGame/known_map.py
+
+from types import MappingProxyType
+
+from config import Config
+from cow import CopyOnWrite
+from knowledgebase import STATUS_NAMES
+
+
+class KnownMap(CopyOnWrite):
+    """
+    The agent's map of what it knows, one byte of status code and one byte of percept
+    bits per cell plus a visited bitset, indexed by r * grid_size + c.
+
+    Indexing with (r, c) returns a read-only {"status", "percepts", "visited"} mapping
+    built on demand, the shape the GUI and older callers expect from known_grid.
+
+    A fork shares the three arrays until one side writes; write through set_status() rather
+    than into status directly so a shared map is copied first.
+    """
+
+    __slots__ = ("grid_size", "status", "percept_bits", "visited", "_percept_names", "_percept_masks")
+    _cow_fields = {"status": bytearray.copy, "percept_bits": bytearray.copy, "visited": bytearray.copy}
+
+    def __init__(self, config: Config):
+        n = self.grid_size = config.GRID_SIZE
+        self.status = bytearray(n * n)                 # STATUS_* code per cell
+        self.percept_bits = bytearray(n * n)           # Bitmask of percepts last perceived in the cell
+        self.visited = bytearray((n * n + 7) // 8)     # One bit per cell
+        names = (config.STENCH, config.GLITTER, config.BREEZE, config.BUMP, config.SCREAM)
+        self._percept_names = names
+        self._percept_masks = {name: 1 << bit for bit, name in enumerate(names)}
+        self._cow_shared = False
+
+    def reset(self):
+        """Forgets everything, keeping the arrays, for a new game on the same grid."""
+        if self._cow_shared:
+            self._own()
+        for array in (self.status, self.percept_bits, self.visited):
+            array[:] = bytes(len(array))
+
+    def index(self, r, c):
+        return r * self.grid_size + c
+
+    def is_visited(self, index):
+        return self.visited[index >> 3] >> (index & 7) & 1
+
+    def mark_visited(self, index):
+        if self._cow_shared:
+            self._own()
+        self.visited[index >> 3] |= 1 << (index & 7)
+
+    def set_percepts(self, index, percepts):
+        if self._cow_shared:
+            self._own()
+        masks = self._percept_masks
+        bits = 0
+        for percept in percepts:
+            bits |= masks.get(percept, 0)
+        self.percept_bits[index] = bits
+
+    def set_status(self, index, status):
+        if self._cow_shared:
+            self._own()
+        self.status[index] = status
+
+    def percepts(self, index):
+        bits = self.percept_bits[index]
+        return [name for bit, name in enumerate(self._percept_names) if bits >> bit & 1]
+
+    def status_name(self, index):
+        return STATUS_NAMES[self.status[index]]
+
+    # --- Read-only known_grid view ---------------------------------------
+
+    def __getitem__(self, cell):
+        r, c = cell
+        if not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
+            raise KeyError(cell)
+        index = r * self.grid_size + c
+        return MappingProxyType({
+            "status": STATUS_NAMES[self.status[index]],
+            "percepts": self.percepts(index),
+            "visited": bool(self.is_visited(index)),
+        })
+
+    def __contains__(self, cell):
+        r, c = cell
+        return 0 <= r < self.grid_size and 0 <= c < self.grid_size
+
+    def __len__(self):
+        return self.grid_size * self.grid_size
+
+    def __iter__(self):
+        n = self.grid_size
+        return ((r, c) for r in range(n) for c in range(n))
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        return ((cell, self[cell]) for cell in self)
+
+    def visited_cells(self):
+        n = self.grid_size
+        for byte_index, byte in enumerate(self.visited):
+            while byte:
+                low = byte & -byte
+                index = byte_index * 8 + low.bit_length() - 1
+                yield divmod(index, n)
+                byte ^= low
@@ -1,8 +1,11 @@
 # WumpusWorldGame/logic.py
 
+from collections import deque
+
 from config import Config
 from environment import WumpusEnvironment
 from agent import WumpusAgent
+from cow import copy_attributes, undo_record, apply_undo
 
 class GameLogic:
     def __init__(self, environment: WumpusEnvironment, agent: WumpusAgent, config: Config):
@@ -11,6 +14,59 @@ class GameLogic:
         self.config = config
         self.game_state = self.config.GAME_RUNNING
 
+    def reset(self, rng=None, layout=None):
+        """Starts a new game with the same environment and agent objects (see their reset())."""
+        self.environment.reset(rng=rng, layout=layout)
+        self.agent.reset(rng=rng)
+        self.game_state = self.config.GAME_RUNNING
+
+    # --- Branching --------------------------------------------------------
+
+    def fork(self):
+        """
+        An independent game in the same state, for lookahead. World and agent state are
+        shared copy-on-write: forking copies references only, but the first write after it
+        copies every container of the part written (the known map and knowledge base arrays
+        are the size of the grid, the planners' the size of the explored area) in whichever
+        game writes. A branch that plays on costs that once; to keep a long history, keep
+        undo records (see UndoHistory) rather than snapshots.
+        """
+        clone = GameLogic(self.environment.fork(), self.agent.fork(), self.config)
+        clone.game_state = self.game_state
+        return clone
+
+    def snapshot(self):
+        """The current state, to hand back to restore() later. Do not play the snapshot itself."""
+        return self.fork()
+
+    def undo_record(self, snapshot):
+        """
+        The changes that take this game's current state back to snapshot (a snapshot() of
+        it taken earlier), holding only what differs: about as large as the cells changed
+        in between. undo() applies it to a game in exactly this state, such as a fork of
+        a snapshot taken now; see UndoHistory.
+        """
+        return (undo_record(snapshot.environment, self.environment),
+                undo_record(snapshot.agent, self.agent), snapshot.game_state)
+
+    def undo(self, record):
+        """Puts this game back into the state an undo_record() leads to, in place."""
+        environment, agent, game_state = record
+        apply_undo(self.environment, environment)
+        apply_undo(self.agent, agent)
+        self.game_state = game_state
+
+    def restore(self, snapshot):
+        """
+        Puts this game back into a state taken with snapshot(). The environment and agent
+        objects are kept (the GUI and any method wrappers stay attached) and only their
+        state is replaced. A snapshot can be restored any number of times.
+        """
+        state = snapshot.fork()
+        copy_attributes(state.environment, self.environment)
+        copy_attributes(state.agent, self.agent)
+        self.game_state = state.game_state
+
     def perceive_current_location(self):
         current_percepts = self.environment.get_percepts_at_location(self.agent.row, self.agent.col)
         self.agent.update_percepts(current_percepts)
@@ -84,4 +140,42 @@ class GameLogic:
         if self.agent.climb_out():
             self.game_state = self.config.GAME_OVER_WON
             return True, "You successfully climbed out with the gold! You Win!"
-        return False, "You can only climb out from the starting point with the gold!"
\ No newline at end of file
+        return False, "You can only climb out from the starting point with the gold!"
+
+
+class UndoHistory:
+    """
+    Undo for a game played one action at a time, holding at most limit steps. Only the
+    state before the latest action is kept as a snapshot; each earlier one is kept as the
+    undo_record() from the snapshot after it, so memory grows with the cells the actions
+    change rather than with the grid. Records are taken between snapshots, never from the
+    live game, whose planners also change when the agent is only asked for an action.
+    """
+
+    def __init__(self, limit=None):
+        self.records = deque(maxlen=None if limit is None else max(limit - 1, 0))
+        self.snapshot = None
+
+    def __len__(self):
+        return len(self.records) + (self.snapshot is not None)
+
+    def clear(self):
+        self.records.clear()
+        self.snapshot = None
+
+    def push(self, game_logic):
+        """Call before each action."""
+        snapshot = game_logic.snapshot()
+        if self.snapshot is not None:
+            self.records.append(snapshot.undo_record(self.snapshot))
+        self.snapshot = snapshot
+
+    def pop(self, game_logic):
+        """Puts game_logic back into the state before the latest action not yet undone."""
+        game_logic.restore(self.snapshot)
+        if self.records:
+            previous = self.snapshot.fork()
+            previous.undo(self.records.pop())
+            self.snapshot = previous
+        else:
+            self.snapshot = None
@@ -54,29 +54,24 @@ class WumpusGameApp:
             new_grid_size = int(self.grid_size_entry.get())
             new_num_pits = int(self.num_pits_entry.get())
 
-            if new_grid_size < 4 or new_grid_size > 10: # Example constraints
-                raise ValueError("Grid size must be between 4 and 10.")
+            if new_grid_size < 4: # Larger worlds are shown in a scrollable, zoomable viewport
+                raise ValueError("Grid size must be at least 4.")
             if new_num_pits < 0 or new_num_pits >= new_grid_size * new_grid_size - 2: # Min 2 spots for agent/gold
                 raise ValueError("Invalid number of pits.")
 
             self.config.GRID_SIZE = new_grid_size
             self.config.NUM_PITS = new_num_pits
 
-            # Initialize game components with new configuration
-            self.environment = WumpusEnvironment(self.config)
-            self.agent = WumpusAgent(self.config)
-            self.game_logic = GameLogic(self.environment, self.agent, self.config)
+            self._new_game()
 
             # Clear initial config UI and set up game UI
             for widget in self.master.winfo_children():
                 widget.destroy()
 
-            self.gui = WumpusGUI(self.master, self.game_logic, self.config, self.environment.grid)
+            self.gui = WumpusGUI(self.master, self.game_logic, self.config, on_reset=self.reset_game)
             self.gui.pack(expand=True, fill='both')
 
             # Initial update of the UI based on agent's starting perceptions
-            self.game_logic.perceive_current_location()
-            self.gui.update_grid(self.game_logic.agent.known_grid)
             self.gui.update_percepts_display(self.game_logic.agent.percepts)
             self.gui.update_score(self.game_logic.agent.score)
 
@@ -85,6 +80,21 @@ class WumpusGameApp:
         except Exception as e:
             tk.messagebox.showerror("Game Initialization Error", f"An unexpected error occurred: {e}")
 
+    def _new_game(self):
+        # Initialize game components with the current configuration
+        self.environment = WumpusEnvironment(self.config)
+        self.agent = WumpusAgent(self.config)
+        self.game_logic = GameLogic(self.environment, self.agent, self.config)
+
+        # Initial agent perceptions at the starting cell
+        self.game_logic.perceive_current_location()
+        self.agent.infer_from_percepts()
+
+    def reset_game(self):
+        """Starts a new world with the same configuration, reusing the existing window and GUI."""
+        self._new_game()
+        self.gui.load_game(self.game_logic)
+
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,93 @@
+# WumpusWorldGame/observation.py
+
+import numpy as np
+
+from config import Config
+from knowledgebase import STATUS_NAMES
+
+# Planes of an encoded grid, each grid_size x grid_size
+STATUS_PLANES = 0                                 # One-hot STATUS_* code of known_map, len(STATUS_NAMES) planes
+VISITED_PLANE = STATUS_PLANES + len(STATUS_NAMES)
+PERCEPT_PLANES = VISITED_PLANE + 1                # Percepts last perceived in each cell, in KnownMap bit order
+POSITION_PLANE = PERCEPT_PLANES + 5
+NUM_PLANES = POSITION_PLANE + 1
+
+# Entries of an encoded feature vector
+DIRECTION_FEATURES = 0                            # One-hot facing direction, in the order of DIRECTIONS
+ARROW_FEATURE = 4
+GOLD_FEATURE = 5
+PERCEPT_FEATURES = 6                              # Current percepts, in KnownMap bit order
+NUM_FEATURES = PERCEPT_FEATURES + 5
+
+# Same order as WumpusAgent.turn_left and VecWumpusEnvironment.direction
+DIRECTIONS = ("right", "up", "left", "down")
+
+
+class ObservationEncoder:
+    """
+    Turns a WumpusAgent's state into fixed-shape arrays for learning agents: a grid of
+    NUM_PLANES x grid_size x grid_size planes (map status one-hot, visited mask, percept
+    planes, agent position) and a feature vector of NUM_FEATURES entries (direction one-hot,
+    arrow, gold, current percepts). All values are 0 or 1.
+
+    encode() reads the agent's KnownMap byte arrays directly through NumPy views and writes
+    into arrays it is given (e.g., a replay buffer slot) or into the encoder's own, so a
+    step allocates nothing the size of the grid.
+    """
+
+    def __init__(self, config: Config, dtype=np.float32):
+        self.config = config
+        n = self.grid_size = config.GRID_SIZE
+        cells = n * n
+        self.grid_shape = (NUM_PLANES, n, n)
+        self.dtype = np.dtype(dtype)
+        self.grid = np.zeros(self.grid_shape, dtype=self.dtype)
+        self.features = np.zeros(NUM_FEATURES, dtype=self.dtype)
+
+        self._status_codes = np.arange(len(STATUS_NAMES), dtype=np.uint8).reshape(-1, 1, 1)
+        self._visited_byte = np.arange(cells) >> 3
+        self._visited_shift = (np.arange(cells) & 7).astype(np.uint8)
+        self._percept_shifts = np.arange(5, dtype=np.uint8).reshape(-1, 1)
+        self._cell_scratch = np.zeros(cells, dtype=np.uint8)
+        self._percept_scratch = np.zeros((5, cells), dtype=np.uint8)
+        names = (config.STENCH, config.GLITTER, config.BREEZE, config.BUMP, config.SCREAM)
+        self._percept_features = {name: PERCEPT_FEATURES + bit for bit, name in enumerate(names)}
+        self._direction_features = {name: DIRECTION_FEATURES + i for i, name in enumerate(DIRECTIONS)}
+
+    def encode(self, agent, grid=None, features=None):
+        """
+        Writes the agent's observation into grid and features (the encoder's own arrays if
+        None) and returns them. The encoder's arrays are overwritten by the next call.
+        """
+        grid = self.grid if grid is None else grid
+        features = self.features if features is None else features
+        known_map = agent.known_map
+        n = self.grid_size
+
+        # The map's arrays may be replaced (copy-on-write), so views are taken per call
+        status = np.frombuffer(known_map.status, dtype=np.uint8).reshape(n, n)
+        np.equal(status, self._status_codes, out=grid[STATUS_PLANES:VISITED_PLANE])
+
+        scratch = self._cell_scratch
+        np.take(np.frombuffer(known_map.visited, dtype=np.uint8), self._visited_byte, out=scratch)
+        np.right_shift(scratch, self._visited_shift, out=scratch)
+        np.bitwise_and(scratch, 1, out=scratch)
+        grid[VISITED_PLANE] = scratch.reshape(n, n)
+
+        percepts = self._percept_scratch
+        np.right_shift(np.frombuffer(known_map.percept_bits, dtype=np.uint8), self._percept_shifts, out=percepts)
+        np.bitwise_and(percepts, 1, out=percepts)
+        grid[PERCEPT_PLANES:POSITION_PLANE] = percepts.reshape(5, n, n)
+
+        grid[POSITION_PLANE] = 0
+        grid[POSITION_PLANE, agent.row, agent.col] = 1
+
+        features[:] = 0
+        features[self._direction_features[agent.direction]] = 1
+        features[ARROW_FEATURE] = agent.has_arrow
+        features[GOLD_FEATURE] = agent.has_gold
+        for percept in agent.percepts:
+            index = self._percept_features.get(percept)
+            if index is not None:
+                features[index] = 1
+        return grid, features
@@ -0,0 +1,187 @@
+# WumpusWorldGame/planner.py
+
+import heapq
+
+from cow import CopyOnWrite
+
+INF = float("inf")
+
+
+class DStarLite(CopyOnWrite):
+    """
+    Incremental shortest-path planner (D* Lite) over the cells the agent may walk on.
+
+    The search runs backwards from a set of goal cells towards the agent, so when the
+    agent moves, a cell becomes walkable or the goal set changes, only the affected part
+    of the search tree is repaired instead of replanning from scratch. Every step between
+    two walkable neighbors costs 1.
+
+    fork() gives an independent planner that shares the search state until either copy
+    changes it (see cow.py).
+    """
+
+    _cow_fields = {"g": dict.copy, "rhs": dict.copy, "passable": set.copy, "goals": set.copy,
+                   "_queue": list.copy, "_queued": dict.copy}
+
+    def __init__(self, grid_size, start, goals=()):
+        self.grid_size = grid_size
+        self.start = start
+        self._last_start = start
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.passable = set()
+        self.goals = set()
+        self._queue = []      # heap of (key, cell); stale entries are skipped
+        self._queued = {}     # cell -> key currently valid in the heap
+        self._neighbor_cache = {} # Shared between forks: it never changes a cell's neighbors
+        self._cow_shared = False
+        self.set_goals(goals)
+
+    def reset(self, start, goals=()):
+        """Starts over from start with no walkable cells, keeping the containers."""
+        if self._cow_shared:
+            self._own()
+        self.start = start
+        self._last_start = start
+        self.km = 0
+        self.g.clear()
+        self.rhs.clear()
+        self.passable.clear()
+        self.goals.clear()
+        self._queue.clear()
+        self._queued.clear()
+        self.set_goals(goals)
+
+    # --- Graph changes ----------------------------------------------------
+
+    def set_passable(self, cell, passable=True):
+        if (cell in self.passable) == passable:
+            return
+        if self._cow_shared:
+            self._own()
+        if passable:
+            self.passable.add(cell)
+        else:
+            self.passable.discard(cell)
+        self._update_vertex(cell)
+        for neighbor in self._neighbors(cell):
+            self._update_vertex(neighbor)
+
+    def set_goals(self, goals):
+        if self._cow_shared:
+            self._own()
+        goals = set(goals)
+        changed = self.goals ^ goals
+        self.goals = goals
+        for cell in changed:
+            self._update_vertex(cell)
+
+    def add_goal(self, cell):
+        if cell not in self.goals:
+            if self._cow_shared:
+                self._own()
+            self.goals.add(cell)
+            self._update_vertex(cell)
+
+    def remove_goal(self, cell):
+        if cell in self.goals:
+            if self._cow_shared:
+                self._own()
+            self.goals.discard(cell)
+            self._update_vertex(cell)
+
+    def move_start(self, cell):
+        if cell != self.start:
+            self.start = cell
+            self.km += self._heuristic(self._last_start, cell)
+            self._last_start = cell
+
+    # --- Queries ----------------------------------------------------------
+
+    def next_step(self):
+        """Returns the neighbor of start on a shortest path to the nearest goal, or None."""
+        self._compute_shortest_path()
+        if self.start in self.goals or self.g.get(self.start, INF) == INF:
+            return None
+        best, best_cost = None, INF
+        for neighbor in self._neighbors(self.start):
+            if neighbor in self.passable:
+                cost = 1 + self.g.get(neighbor, INF)
+                if cost < best_cost:
+                    best, best_cost = neighbor, cost
+        return best
+
+    def distance(self):
+        """Length of the shortest path from start to the nearest goal (inf if unreachable)."""
+        self._compute_shortest_path()
+        return self.g.get(self.start, INF)
+
+    # --- D* Lite internals ------------------------------------------------
+
+    def _neighbors(self, cell):
+        neighbors = self._neighbor_cache.get(cell)
+        if neighbors is None:
+            r, c = cell
+            n = self.grid_size
+            neighbors = [(nr, nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                         if 0 <= nr < n and 0 <= nc < n]
+            self._neighbor_cache[cell] = neighbors
+        return neighbors
+
+    def _heuristic(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _key(self, cell):
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (best + self._heuristic(self.start, cell) + self.km, best)
+
+    def _update_vertex(self, cell):
+        if cell in self.goals and cell in self.passable:
+            self.rhs[cell] = 0
+        elif cell in self.passable:
+            best = INF
+            for neighbor in self._neighbors(cell):
+                if neighbor in self.passable:
+                    best = min(best, 1 + self.g.get(neighbor, INF))
+            self.rhs[cell] = best
+        else:
+            self.rhs[cell] = INF
+        self._queued.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs[cell]:
+            key = self._key(cell)
+            self._queued[cell] = key
+            heapq.heappush(self._queue, (key, cell))
+
+    def _top(self):
+        while self._queue:
+            key, cell = self._queue[0]
+            if self._queued.get(cell) == key:
+                return key, cell
+            heapq.heappop(self._queue) # Stale entry
+        return (INF, INF), None
+
+    def _compute_shortest_path(self):
+        if self._cow_shared:
+            self._own()
+        start = self.start
+        while True:
+            top_key, cell = self._top()
+            if cell is None:
+                break
+            if not (top_key < self._key(start) or self.rhs.get(start, INF) != self.g.get(start, INF)):
+                break
+            new_key = self._key(cell)
+            if top_key < new_key:
+                self._queued[cell] = new_key
+                heapq.heappush(self._queue, (new_key, cell))
+            elif self.g.get(cell, INF) > self.rhs.get(cell, INF):
+                self.g[cell] = self.rhs[cell]
+                del self._queued[cell]
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
+            else:
+                self.g[cell] = INF
+                self._update_vertex(cell)
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
@@ -0,0 +1,418 @@
+# WumpusWorldGame/probability.py
+
+from collections import OrderedDict
+from math import comb, exp, inf, lgamma
+
+from config import Config
+from cow import CopyOnWrite, copy_optional_set
+
+
+class Beliefs:
+    """Per-cell probabilities of a pit and of the Wumpus, as computed by ProbabilityEngine."""
+
+    def __init__(self, pit, pit_default, wumpus, wumpus_default, no_pit, no_wumpus):
+        self.pit = pit                       # (r, c) -> P(pit) for frontier cells
+        self.pit_default = pit_default       # P(pit) for unknown cells away from the frontier
+        self.wumpus = wumpus                 # (r, c) -> P(Wumpus) for candidate cells
+        self.wumpus_default = wumpus_default # P(Wumpus) for the remaining unknown cells
+        self.no_pit = no_pit                 # Cells known not to hold a pit
+        self.no_wumpus = no_wumpus           # Cells known not to hold the Wumpus
+
+    def pit_probability(self, r, c):
+        if (r, c) in self.no_pit:
+            return 0.0
+        return self.pit.get((r, c), self.pit_default)
+
+    def wumpus_probability(self, r, c):
+        if (r, c) in self.no_wumpus:
+            return 0.0
+        return self.wumpus.get((r, c), self.wumpus_default)
+
+    def danger(self, r, c):
+        """Probability that entering (r, c) is fatal."""
+        return 1.0 - (1.0 - self.pit_probability(r, c)) * (1.0 - self.wumpus_probability(r, c))
+
+
+class ProbabilityEngine(CopyOnWrite):
+    """
+    Exact pit and Wumpus probabilities from what the agent has perceived.
+
+    Pits: NUM_PITS pits are spread uniformly over the unvisited cells. Breeze percepts only
+    constrain the frontier (unknown cells next to a visited cell), so the frontier is split
+    into connected components that share no breeze constraint. Each component is enumerated
+    on its own, giving the number of consistent assignments for every pit count; components
+    are then combined with the binomial count of placing the remaining pits in the
+    unconstrained cells. Component results are cached by their signature (cells plus
+    constraints), so a component that did not change between steps is never re-enumerated.
+
+    Those counts grow without bound with the grid and the number of pits, so by default
+    they are combined as floats: each component's counts are scaled to a maximum of 1, and
+    the binomial factors are taken in log space relative to their largest value. Only
+    ratios of counts matter, so the probabilities are the same up to rounding. exact=True
+    keeps every count an exact integer, which is only practical on small grids.
+
+    Wumpus: exactly one, uniform over the cells consistent with every stench and no-stench
+    observation. Overlap between the Wumpus, gold and pits is ignored.
+
+    Forks share the component cache, whose entries depend only on their signature.
+    """
+
+    _cow_fields = {"visited": set.copy, "no_pit": set.copy, "breeze_cells": list.copy,
+                   "no_wumpus": set.copy, "wumpus_candidates": copy_optional_set}
+
+    def __init__(self, config: Config, cache_size=4096, exact=False):
+        self.config = config
+        self.grid_size = config.GRID_SIZE
+        self.cache_size = cache_size
+        self.exact = exact
+        self._cache = OrderedDict() # component signature -> (weights, cell_weights)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.visited = set()
+        self.no_pit = set()         # Visited cells and neighbors of breeze-free cells
+        self.breeze_cells = []      # Visited cells with a breeze
+        self.no_wumpus = set()      # Visited cells and neighbors of stench-free cells
+        self.wumpus_candidates = None
+        self.wumpus_dead = False
+        self._beliefs = None        # Last compute() result and the (cells observed, Wumpus dead) it is for
+        self._beliefs_key = None
+        self._cow_shared = False
+
+    def reset(self):
+        """Forgets every observation for a new game. Cached component counts stay valid and are kept."""
+        if self._cow_shared:
+            self._own()
+        self.visited.clear()
+        self.no_pit.clear()
+        self.breeze_cells.clear()
+        self.no_wumpus.clear()
+        self.wumpus_candidates = None
+        self.wumpus_dead = False
+        self._beliefs = None
+        self._beliefs_key = None
+
+    def _neighbors(self, r, c):
+        n = self.grid_size
+        return [(nr, nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                if 0 <= nr < n and 0 <= nc < n]
+
+    def observe(self, r, c, percepts):
+        """Records the percepts of a visited cell. Later visits to the same cell add nothing."""
+        if (r, c) in self.visited:
+            return
+        if self._cow_shared:
+            self._own()
+        self.visited.add((r, c))
+        self.no_pit.add((r, c))
+        self.no_wumpus.add((r, c))
+        neighbors = self._neighbors(r, c)
+        if self.config.BREEZE in percepts:
+            self.breeze_cells.append((r, c))
+        else:
+            self.no_pit.update(neighbors)
+        if self.config.STENCH in percepts:
+            if self.wumpus_candidates is None:
+                self.wumpus_candidates = set(neighbors)
+            else:
+                self.wumpus_candidates &= set(neighbors)
+        else:
+            self.no_wumpus.update(neighbors)
+
+    def sync(self, known_grid):
+        """Observes every visited cell of an agent's known_grid that has not been seen yet."""
+        for (r, c), cell in known_grid.items():
+            if cell["visited"] and (r, c) not in self.visited:
+                self.observe(r, c, cell["percepts"])
+
+    def compute(self):
+        """
+        Beliefs for everything observed so far. Knowledge only changes when a new cell is
+        observed or the Wumpus dies, so until then the same (read-only) Beliefs is returned
+        again, e.g. on every step of a walk over cells already known.
+        """
+        key = (len(self.visited), self.wumpus_dead)
+        if key != self._beliefs_key:
+            pit, pit_default = self._pit_probabilities()
+            wumpus, wumpus_default = self._wumpus_probabilities()
+            self._beliefs = Beliefs(pit, pit_default, wumpus, wumpus_default, self.no_pit, self.no_wumpus)
+            self._beliefs_key = key
+        return self._beliefs
+
+    # --- Pits -------------------------------------------------------------
+
+    def _pit_probabilities(self):
+        num_cells = self.grid_size * self.grid_size
+        unknown_count = num_cells - len(self.no_pit)
+        num_pits = min(self.config.NUM_PITS, unknown_count)
+
+        constraints = []
+        for r, c in self.breeze_cells:
+            cells = frozenset(cell for cell in self._neighbors(r, c) if cell not in self.no_pit)
+            constraints.append(cells)
+        components = self._split_components(constraints)
+        frontier_size = sum(len(cells) for cells, _ in components)
+        free = unknown_count - frontier_size
+
+        solved = [self._solve_cached(cells, cons) for cells, cons in components]
+        if self.exact:
+            return self._combine_exact(solved, free, num_pits)
+        return self._combine_scaled(solved, free, num_pits)
+
+    @staticmethod
+    def _combine_scaled(solved, free, num_pits):
+        # outside[t] is proportional to comb(free, num_pits - t), the ways to place the pits
+        # the frontier does not hold, relative to its largest value; a frontier assignment
+        # with t pits weighs count * outside[t]
+        longest = min(num_pits, sum(len(weights) - 1 for weights, _ in solved))
+        log_ways = [_log_comb(free, num_pits - t) for t in range(longest + 1)]
+        top = max(log_ways)
+        if top == -inf:
+            return {}, 0.0
+        outside = [exp(value - top) for value in log_ways]
+
+        # prefix[i] counts the pit assignments of the components before i; completion[i][j] is
+        # proportional to the ways to place the rest (the components after i, then the free
+        # cells) once j pits are placed. Both are built one component at a time, so "all
+        # components but i" costs O(longest * len(weights)) per component instead of a full
+        # convolution. Every vector is rescaled to a maximum of 1: the scale cancels out of
+        # each ratio below.
+        prefix = [[1.0]]
+        for weights, _ in solved:
+            prefix.append(_rescale(_convolve(prefix[-1], weights, longest)))
+        completion = [outside]
+        for weights, _ in reversed(solved[1:]):
+            completion.append(_rescale(_correlate(weights, completion[-1])))
+        completion.reverse()
+
+        probabilities = {}
+        for i, (weights, cell_weights) in enumerate(solved):
+            before, after = prefix[i], completion[i]
+            # rest[k] is proportional to the ways to complete the board when this component holds k pits
+            rest = [sum(count * after[k + s] for s, count in enumerate(before[:longest + 1 - k]))
+                    for k in range(min(len(weights), longest + 1))]
+            z = sum(count * rest[k] for k, count in enumerate(weights[:len(rest)]))
+            if z == 0:
+                return {}, 0.0
+            for cell, by_count in cell_weights.items():
+                probabilities[cell] = sum(count * rest[k] for k, count in enumerate(by_count[:len(rest)])) / z
+
+        # Each of the free cells holds one of the num_pits - t pits left outside the frontier
+        total = prefix[-1]
+        terms = [count * outside[t] for t, count in enumerate(total) if t <= longest]
+        z = sum(terms)
+        if free <= 0 or z == 0:
+            return probabilities, 0.0
+        return probabilities, sum(term * (num_pits - t) for t, term in enumerate(terms)) / (z * free)
+
+    @staticmethod
+    def _combine_exact(solved, free, num_pits):
+        # Combine: total[s] = number of frontier assignments with s pits overall
+        total = [1]
+        for weights, _ in solved:
+            total = _convolve(total, weights, num_pits)
+        z = sum(count * comb(free, num_pits - s) for s, count in enumerate(total) if s <= num_pits)
+        if z == 0:
+            return {}, 0.0
+
+        # Prefix/suffix products give "all components but i" without re-convolving everything
+        prefix = [[1]]
+        for weights, _ in solved:
+            prefix.append(_convolve(prefix[-1], weights, num_pits))
+        suffix = [[1]]
+        for weights, _ in reversed(solved):
+            suffix.append(_convolve(suffix[-1], weights, num_pits))
+        suffix.reverse()
+
+        probabilities = {}
+        for i, (weights, cell_weights) in enumerate(solved):
+            others = _convolve(prefix[i], suffix[i + 1], num_pits)
+            # rest[k] = ways to place num_pits - k pits outside this component
+            rest = [sum(count * comb(free, num_pits - k - s) for s, count in enumerate(others) if k + s <= num_pits)
+                    for k in range(len(weights))]
+            for cell, by_count in cell_weights.items():
+                probabilities[cell] = sum(count * rest[k] for k, count in enumerate(by_count)) / z
+
+        if free > 0:
+            pit_default = sum(count * comb(free - 1, num_pits - s - 1)
+                              for s, count in enumerate(total) if s < num_pits) / z
+        else:
+            pit_default = 0.0
+        return probabilities, pit_default
+
+    @staticmethod
+    def _split_components(constraints):
+        # Union-find over frontier cells; cells sharing a constraint end up together
+        parent = {}
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for cells in constraints:
+            for cell in cells:
+                parent.setdefault(cell, cell)
+            cells = list(cells)
+            for other in cells[1:]:
+                parent[find(other)] = find(cells[0])
+
+        groups = {}
+        for cell in parent:
+            groups.setdefault(find(cell), [set(), set()])[0].add(cell)
+        for cells in constraints:
+            if cells:
+                groups[find(next(iter(cells)))][1].add(cells)
+        return [(frozenset(cells), frozenset(cons)) for cells, cons in groups.values()]
+
+    def _solve_cached(self, cells, constraints):
+        key = (cells, constraints)
+        if key in self._cache:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.cache_misses += 1
+        result = _solve_component(cells, constraints)
+        if not self.exact:
+            weights, cell_weights = result
+            scale = max(weights)
+            result = ([count / scale for count in weights],
+                      {cell: [count / scale for count in by_count] for cell, by_count in cell_weights.items()})
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    # --- Wumpus -----------------------------------------------------------
+
+    def _wumpus_probabilities(self):
+        if self.wumpus_dead:
+            return {}, 0.0
+        if self.wumpus_candidates is not None:
+            candidates = self.wumpus_candidates - self.no_wumpus
+            if not candidates:
+                return {}, 0.0
+            p = 1.0 / len(candidates)
+            return {cell: p for cell in candidates}, 0.0
+        # Nothing smelled yet: uniform over every cell not ruled out
+        possible = self.grid_size * self.grid_size - len(self.no_wumpus)
+        return {}, (1.0 / possible if possible > 0 else 0.0)
+
+
+def _log_comb(n, k):
+    if k < 0 or k > n:
+        return -inf
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def _rescale(values):
+    top = max(values)
+    return [value / top for value in values] if top > 0 else values
+
+
+def _correlate(weights, values):
+    # out[j] = sum of weights[t] * values[j + t], for as many j as values has
+    size = len(values)
+    return [sum(count * values[j + t] for t, count in enumerate(weights[:size - j])) for j in range(size)]
+
+
+def _convolve(a, b, limit=None):
+    size = len(a) + len(b) - 1
+    if limit is not None:
+        size = min(size, limit + 1)
+    out = [0] * size
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b[:size - i]):
+                out[i + j] += x * y
+    return out
+
+
+def _solve_component(cells, constraints):
+    """
+    Counts the pit assignments of one frontier component that satisfy every breeze
+    constraint (at least one pit among the constraint's cells). Returns
+    (weights, cell_weights) where weights[k] is the number of valid assignments with k pits
+    and cell_weights[cell][k] the number of those in which cell holds a pit.
+    """
+    order = _elimination_order(cells, constraints)
+    position = {cell: i for i, cell in enumerate(order)}
+    # For each position: the constraints containing that cell, and those whose last cell it is
+    containing = [0] * len(order)
+    closing = [0] * len(order)
+    for j, cons in enumerate(constraints):
+        for cell in cons:
+            containing[position[cell]] |= 1 << j
+        closing[max(position[cell] for cell in cons)] |= 1 << j
+
+    size = len(order)
+    all_constraints = (1 << len(constraints)) - 1
+
+    def count(forced):
+        # Dynamic programming over cells in order; the state is the set of constraints
+        # still waiting for a pit. Each state maps to counts by number of pits so far.
+        states = {all_constraints: [1]}
+        for i in range(size):
+            options = (forced[i],) if forced[i] is not None else (0, 1)
+            next_states = {}
+            for unsatisfied, by_count in states.items():
+                for value in options:
+                    remaining = unsatisfied & ~containing[i] if value else unsatisfied
+                    if remaining & closing[i]:
+                        continue # A constraint ends here without a pit
+                    shifted = [0] + by_count if value else by_count
+                    existing = next_states.get(remaining)
+                    if existing is None:
+                        next_states[remaining] = list(shifted)
+                    else:
+                        if len(existing) < len(shifted):
+                            existing.extend([0] * (len(shifted) - len(existing)))
+                        for k, ways in enumerate(shifted):
+                            existing[k] += ways
+            states = next_states
+        result = [0] * (size + 1)
+        for by_count in states.values():
+            for k, ways in enumerate(by_count):
+                result[k] += ways
+        return result
+
+    free = [None] * size
+    weights = count(free)
+    cell_weights = {}
+    for i, cell in enumerate(order):
+        forced = list(free)
+        forced[i] = 1
+        cell_weights[cell] = count(forced)
+    return weights, cell_weights
+
+
+def _elimination_order(cells, constraints):
+    # Walk the constraints breadth-first so cells of neighboring constraints stay close
+    # together; this keeps the number of simultaneously open constraints (the DP state) small.
+    by_cell = {}
+    for cons in constraints:
+        for cell in cons:
+            by_cell.setdefault(cell, []).append(cons)
+    remaining = sorted(constraints, key=lambda cons: sorted(cons))
+    seen_constraints = set()
+    order = []
+    placed = set()
+    for root in remaining:
+        if root in seen_constraints:
+            continue
+        seen_constraints.add(root)
+        queue = [root]
+        while queue:
+            cons = queue.pop(0)
+            for cell in sorted(cons):
+                if cell in placed:
+                    continue
+                placed.add(cell)
+                order.append(cell)
+                for other in by_cell[cell]:
+                    if other not in seen_constraints:
+                        seen_constraints.add(other)
+                        queue.append(other)
+    order.extend(sorted(set(cells) - placed))
+    return order
@@ -0,0 +1,183 @@
+# WumpusWorldGame/replay.py
+
+import os
+
+import numpy as np
+
+# Array files of a saved buffer, and the file holding its capacity, position and size
+_ARRAYS = ("grids", "features", "actions", "rewards", "dones")
+_STATE_FILE = "state.npy"
+
+
+class Batch:
+    """A sampled batch of transitions. Arrays are reused, so the next sample() overwrites them."""
+
+    def __init__(self, batch_size, grid_shape, feature_size, dtype):
+        self.indices = np.zeros(batch_size, dtype=np.int64)
+        self.next_indices = np.zeros(batch_size, dtype=np.int64)
+        self.grids = np.zeros((batch_size, *grid_shape), dtype=dtype)
+        self.features = np.zeros((batch_size, feature_size), dtype=dtype)
+        self.actions = np.zeros(batch_size, dtype=np.int64)
+        self.rewards = np.zeros(batch_size, dtype=np.float32)
+        self.dones = np.zeros(batch_size, dtype=bool)
+        self.next_grids = np.zeros_like(self.grids)
+        self.next_features = np.zeros_like(self.features)
+
+
+class ReplayBuffer:
+    """
+    Preallocated ring buffer of transitions for learning agents.
+
+    Slot i holds an observation (grid and feature arrays, as made by ObservationEncoder),
+    the action taken from it, the reward received and whether the episode ended. The next
+    observation of a transition is the one in slot i + 1, so every observation is stored
+    once; for a transition that ended its episode that slot starts the next episode and
+    should be masked with dones. The newest transition has no successor yet and is never
+    sampled.
+
+    With path, the arrays are memory-mapped .npy files in that directory and everything
+    added goes straight to disk; load() opens such a directory (or one written by save())
+    again without reading it into memory.
+    """
+
+    def __init__(self, capacity, grid_shape, feature_size, dtype=np.float32, seed=None, path=None):
+        if capacity < 2:
+            raise ValueError("A replay buffer needs room for at least two transitions")
+        self.capacity = capacity
+        self.grid_shape = tuple(grid_shape)
+        self.feature_size = feature_size
+        self.dtype = np.dtype(dtype)
+        self.rng = np.random.default_rng(seed)
+        self.position = 0 # Slot the next add() writes
+        self.size = 0
+        self.path = path
+        self._batch = None
+
+        shapes = {
+            "grids": ((capacity, *self.grid_shape), self.dtype),
+            "features": ((capacity, feature_size), self.dtype),
+            "actions": ((capacity,), np.int64),
+            "rewards": ((capacity,), np.float32),
+            "dones": ((capacity,), bool),
+        }
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            shape, dtype = shapes[name]
+            if path is None:
+                array = np.zeros(shape, dtype=dtype)
+            else:
+                array = np.lib.format.open_memmap(os.path.join(path, name + ".npy"), mode="w+", dtype=dtype, shape=shape)
+            setattr(self, name, array)
+        if path is not None:
+            self._write_state(path)
+
+    def __len__(self):
+        return self.size
+
+    # --- Adding -----------------------------------------------------------
+
+    def slot(self):
+        """
+        The grid and feature rows the next add() stores, so an encoder can write the
+        observation in place: encoder.encode(agent, *buffer.slot()) then add() without arrays.
+        """
+        return self.grids[self.position], self.features[self.position]
+
+    def add(self, action, reward, done, grid=None, features=None):
+        """Stores a transition. grid/features are copied in unless already written through slot()."""
+        i = self.position
+        if grid is not None:
+            self.grids[i] = grid
+        if features is not None:
+            self.features[i] = features
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    # --- Sampling ---------------------------------------------------------
+
+    def sample(self, batch_size):
+        """
+        Draws batch_size transitions uniformly (with replacement) and gathers them, and their
+        next observations, into a reused Batch without allocating per-sample arrays.
+        """
+        if self.size < 2:
+            raise ValueError("Need at least two stored transitions to sample")
+        batch = self._batch
+        if batch is None or len(batch.indices) != batch_size:
+            batch = self._batch = Batch(batch_size, self.grid_shape, self.feature_size, self.dtype)
+
+        # Transitions in age order are oldest + k for k < size; the newest (k = size - 1) is left out
+        oldest = (self.position - self.size) % self.capacity
+        indices = batch.indices
+        indices[:] = self.rng.integers(0, self.size - 1, batch_size)
+        indices += oldest
+        np.remainder(indices, self.capacity, out=indices)
+        np.add(indices, 1, out=batch.next_indices)
+        np.remainder(batch.next_indices, self.capacity, out=batch.next_indices)
+
+        np.take(self.grids, indices, axis=0, out=batch.grids)
+        np.take(self.features, indices, axis=0, out=batch.features)
+        np.take(self.actions, indices, out=batch.actions)
+        np.take(self.rewards, indices, out=batch.rewards)
+        np.take(self.dones, indices, out=batch.dones)
+        np.take(self.grids, batch.next_indices, axis=0, out=batch.next_grids)
+        np.take(self.features, batch.next_indices, axis=0, out=batch.next_features)
+        return batch
+
+    # --- Files ------------------------------------------------------------
+
+    def _write_state(self, path):
+        np.save(os.path.join(path, _STATE_FILE), np.array([self.capacity, self.position, self.size], dtype=np.int64))
+
+    def save(self, path):
+        """
+        Writes the buffer to a directory of .npy files (created if needed). A memory-mapped
+        buffer saved to its own path is only flushed.
+        """
+        os.makedirs(path, exist_ok=True)
+        in_place = self.path is not None and os.path.abspath(path) == os.path.abspath(self.path)
+        for name in _ARRAYS:
+            array = getattr(self, name)
+            if in_place:
+                array.flush()
+            else:
+                target = np.lib.format.open_memmap(os.path.join(path, name + ".npy"), mode="w+",
+                                                   dtype=array.dtype, shape=array.shape)
+                target[:] = array
+                target.flush()
+                del target
+        self._write_state(path)
+
+    def flush(self):
+        """Writes the position and size of a memory-mapped buffer, so load() sees everything added so far."""
+        if self.path is not None:
+            self.save(self.path)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r+", seed=None):
+        """
+        Opens a saved buffer with its arrays memory-mapped (mmap_mode as in numpy.load; "r+"
+        lets new transitions be added to the files, None reads everything into memory).
+        """
+        capacity, position, size = (int(value) for value in np.load(os.path.join(path, _STATE_FILE)))
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode) for name in _ARRAYS}
+        if any(len(array) != capacity for array in arrays.values()):
+            raise ValueError(f"{path} is not a consistent replay buffer")
+        buffer = cls.__new__(cls)
+        buffer.capacity = capacity
+        buffer.grid_shape = arrays["grids"].shape[1:]
+        buffer.feature_size = arrays["features"].shape[1]
+        buffer.dtype = arrays["grids"].dtype
+        buffer.rng = np.random.default_rng(seed)
+        buffer.position = position
+        buffer.size = size
+        buffer.path = path if mmap_mode == "r+" else None # Only then do writes reach the files
+        buffer._batch = None
+        for name, array in arrays.items():
+            setattr(buffer, name, array)
+        return buffer
@@ -0,0 +1,319 @@
+# WumpusWorldGame/sat.py
+
+import heapq
+
+# Literal values in CDCLSolver.lit_values
+UNASSIGNED = 0
+TRUE = 1
+FALSE = 2
+
+
+class CDCLSolver:
+    """
+    Incremental conflict-driven clause learning SAT solver.
+
+    Variables are 0..num_vars-1 and a literal is 2 * var for the positive form and
+    2 * var + 1 for the negated one, as in KnowledgeBase. Clauses are watched on their first
+    two literals, conflicts are analyzed to the first unique implication point and the
+    learned clause is kept for later calls. solve() takes assumption literals, so one
+    formula can answer many queries: clauses may be added between calls and everything
+    learned so far stays valid, since clauses are only ever added.
+
+    Only variables that occur in a clause of two or more literals are ever decided: once
+    those are all assigned without conflict every clause is satisfied, and the rest may
+    take any value. Formulas over a large board where little is known stay cheap.
+    """
+
+    def __init__(self, num_vars=0, max_learned=4000, var_decay=0.95):
+        self.num_vars = 0
+        self.lit_values = bytearray() # Per literal: UNASSIGNED, TRUE or FALSE
+        self.level = []
+        self.reason = []              # Clause that implied each variable; None for decisions
+        self.activity = []
+        self.phase = bytearray()      # Polarity each variable is decided with first, 1 = negative
+        self.watches = []             # literal -> clauses watching it
+        self.clauses = []
+        self.learned = []
+        self.trail = []
+        self.trail_lim = []           # Trail length at the start of each decision level
+        self.qhead = 0
+        self.ok = True                # False once the clauses alone are unsatisfiable
+        self.version = 0              # Bumped whenever a clause changes the set of models
+        self.max_learned = max_learned
+        self.var_decay = var_decay
+        self._var_inc = 1.0
+        self._order = []              # Heap of (-activity, var); stale entries are skipped
+        self._queued = bytearray()    # Whether each variable has an entry in _order
+        self._free = 0                # Unassigned variables that occur in some non-unit clause
+        self._seen = bytearray()
+        self._occurs = bytearray()    # Whether each variable is in some non-unit clause
+        self.conflicts = 0
+        self.decisions = 0
+        self.new_vars(num_vars)
+
+    def new_vars(self, count):
+        """Adds count variables and returns the first one."""
+        first = self.num_vars
+        self.num_vars += count
+        self.lit_values.extend(bytes(2 * count))
+        self.level.extend([0] * count)
+        self.reason.extend([None] * count)
+        self.activity.extend([0.0] * count)
+        self.phase.extend(b"\x01" * count) # Try "false" first: most cells hold nothing
+        self.watches.extend([] for _ in range(2 * count))
+        self._seen.extend(bytes(count))
+        self._occurs.extend(bytes(count))
+        self._queued.extend(bytes(count))
+        return first
+
+    def prefer(self, lit):
+        """Makes lit the polarity tried first when its variable is decided."""
+        self.phase[lit >> 1] = lit & 1
+
+    def value(self, var):
+        """
+        True or False for var in the last model (or at level 0). None means var was left
+        unassigned because no clause constrains it, so either value works.
+        """
+        value = self.lit_values[2 * var]
+        return None if value == UNASSIGNED else value == TRUE
+
+    # --- Clauses ----------------------------------------------------------
+
+    def add_clause(self, literals):
+        """Adds a clause to the formula. Returns False once the formula is unsatisfiable."""
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        lit_values = self.lit_values
+        clause = []
+        for lit in literals:
+            value = lit_values[lit]
+            if value == TRUE or lit ^ 1 in clause:
+                return True # Already satisfied, or a tautology
+            if value == UNASSIGNED and lit not in clause:
+                clause.append(lit)
+        self.version += 1
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self.clauses.append(clause)
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+            for lit in clause:
+                var = lit >> 1
+                if not self._occurs[var]:
+                    self._occurs[var] = 1
+                    self._free += 1
+                    if not self._queued[var]:
+                        self._queued[var] = 1
+                        heapq.heappush(self._order, (-self.activity[var], var))
+        return self.ok
+
+    def _reduce_learned(self):
+        # Only called at level 0, where no learned clause is a reason anyone will look at.
+        # Keeps the shorter half; dropped clauses are emptied and fall out of the watch lists.
+        if len(self.learned) <= self.max_learned:
+            return
+        self.learned.sort(key=len)
+        keep = self.max_learned // 2
+        for clause in self.learned[keep:]:
+            clause.clear()
+        del self.learned[keep:]
+
+    # --- Search -----------------------------------------------------------
+
+    def _enqueue(self, lit, reason):
+        var = lit >> 1
+        self.lit_values[lit] = TRUE
+        self.lit_values[lit ^ 1] = FALSE
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+        if self._occurs[var]:
+            self._free -= 1
+
+    def _propagate(self):
+        """Unit propagation over the watched literals. Returns a conflicting clause or None."""
+        lit_values = self.lit_values
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            watch_list = watches[false_lit]
+            kept = []
+            for i, clause in enumerate(watch_list):
+                if not clause:
+                    continue # Deleted
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if lit_values[first] == TRUE:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if lit_values[lit] != FALSE:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if lit_values[first] == FALSE:
+                        kept.extend(watch_list[i + 1:])
+                        watches[false_lit] = kept
+                        self.qhead = len(trail)
+                        return clause
+                    self._enqueue(first, clause)
+            watches[false_lit] = kept
+        return None
+
+    def _analyze(self, conflict):
+        """First-UIP learning: returns (learned clause with the asserting literal first, backjump level)."""
+        seen = self._seen
+        level = self.level
+        trail = self.trail
+        current = len(self.trail_lim)
+        learned = [None]
+        pending = 0
+        index = len(trail) - 1
+        clause = conflict
+        start = 0
+        while True:
+            for lit in clause[start:]:
+                var = lit >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = 1
+                    self._bump(var)
+                    if level[var] == current:
+                        pending += 1
+                    else:
+                        learned.append(lit)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            seen[lit >> 1] = 0
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reason[lit >> 1]
+            start = 1 # The reason's first literal is lit itself
+        learned[0] = lit ^ 1
+        for lit in learned[1:]:
+            seen[lit >> 1] = 0
+        if len(learned) == 1:
+            return learned, 0
+        deepest = max(range(1, len(learned)), key=lambda k: level[learned[k] >> 1])
+        learned[1], learned[deepest] = learned[deepest], learned[1]
+        return learned, level[learned[1] >> 1]
+
+    def _bump(self, var):
+        activity = self.activity
+        activity[var] += self._var_inc
+        if activity[var] > 1e100:
+            for v in range(self.num_vars):
+                activity[v] *= 1e-100
+            self._var_inc *= 1e-100
+            self._rebuild_order()
+        elif self.lit_values[2 * var] == UNASSIGNED:
+            self._queued[var] = 1
+            heapq.heappush(self._order, (-activity[var], var))
+
+    def _backtrack(self, target):
+        if len(self.trail_lim) <= target:
+            return
+        start = self.trail_lim[target]
+        lit_values = self.lit_values
+        activity = self.activity
+        occurs = self._occurs
+        queued = self._queued
+        order = self._order
+        for lit in self.trail[start:]:
+            var = lit >> 1
+            lit_values[lit] = lit_values[lit ^ 1] = UNASSIGNED
+            self.reason[var] = None
+            if occurs[var]:
+                self._free += 1
+                if not queued[var]:
+                    queued[var] = 1
+                    heapq.heappush(order, (-activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[target:]
+        self.qhead = start
+        if len(order) > 4 * self.num_vars + 64:
+            self._rebuild_order() # Drop the stale entries pushed by bumps and backtracks
+
+    def _rebuild_order(self):
+        lit_values = self.lit_values
+        self._order = [(-self.activity[v], v) for v in range(self.num_vars)
+                       if self._occurs[v] and lit_values[2 * v] == UNASSIGNED]
+        heapq.heapify(self._order)
+        self._queued = bytearray(self.num_vars)
+        for _, var in self._order:
+            self._queued[var] = 1
+
+    def _pick_branch(self):
+        # Only called while some occurring variable is free, and every free one is queued
+        order = self._order
+        lit_values = self.lit_values
+        queued = self._queued
+        while True:
+            var = heapq.heappop(order)[1]
+            queued[var] = 0
+            if lit_values[2 * var] == UNASSIGNED:
+                return var
+
+    def solve(self, assumptions=()):
+        """
+        True if the clauses together with the assumption literals are satisfiable; the model
+        is then readable through value() until the next call. False means unsatisfiable under
+        the assumptions (or outright, in which case ok becomes False).
+        """
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+        self._reduce_learned()
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learned, target = self._analyze(conflict)
+                self._backtrack(target)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    self.learned.append(learned)
+                    self.watches[learned[0]].append(learned)
+                    self.watches[learned[1]].append(learned)
+                    self._enqueue(learned[0], learned)
+                self._var_inc /= self.var_decay
+                continue
+
+            level = len(self.trail_lim)
+            if level < len(assumptions):
+                lit = assumptions[level]
+                value = self.lit_values[lit]
+                if value == FALSE:
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if value == UNASSIGNED:
+                    self._enqueue(lit, None)
+                continue
+
+            if self._free == 0:
+                return True
+            var = self._pick_branch()
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(2 * var + self.phase[var], None)
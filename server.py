@@ -0,0 +1,403 @@
+# WumpusWorldGame/server.py
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import secrets
+import sys
+import time
+from collections import OrderedDict
+
+from config import Config
+from environment import generate_layout
+from agent import WumpusAgent
+from simulation import SimulationEngine, apply_action
+
+DEFAULT_PORT = 8765
+DEFAULT_IDLE_TIMEOUT = 300.0 # Seconds without a request before a session is recycled
+MAX_LINE_BYTES = 64 * 1024
+
+# Config attributes a client may set when creating a game, all integers
+CONFIGURABLE = ("GRID_SIZE", "NUM_PITS", "MOVE_COST", "SHOOT_COST", "GRAB_GOLD_REWARD", "CLIMB_OUT_REWARD",
+                "FALL_IN_PIT_COST", "WUMPUS_KILL_COST", "WUMPUS_DEFEAT_REWARD")
+ACTIONS = {"move": ("up", "down", "left", "right"), "turn": ("left", "right"), "shoot": (None,),
+           "grab": (None,), "climb": (None,)}
+
+
+class RequestError(Exception):
+    """A client request that cannot be served; its message is sent back to the client."""
+
+
+class Session:
+    """
+    One hosted game. Closed sessions go back to the pool with their game, which a later
+    game with the same configuration resets and plays again.
+    """
+
+    def __init__(self, engine):
+        self.id = None
+        self.engine = engine
+        self.game_logic = None
+        self.infer = False
+        self.steps = 0
+        self.last_active = 0.0
+
+    def start(self, session_id, game_logic, infer):
+        self.id = session_id
+        self.game_logic = game_logic
+        self.infer = infer
+        self.steps = 0
+        self.last_active = time.monotonic()
+
+    def clear(self):
+        self.id = None
+
+    def observation(self):
+        game_logic = self.game_logic
+        agent = game_logic.agent
+        return {
+            "session": self.id,
+            "percepts": list(agent.percepts),
+            "score": agent.score,
+            "state": game_logic.game_state,
+            "position": [agent.row, agent.col],
+            "direction": agent.direction,
+            "has_arrow": agent.has_arrow,
+            "has_gold": agent.has_gold,
+            "steps": self.steps,
+        }
+
+
+class SessionPool:
+    """
+    Live sessions keyed by id and one SimulationEngine per distinct configuration, shared by
+    every game that uses it. At most max_engines engines are kept, least recently used first
+    out; games already started keep theirs.
+
+    Closed sessions keep their game and wait on a free list per engine, up to max_pooled in
+    all. A new game takes one from its engine's list and resets the world, agent, knowledge
+    base and planners in place (SimulationEngine.reset_game), so a busy server stops
+    allocating them from scratch for every game.
+    """
+
+    def __init__(self, max_sessions=10000, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_grid_size=64,
+                 max_pooled=1024, agent_class=WumpusAgent, max_engines=64):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_grid_size = max_grid_size
+        self.max_pooled = max_pooled
+        self.agent_class = agent_class
+        self.max_engines = max_engines
+        self.sessions = {}
+        self._free = {}    # Engine -> closed sessions whose games it can reset
+        self._pooled = 0
+        self._engines = OrderedDict() # Config values -> engine, least recently used first
+        self.created = 0
+        self.recycled = 0
+        self.expired = 0
+
+    def _engine(self, overrides):
+        if not isinstance(overrides, dict):
+            raise RequestError("config must be a JSON object")
+        config = Config()
+        for name, value in overrides.items():
+            if name not in CONFIGURABLE:
+                raise RequestError(f"Config.{name} cannot be set")
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise RequestError(f"Config.{name} must be an integer")
+            setattr(config, name, value)
+        if not 2 <= config.GRID_SIZE <= self.max_grid_size:
+            raise RequestError(f"GRID_SIZE must be between 2 and {self.max_grid_size}")
+        if not 0 <= config.NUM_PITS <= config.GRID_SIZE * config.GRID_SIZE - 3:
+            raise RequestError("Invalid number of pits")
+
+        key = tuple(getattr(config, name) for name in CONFIGURABLE)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = SimulationEngine(config, self.agent_class)
+            if len(self._engines) > self.max_engines:
+                _, evicted = self._engines.popitem(last=False)
+                self._pooled -= len(self._free.pop(evicted, ()))
+        else:
+            self._engines.move_to_end(key)
+        return engine
+
+    def create(self, overrides=None, seed=None, infer=False):
+        if len(self.sessions) >= self.max_sessions:
+            raise RequestError("Server is full")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise RequestError("seed must be an integer")
+        engine = self._engine({} if overrides is None else overrides)
+        # A seeded world comes from its own generator (the same world as WumpusEnvironment(seed=seed)),
+        # so one client's seed never reseeds the random state shared by every other session
+        layout = generate_layout(engine.config, random.Random(seed)) if seed is not None else None
+        free = self._free.get(engine)
+        if free:
+            session = free.pop()
+            self._pooled -= 1
+            game_logic = engine.reset_game(session.game_logic, layout=layout)
+            self.recycled += 1
+        else:
+            session = Session(engine)
+            game_logic = engine.new_game(layout=layout)
+        self.created += 1
+        session.start(secrets.token_hex(8), game_logic, bool(infer))
+        self.sessions[session.id] = session
+        return session
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise RequestError(f"Unknown session: {session_id}")
+        session.last_active = time.monotonic()
+        return session
+
+    def close(self, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.clear()
+        # Games of an engine evicted since are dropped with the session
+        if self._pooled < self.max_pooled and session.engine in self._engines.values():
+            self._free.setdefault(session.engine, []).append(session)
+            self._pooled += 1
+        return True
+
+    def expire_idle(self, now=None):
+        """Closes every session idle for longer than idle_timeout; returns how many."""
+        deadline = (now if now is not None else time.monotonic()) - self.idle_timeout
+        idle = [session_id for session_id, session in self.sessions.items() if session.last_active < deadline]
+        for session_id in idle:
+            self.close(session_id)
+        self.expired += len(idle)
+        return len(idle)
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "pooled": self._pooled,
+            "engines": len(self._engines),
+            "created": self.created,
+            "recycled": self.recycled,
+            "expired": self.expired,
+        }
+
+
+class GameServer:
+    """
+    JSON-lines game server. Each request is one JSON object per line with an "op" and an
+    optional "id" that is echoed back; each reply is one JSON object per line with "ok".
+
+        {"op": "create", "config": {"GRID_SIZE": 8, "NUM_PITS": 6}, "seed": 1}
+        {"op": "act", "session": "...", "action": "move", "direction": "up"}
+        {"op": "state", "session": "..."}
+        {"op": "close", "session": "..."}
+        {"op": "stats"}
+
+    create, act and state reply with the session's observation (percepts, score, state,
+    position, direction, has_arrow, has_gold, steps); act adds game_over and message.
+    Create with "infer": true to keep the built-in agent's knowledge base up to date as well.
+    Sessions are not tied to a connection and are recycled after idle_timeout seconds.
+    """
+
+    def __init__(self, pool: SessionPool = None, host="127.0.0.1", port=DEFAULT_PORT):
+        self.pool = pool or SessionPool()
+        self.host = host
+        self.port = port
+        self.server = None
+        self._reaper = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_LINE_BYTES)
+        self.port = self.server.sockets[0].getsockname()[1] # The real port when started with port 0
+        self._reaper = asyncio.create_task(self._reap_idle())
+        return self
+
+    async def stop(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _reap_idle(self):
+        interval = max(min(self.pool.idle_timeout / 4, 30.0), 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            self.pool.expire_idle()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # Longer than MAX_LINE_BYTES
+                    writer.write(b'{"ok":false,"error":"Request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(self.handle_line(line))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle_line(self, line):
+        """Serves one request line and returns the encoded reply line."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            request_id = request.get("id")
+            reply = self.handle(request)
+            reply["ok"] = True
+        except RequestError as e:
+            reply = {"ok": False, "error": str(e)}
+        except json.JSONDecodeError as e:
+            reply = {"ok": False, "error": f"Invalid JSON: {e}"}
+        except Exception as e: # A bug in one request must not take the connection down
+            reply = {"ok": False, "error": f"Internal error: {e!r}"}
+        if request_id is not None:
+            reply["id"] = request_id
+        return (json.dumps(reply, separators=(",", ":")) + "\n").encode()
+
+    def handle(self, request):
+        op = request.get("op")
+        if op == "create":
+            session = self.pool.create(request.get("config"), request.get("seed"), request.get("infer", False))
+            return session.observation()
+        if op == "act":
+            session = self.pool.get(request.get("session"))
+            action, direction = request.get("action"), request.get("direction")
+            if direction not in ACTIONS.get(action, ()):
+                raise RequestError(f"Invalid action: {action} {direction}")
+            game_logic = session.game_logic
+            if game_logic.game_state != game_logic.config.GAME_RUNNING:
+                raise RequestError("The game is over")
+            game_over, message = apply_action(game_logic, action, direction, infer=session.infer)
+            session.steps += 1
+            reply = session.observation()
+            reply["game_over"] = game_over
+            reply["message"] = message
+            return reply
+        if op == "state":
+            return self.pool.get(request.get("session")).observation()
+        if op == "close":
+            if not self.pool.close(request.get("session")):
+                raise RequestError(f"Unknown session: {request.get('session')}")
+            return {}
+        if op == "stats":
+            return self.pool.stats()
+        raise RequestError(f"Unknown op: {op}")
+
+
+class GameClient:
+    """Minimal asyncio client for GameServer, for external agents and load tests."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count()
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        return cls(reader, writer)
+
+    async def request(self, op, **fields):
+        fields["op"] = op
+        fields["id"] = next(self._ids)
+        self.writer.write((json.dumps(fields, separators=(",", ":")) + "\n").encode())
+        await self.writer.drain()
+        reply = json.loads(await self.reader.readline())
+        if not reply.get("ok"):
+            raise RequestError(reply.get("error"))
+        return reply
+
+    async def create(self, config=None, seed=None, infer=False):
+        return await self.request("create", config=config or {}, seed=seed, infer=infer)
+
+    async def act(self, session, action, direction=None):
+        return await self.request("act", session=session, action=action, direction=direction)
+
+    async def close_session(self, session):
+        return await self.request("close", session=session)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def load_test(host="127.0.0.1", port=DEFAULT_PORT, players=100, episodes=10, config=None, max_steps=200):
+    """
+    Runs players concurrent clients, each playing episodes games with random moves.
+    Returns the total number of actions and the elapsed time.
+    """
+    rules = Config()
+
+    async def player(index):
+        rng = random.Random(index)
+        client = await GameClient.connect(host, port)
+        actions = 0
+        try:
+            for episode in range(episodes):
+                state = await client.create(config, seed=index * episodes + episode)
+                session = state["session"]
+                for _ in range(max_steps):
+                    if state["state"] != rules.GAME_RUNNING:
+                        break
+                    if rules.GLITTER in state["percepts"] and not state["has_gold"]:
+                        state = await client.act(session, "grab")
+                    else:
+                        state = await client.act(session, "move", rng.choice(ACTIONS["move"]))
+                    actions += 1
+                await client.close_session(session)
+        finally:
+            await client.close()
+        return actions
+
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(player(index) for index in range(players)))
+    return sum(counts), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wumpus World JSON-lines game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--max-grid-size", type=int, default=64)
+    parser.add_argument("--max-engines", type=int, default=64, help="Distinct game configurations kept warm")
+    parser.add_argument("--load-test", type=int, metavar="PLAYERS",
+                        help="Instead of serving, run this many random players against --host/--port")
+    parser.add_argument("--episodes", type=int, default=10, help="Games per load-test player")
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        actions, elapsed = asyncio.run(load_test(args.host, args.port, args.load_test, args.episodes))
+        print(f"{actions} actions in {elapsed:.2f}s ({actions / elapsed:.0f} actions/s)")
+        return 0
+
+    pool = SessionPool(args.max_sessions, args.idle_timeout, args.max_grid_size, max_engines=args.max_engines)
+    server = GameServer(pool, args.host, args.port)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
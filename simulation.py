@@ -0,0 +1,233 @@
+# WumpusWorldGame/simulation.py
+
+import os
+import random
+import time
+
+from config import Config
+from environment import WumpusEnvironment
+from agent import WumpusAgent
+from logic import GameLogic
+
+
+def apply_action(game_logic, action_type, direction=None, infer=True):
+    """
+    Applies a single action to the game, then lets the agent perceive and reason
+    about its new location. This is the same sequence the GUI runs on every click.
+    With infer=False the agent only perceives, for players that reason elsewhere.
+    Returns (game_over, result_message) like the GameLogic action methods.
+    """
+    if action_type == "move":
+        if direction not in ("up", "down", "left", "right"):
+            raise ValueError(f"Unknown move direction: {direction}")
+        game_over, result_message = game_logic.move_agent(direction)
+    elif action_type == "turn":
+        if direction not in ("left", "right"):
+            raise ValueError(f"Unknown turn direction: {direction}")
+        if direction == "left":
+            game_logic.agent.turn_left()
+        else:
+            game_logic.agent.turn_right()
+        game_over, result_message = False, ""
+    elif action_type == "shoot":
+        game_over, result_message = game_logic.shoot_arrow()
+    elif action_type == "grab":
+        game_over, result_message = game_logic.grab_gold()
+    elif action_type == "climb":
+        game_over, result_message = game_logic.climb_out()
+    else:
+        raise ValueError(f"Unknown action type: {action_type}")
+
+    game_logic.perceive_current_location() # Agent perceives new location
+    if infer:
+        game_logic.agent.infer_from_percepts() # Agent updates its knowledge
+    return game_over, result_message
+
+
+class EpisodeResult:
+    def __init__(self, seed, score, game_state, steps):
+        self.seed = seed
+        self.score = score
+        self.game_state = game_state
+        self.steps = steps
+
+
+class SimulationEngine:
+    """
+    Plays whole episodes without any GUI. The agent class decides the actions
+    through choose_action(), which must return an (action_type, direction) tuple
+    or None to give up.
+    """
+
+    def __init__(self, config: Config, agent_class=WumpusAgent, max_steps=None, instrumentation=None, recorder=None,
+                 environment_class=WumpusEnvironment):
+        self.config = config
+        self.agent_class = agent_class
+        self.environment_class = environment_class # e.g. environment.LazyWumpusEnvironment for huge maps
+        self.instrumentation = instrumentation # Optional instrumentation.Instrumentation
+        self.recorder = recorder               # Optional trajectory.TrajectoryRecorder
+        # Cap on actions per episode so agents that wander forever still terminate
+        self.max_steps = max_steps if max_steps is not None else 4 * config.GRID_SIZE * config.GRID_SIZE
+
+    def new_game(self, seed=None, layout=None):
+        # A seeded episode draws the world and the agent's random choices from its own
+        # generator, leaving the global random module alone
+        rng = random.Random(seed) if seed is not None else None
+        environment = self.environment_class(self.config, rng=rng, layout=layout)
+        if issubclass(self.agent_class, WumpusAgent):
+            agent = self.agent_class(self.config, rng=rng)
+        else:
+            agent = self.agent_class(self.config)
+        game_logic = GameLogic(environment, agent, self.config)
+        if self.instrumentation is not None:
+            self.instrumentation.attach(game_logic)
+        game_logic.perceive_current_location()
+        agent.infer_from_percepts()
+        return game_logic
+
+    def reset_game(self, game_logic, seed=None, layout=None):
+        """
+        The game new_game(seed, layout) would return, made by resetting game_logic (a game
+        from this engine) in place. Agent classes outside the WumpusAgent family have no
+        reset(), so a new game is built for them.
+        """
+        if not issubclass(self.agent_class, WumpusAgent):
+            return self.new_game(seed, layout)
+        game_logic.reset(rng=random.Random(seed) if seed is not None else None, layout=layout)
+        game_logic.perceive_current_location()
+        game_logic.agent.infer_from_percepts()
+        return game_logic
+
+    def play_episode(self, seed=None, layout=None):
+        if self.instrumentation is not None:
+            self.instrumentation.episode_started()
+        game_logic = self.new_game(seed, layout)
+        if self.recorder is not None:
+            self.recorder.attach(game_logic, seed)
+        agent = game_logic.agent
+        steps = 0
+        while game_logic.game_state == self.config.GAME_RUNNING and steps < self.max_steps:
+            action = agent.choose_action()
+            if action is None:
+                break
+            apply_action(game_logic, *action)
+            steps += 1
+        if self.recorder is not None:
+            self.recorder.finish(game_logic)
+        if self.instrumentation is not None:
+            self.instrumentation.episode_finished()
+        return EpisodeResult(seed, agent.score, game_logic.game_state, steps)
+
+
+class BatchResult:
+    """Aggregate statistics over many episodes. Partial results from workers are merged."""
+
+    def __init__(self):
+        self.episodes = 0
+        self.wins = 0
+        self.losses = 0
+        self.total_score = 0
+        self.total_score_sq = 0
+        self.total_steps = 0
+        self.elapsed = 0.0
+
+    def add(self, episode: EpisodeResult, config: Config):
+        self.episodes += 1
+        self.total_score += episode.score
+        self.total_score_sq += episode.score * episode.score
+        self.total_steps += episode.steps
+        if episode.game_state == config.GAME_OVER_WON:
+            self.wins += 1
+        elif episode.game_state == config.GAME_OVER_LOST:
+            self.losses += 1
+
+    def merge(self, other):
+        self.episodes += other.episodes
+        self.wins += other.wins
+        self.losses += other.losses
+        self.total_score += other.total_score
+        self.total_score_sq += other.total_score_sq
+        self.total_steps += other.total_steps
+
+    @property
+    def unfinished(self):
+        return self.episodes - self.wins - self.losses
+
+    @property
+    def mean_score(self):
+        return self.total_score / self.episodes if self.episodes else 0.0
+
+    @property
+    def score_std(self):
+        if self.episodes < 2:
+            return 0.0
+        variance = (self.total_score_sq - self.total_score * self.total_score / self.episodes) / (self.episodes - 1)
+        return max(variance, 0.0) ** 0.5
+
+    @property
+    def steps_per_second(self):
+        return self.total_steps / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def episodes_per_second(self):
+        return self.episodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return {
+            "episodes": self.episodes,
+            "wins": self.wins,
+            "losses": self.losses,
+            "unfinished": self.unfinished,
+            "mean_score": self.mean_score,
+            "score_std": self.score_std,
+            "total_steps": self.total_steps,
+            "elapsed": self.elapsed,
+            "steps_per_second": self.steps_per_second,
+            "episodes_per_second": self.episodes_per_second,
+        }
+
+
+def _run_seed_range(args):
+    # Worker entry point: plays episodes for seeds [start, stop) and returns only the aggregate,
+    # so the parent never has to hold per-episode results in memory.
+    config, agent_class, max_steps, start, stop = args
+    engine = SimulationEngine(config, agent_class, max_steps)
+    result = BatchResult()
+    for seed in range(start, stop):
+        result.add(engine.play_episode(seed), config)
+    return result
+
+
+def run_batch(num_episodes, config: Config = None, agent_class=WumpusAgent, base_seed=0,
+              processes=None, chunk_size=1000, max_steps=None):
+    """
+    Plays num_episodes seeded episodes (seeds base_seed .. base_seed + num_episodes - 1)
+    across a process pool and returns a merged BatchResult. The same seeds always give
+    the same worlds, so two agent classes can be compared on identical games.
+    """
+    config = config or Config()
+    processes = processes or os.cpu_count() or 1
+    tasks = []
+    for start in range(base_seed, base_seed + num_episodes, chunk_size):
+        stop = min(start + chunk_size, base_seed + num_episodes)
+        tasks.append((config, agent_class, max_steps, start, stop))
+
+    total = BatchResult()
+    start_time = time.perf_counter()
+    if processes == 1:
+        for task in tasks:
+            total.merge(_run_seed_range(task))
+    else:
+        from multiprocessing import Pool # Deferred: importing multiprocessing dominates startup
+        with Pool(processes) as pool:
+            for partial in pool.imap_unordered(_run_seed_range, tasks):
+                total.merge(partial)
+    total.elapsed = time.perf_counter() - start_time
+    return total
+
+
+def load_agent_class(spec):
+    """Resolves "module:Class" (or a class name from agent.py) to an agent class."""
+    import importlib
+    module_name, _, class_name = spec.rpartition(":")
+    return getattr(importlib.import_module(module_name or "agent"), class_name)
@@ -0,0 +1,228 @@
+# WumpusWorldGame/solvability.py
+
+import os
+import random
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import Config
+from environment import generate_layout
+
+# Classes are ordered, so "at least SOLVABLE_WITH_RISK" is a plain comparison
+UNSOLVABLE = 0
+SOLVABLE_WITH_RISK = 1
+SOLVABLE_WITHOUT_RISK = 2
+CLASS_NAMES = {
+    UNSOLVABLE: "unsolvable",
+    SOLVABLE_WITH_RISK: "solvable-with-risk",
+    SOLVABLE_WITHOUT_RISK: "solvable-without-risk",
+}
+
+
+class WorldAnalyzer:
+    """
+    Classifies single worlds with bitboard flood fills (bit r * grid_size + c per cell).
+
+    A world is unsolvable when no path of pit-free cells joins AGENT_START to the gold (the
+    Wumpus can be shot, so its cell counts as passable). It is solvable without risk when an
+    agent that only enters cells next to a visited cell with neither breeze nor stench
+    reaches the gold; this uses only that one safety rule, so a few worlds that deeper
+    inference could solve safely are reported as needing risk.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        n = self.grid_size = config.GRID_SIZE
+        self.full_mask = (1 << (n * n)) - 1
+        first_col = 0
+        for r in range(n):
+            first_col |= 1 << (r * n)
+        self.not_first_col = self.full_mask & ~first_col
+        self.not_last_col = self.full_mask & ~(first_col << (n - 1))
+        self.start_bit = 1 << (config.AGENT_START[0] * n + config.AGENT_START[1])
+
+    def neighbors(self, plane):
+        n = self.grid_size
+        return ((plane >> n) | ((plane << n) & self.full_mask)
+                | ((plane >> 1) & self.not_last_col) | ((plane << 1) & self.not_first_col))
+
+    def _flood(self, seed, allowed):
+        reached = seed & allowed
+        while True:
+            grown = (reached | self.neighbors(reached)) & allowed
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def classify(self, wumpus_pos, gold_pos, pit_mask):
+        n = self.grid_size
+        gold_bit = 1 << (gold_pos[0] * n + gold_pos[1])
+        wumpus_bit = 1 << (wumpus_pos[0] * n + wumpus_pos[1])
+        if not self._flood(self.start_bit, self.full_mask & ~pit_mask) & gold_bit:
+            return UNSOLVABLE
+
+        quiet = self.full_mask & ~(self.neighbors(pit_mask) | self.neighbors(wumpus_bit))
+        visited = self.start_bit
+        while True:
+            # Every neighbor of a visited cell without breeze or stench is provably safe
+            grown = visited | self.neighbors(visited & quiet)
+            if grown == visited:
+                break
+            visited = grown
+        return SOLVABLE_WITHOUT_RISK if visited & gold_bit else SOLVABLE_WITH_RISK
+
+
+# --- Vectorized batches -------------------------------------------------------
+
+def layouts_to_arrays(layouts, grid_size):
+    """Converts (wumpus_pos, gold_pos, pit_mask) layouts into index arrays and a (B, n, n) pit array."""
+    count = len(layouts)
+    cells = grid_size * grid_size
+    mask_bytes = (cells + 7) // 8
+    wumpus = np.empty(count, dtype=np.int64)
+    gold = np.empty(count, dtype=np.int64)
+    packed = np.empty((count, mask_bytes), dtype=np.uint8)
+    for i, (wumpus_pos, gold_pos, pit_mask) in enumerate(layouts):
+        wumpus[i] = wumpus_pos[0] * grid_size + wumpus_pos[1]
+        gold[i] = gold_pos[0] * grid_size + gold_pos[1]
+        packed[i] = np.frombuffer(pit_mask.to_bytes(mask_bytes, "little"), dtype=np.uint8)
+    pits = np.unpackbits(packed, axis=1, bitorder="little")[:, :cells].astype(bool)
+    return wumpus, gold, pits.reshape(count, grid_size, grid_size)
+
+
+def _to_rows(planes):
+    """Packs (B, n, n) bool planes into (B, n) uint64 row bitmasks, bit c of row r for cell (r, c)."""
+    count, n, _ = planes.shape
+    packed = np.packbits(planes, axis=2, bitorder="little")
+    padded = np.zeros((count, n, 8), dtype=np.uint8)
+    padded[:, :, :packed.shape[2]] = packed
+    return padded.view("<u8").reshape(count, n)
+
+
+def _neighbors(rows, row_mask):
+    out = (rows << np.uint64(1)) & row_mask
+    out |= rows >> np.uint64(1)
+    out[:, 1:] |= rows[:, :-1]
+    out[:, :-1] |= rows[:, 1:]
+    return out
+
+
+def classify_arrays(config: Config, wumpus, gold, pits):
+    """
+    Classifies a whole batch at once on per-row uint64 bitmasks (grids up to 64 columns);
+    each flood-fill step advances every world still growing.
+    """
+    count, n, _ = pits.shape
+    if n > 64:
+        raise ValueError("Batch classification supports grids up to 64 columns")
+    rows_index = np.arange(count)
+    row_mask = np.uint64((1 << n) - 1)
+    start_r, start_c = config.AGENT_START
+    start = np.zeros((count, n), dtype=np.uint64)
+    start[:, start_r] = np.uint64(1 << start_c)
+
+    def flood(reached, expand_from, allowed):
+        active = np.arange(count)
+        while len(active):
+            current = reached[active]
+            grown = (current | _neighbors(current & expand_from[active], row_mask)) & allowed[active]
+            changed = (grown != current).any(axis=1)
+            reached[active] = grown
+            active = active[changed]
+        return reached
+
+    pit_rows = _to_rows(pits)
+    wumpus_rows = np.zeros((count, n), dtype=np.uint64)
+    wumpus_rows[rows_index, wumpus // n] = np.uint64(1) << (wumpus % n).astype(np.uint64)
+    everything = np.full((count, n), row_mask, dtype=np.uint64)
+    reachable = flood(start.copy(), everything, ~pit_rows & row_mask)
+    quiet = ~(_neighbors(pit_rows, row_mask) | _neighbors(wumpus_rows, row_mask)) & row_mask
+    safe_reached = flood(start.copy(), quiet, everything)
+
+    gold_bits = np.uint64(1) << (gold % n).astype(np.uint64)
+    gold_reachable = (reachable[rows_index, gold // n] & gold_bits) != 0
+    gold_safe = (safe_reached[rows_index, gold // n] & gold_bits) != 0
+    classes = np.full(count, UNSOLVABLE, dtype=np.int8)
+    classes[gold_reachable] = SOLVABLE_WITH_RISK
+    classes[gold_reachable & gold_safe] = SOLVABLE_WITHOUT_RISK
+    return classes
+
+
+def classify_batch(config: Config, layouts):
+    """
+    Classifies a list of layouts with the vectorized flood fill; returns an int8 array of
+    classes. Grids wider than 64 columns fall back to WorldAnalyzer one layout at a time.
+    """
+    if not layouts:
+        return np.empty(0, dtype=np.int8)
+    if config.GRID_SIZE > 64:
+        analyzer = WorldAnalyzer(config)
+        return np.array([analyzer.classify(*layout) for layout in layouts], dtype=np.int8)
+    return classify_arrays(config, *layouts_to_arrays(layouts, config.GRID_SIZE))
+
+
+def _classify_corpus_range(args):
+    path, config, start, stop = args
+    from corpus import WorldCorpus
+    with WorldCorpus(path) as corpus:
+        return start, classify_batch(config, [corpus[i] for i in range(start, stop)])
+
+
+def classify_corpus(path, config: Config, processes=None, chunk_size=65536):
+    """Classifies every world of a corpus file in parallel; returns an int8 array indexed like the corpus."""
+    from corpus import WorldCorpus
+    with WorldCorpus(path) as corpus:
+        count = len(corpus)
+    classes = np.empty(count, dtype=np.int8)
+    tasks = [(path, config, start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(tasks) <= 1:
+        results = map(_classify_corpus_range, tasks)
+        for start, chunk in results:
+            classes[start:start + len(chunk)] = chunk
+    else:
+        with Pool(processes) as pool:
+            for start, chunk in pool.imap_unordered(_classify_corpus_range, tasks):
+                classes[start:start + len(chunk)] = chunk
+    return classes
+
+
+# --- Generation with rejection --------------------------------------------
+
+def generate_solvable_layouts(config: Config, count, rng=None, minimum=SOLVABLE_WITH_RISK, batch_size=1024,
+                              max_batches=None):
+    """
+    Yields count layouts whose class is at least minimum. Candidates are drawn with
+    generate_layout and classified a batch at a time, so rejection costs one vectorized pass.
+    Raises ValueError after max_batches batches (by default enough for count layouts at a 1%
+    acceptance rate), so a config that rarely or never reaches minimum cannot hang.
+    """
+    if count <= 0:
+        return
+    rng = rng or random.Random()
+    if max_batches is None:
+        max_batches = 10 + 100 * -(-count // batch_size)
+    produced = 0
+    for _ in range(max_batches):
+        candidates = [generate_layout(config, rng) for _ in range(batch_size)]
+        classes = classify_batch(config, candidates)
+        for layout, world_class in zip(candidates, classes):
+            if world_class >= minimum:
+                yield layout
+                produced += 1
+                if produced == count:
+                    return
+    raise ValueError(f"Only {produced} of {count} {CLASS_NAMES[minimum]} worlds found in "
+                     f"{max_batches} batches of {batch_size}")
+
+
+def generate_solvable_layout(config: Config, rng=None, minimum=SOLVABLE_WITH_RISK, max_attempts=10000):
+    """Draws single layouts until one is at least minimum; raises ValueError after max_attempts."""
+    rng = rng or random.Random()
+    analyzer = WorldAnalyzer(config)
+    for _ in range(max_attempts):
+        layout = generate_layout(config, rng)
+        if analyzer.classify(*layout) >= minimum:
+            return layout
+    raise ValueError(f"No {CLASS_NAMES[minimum]} world found in {max_attempts} attempts")
@@ -0,0 +1,78 @@
+# WumpusWorldGame/sprites.py
+
+import os
+from collections import OrderedDict
+
+from PIL import Image, ImageTk # Requires Pillow: pip install Pillow
+
+ASSETS_PATH = os.path.join(os.path.dirname(__file__), "assets")
+SPRITE_NAMES = ["agent", "gold", "wumpus", "pit", "breeze", "stench", "glitter"]
+
+
+def sprite_size(name, cell_size):
+    """Pixel size of a sprite drawn in a cell of cell_size pixels."""
+    if name == "gold":
+        return max(cell_size - 20, 1)
+    if name in ("agent", "wumpus", "pit"):
+        return max(cell_size - 10, 1)
+    return max(cell_size // 3, 1) # Percept icons
+
+
+class SpriteCache:
+    """
+    Process-wide cache of the asset sprites. Each PNG is decoded once; resized PhotoImages are
+    kept per (asset name, size) with least-recently-used eviction beyond max_entries, so new
+    games and cell-size changes reuse images that were already built. Callers pass the Tk
+    widget (e.g., the root window) the images are for.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._decoded = {}            # name -> PIL image
+        self._photos = OrderedDict()  # (name, size) -> PhotoImage
+        self._root = None             # Tk root window the PhotoImages belong to
+
+    def _source(self, name):
+        image = self._decoded.get(name)
+        if image is None:
+            with Image.open(os.path.join(ASSETS_PATH, f"{name}.png")) as handle:
+                image = handle.convert("RGBA")
+            self._decoded[name] = image
+        return image
+
+    def get(self, name, size, master):
+        """Returns the PhotoImage for name at size x size pixels for master's window, building it on first use."""
+        root = master.winfo_toplevel()
+        if root is not self._root:
+            # PhotoImages die with the interpreter that created them
+            self._photos.clear()
+            self._root = root
+        key = (name, size)
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+            return photo
+        photo = ImageTk.PhotoImage(self._source(name).resize((size, size)), master=root)
+        self._photos[key] = photo
+        if len(self._photos) > self.max_entries:
+            self._photos.popitem(last=False)
+        return photo
+
+    def sprites_for_cell_size(self, cell_size, master):
+        """All sprites sized for cells of cell_size pixels, keyed by asset name."""
+        return {name: self.get(name, sprite_size(name, cell_size), master) for name in SPRITE_NAMES}
+
+    def prewarm(self, cell_sizes=(), master=None):
+        """Decodes every asset and, given a Tk master, builds the sprites for the given cell sizes."""
+        for name in SPRITE_NAMES:
+            self._source(name)
+        if master is not None:
+            for cell_size in cell_sizes:
+                self.sprites_for_cell_size(cell_size, master)
+
+    def clear(self):
+        self._decoded.clear()
+        self._photos.clear()
+
+
+sprite_cache = SpriteCache()
@@ -0,0 +1,211 @@
+# WumpusWorldGame/tournament.py
+
+import argparse
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+from statistics import NormalDist
+
+from config import Config
+from agent import WumpusAgent, RandomAgent
+from simulation import SimulationEngine, BatchResult, load_agent_class
+
+
+def _play_seeds(args):
+    # Worker entry point: every active agent plays the same seeds [start, stop), so results pair up by seed
+    config, agent_classes, max_steps, start, stop = args
+    engines = [SimulationEngine(config, agent_class, max_steps) for agent_class in agent_classes]
+    return [[engine.play_episode(seed) for engine in engines] for seed in range(start, stop)]
+
+
+class Matchup:
+    """Paired score differences (first agent minus second) on the seeds both agents played."""
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.episodes = 0
+        self.total_diff = 0
+        self.total_diff_sq = 0
+        self.settled = False
+
+    def add(self, diff):
+        self.episodes += 1
+        self.total_diff += diff
+        self.total_diff_sq += diff * diff
+
+    @property
+    def mean_diff(self):
+        return self.total_diff / self.episodes if self.episodes else 0.0
+
+    @property
+    def diff_std(self):
+        if self.episodes < 2:
+            return 0.0
+        variance = (self.total_diff_sq - self.total_diff * self.total_diff / self.episodes) / (self.episodes - 1)
+        return max(variance, 0.0) ** 0.5
+
+    def z_score(self):
+        std = self.diff_std
+        if std == 0.0:
+            # Identical results on every seed so far say nothing either way; any
+            # constant nonzero difference is as settled as it gets
+            return 0.0 if self.total_diff == 0 else math.copysign(math.inf, self.total_diff)
+        return self.mean_diff / (std / math.sqrt(self.episodes))
+
+    def confidence_interval(self, z):
+        half = z * self.diff_std / math.sqrt(self.episodes) if self.episodes else math.inf
+        return self.mean_diff - half, self.mean_diff + half
+
+    @property
+    def leader(self):
+        if self.total_diff > 0:
+            return self.first
+        if self.total_diff < 0:
+            return self.second
+        return None
+
+
+class TournamentResult:
+    def __init__(self, names, config: Config, alpha):
+        self.names = names
+        self.config = config
+        self.alpha = alpha
+        self.agents = {name: BatchResult() for name in names}
+        self.matchups = [Matchup(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+        self.elapsed = 0.0
+        self.looks = 0
+
+    def summary(self, confidence=0.95):
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        agents = {}
+        for name, result in self.agents.items():
+            half = z * result.score_std / math.sqrt(result.episodes) if result.episodes else math.inf
+            agents[name] = {
+                "episodes": result.episodes,
+                "mean_score": result.mean_score,
+                "score_ci": [result.mean_score - half, result.mean_score + half],
+                "win_rate": result.wins / result.episodes if result.episodes else 0.0,
+                "mean_steps": result.total_steps / result.episodes if result.episodes else 0.0,
+            }
+        matchups = [{
+            "first": m.first,
+            "second": m.second,
+            "episodes": m.episodes,
+            "mean_diff": m.mean_diff,
+            "diff_ci": list(m.confidence_interval(z)),
+            "settled": m.settled,
+            "better": m.leader if m.settled else None,
+        } for m in self.matchups]
+        return {"agents": agents, "matchups": matchups, "looks": self.looks, "elapsed": self.elapsed}
+
+    def format_table(self, confidence=0.95):
+        summary = self.summary(confidence)
+        lines = [f"{'agent':<24}{'episodes':>10}{'mean score':>12}{'CI':>22}{'win rate':>10}{'steps':>8}"]
+        for name, row in summary["agents"].items():
+            low, high = row["score_ci"]
+            lines.append(f"{name:<24}{row['episodes']:>10}{row['mean_score']:>12.2f}{f'[{low:.1f}, {high:.1f}]':>22}"
+                         f"{row['win_rate']:>10.3f}{row['mean_steps']:>8.1f}")
+        lines.append("")
+        for row in summary["matchups"]:
+            low, high = row["diff_ci"]
+            verdict = f"{row['better']} is better" if row["settled"] else "not settled"
+            lines.append(f"{row['first']} - {row['second']}: {row['mean_diff']:+.2f} [{low:.1f}, {high:.1f}] "
+                         f"over {row['episodes']} paired worlds, {verdict}")
+        return "\n".join(lines)
+
+
+def run_tournament(agent_classes, config: Config = None, base_seed=0, max_episodes=20000, min_episodes=500,
+                   batch_size=250, alpha=0.05, processes=None, max_steps=None, log=None):
+    """
+    Plays every agent class on the same seeded worlds and compares them pairwise on the
+    per-seed score differences. Seeds are played in rounds of processes * batch_size; after
+    each round every open matchup is tested, and a matchup is settled once its paired
+    z-test rejects "no difference" at level alpha. alpha is split evenly over all planned
+    looks (Bonferroni), so stopping early keeps the overall error rate below alpha. An agent
+    stops playing once all of its matchups are settled; the tournament stops when none are
+    open or max_episodes worlds have been played.
+    """
+    config = config or Config()
+    names = [agent_class.__name__ for agent_class in agent_classes]
+    if len(set(names)) != len(names):
+        raise ValueError("Agent classes must have distinct names")
+    processes = processes or os.cpu_count() or 1
+    round_size = processes * batch_size
+    planned_looks = max(1, math.ceil(max_episodes / round_size))
+    threshold = NormalDist().inv_cdf(1 - alpha / (2 * planned_looks)) # Two-sided, per look
+
+    result = TournamentResult(names, config, alpha)
+    classes = dict(zip(names, agent_classes))
+    pool = Pool(processes) if processes > 1 else None
+    start_time = time.perf_counter()
+    try:
+        seed = base_seed
+        played = 0
+        while played < max_episodes:
+            open_matchups = [m for m in result.matchups if not m.settled]
+            if len(agent_classes) > 1 and not open_matchups:
+                break
+            active = [name for name in names
+                      if len(agent_classes) == 1 or any(name in (m.first, m.second) for m in open_matchups)]
+            tasks = []
+            for _ in range(processes):
+                stop = min(seed + batch_size, base_seed + max_episodes)
+                if stop > seed:
+                    tasks.append((config, [classes[name] for name in active], max_steps, seed, stop))
+                seed = stop
+            chunks = pool.map(_play_seeds, tasks) if pool is not None else map(_play_seeds, tasks)
+
+            for chunk in chunks:
+                for episodes in chunk:
+                    by_name = dict(zip(active, episodes))
+                    for name, episode in by_name.items():
+                        result.agents[name].add(episode, config)
+                    for matchup in open_matchups:
+                        matchup.add(by_name[matchup.first].score - by_name[matchup.second].score)
+                    played += 1
+
+            result.looks += 1
+            for matchup in open_matchups:
+                if matchup.episodes >= min_episodes and abs(matchup.z_score()) > threshold:
+                    matchup.settled = True
+            if log:
+                log(f"look {result.looks}: {played} worlds, {sum(not m.settled for m in result.matchups)} open matchups")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paired, sequential Wumpus World agent tournament")
+    parser.add_argument("agents", nargs="*", default=[WumpusAgent.__name__, RandomAgent.__name__],
+                        help='Agent classes as "module:Class" (default: the built-in agents)')
+    parser.add_argument("--grid-size", type=int, default=Config().GRID_SIZE)
+    parser.add_argument("--pits", type=int, default=Config().NUM_PITS)
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--max-episodes", type=int, default=20000)
+    parser.add_argument("--min-episodes", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=250)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--max-steps", type=int)
+    args = parser.parse_args(argv)
+
+    config = Config()
+    config.GRID_SIZE = args.grid_size
+    config.NUM_PITS = args.pits
+    result = run_tournament([load_agent_class(spec) for spec in args.agents], config, args.base_seed,
+                            args.max_episodes, args.min_episodes, args.batch_size, args.alpha,
+                            args.processes, args.max_steps, log=print)
+    print(result.format_table())
+    print(f"{result.looks} looks in {result.elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+# WumpusWorldGame/trajectory.py
+
+import copy
+import json
+import struct
+import zlib
+
+from config import Config
+from environment import WumpusEnvironment, LazyWumpusEnvironment
+from agent import WumpusAgent
+from logic import GameLogic
+from simulation import apply_action
+
+_CHUNK_HEADER = struct.Struct("<I") # compressed payload length
+
+# GameLogic methods that count as one recorded action, with the action tuple they stand for
+_RECORDED_ACTIONS = {
+    "move_agent": "move",
+    "shoot_arrow": "shoot",
+    "grab_gold": "grab",
+    "climb_out": "climb",
+}
+
+
+class TrajectoryWriter:
+    """
+    Append-only trajectory stream. Events are buffered and written as zlib-compressed
+    chunks of JSON lines, each prefixed by its length, so memory stays bounded by
+    chunk_events no matter how many episodes are recorded.
+    """
+
+    def __init__(self, path, chunk_events=4096, level=6):
+        self._file = open(path, "ab")
+        self.chunk_events = chunk_events
+        self.level = level
+        self._buffer = []
+
+    def write(self, event):
+        self._buffer.append(json.dumps(event, separators=(",", ":")))
+        if len(self._buffer) >= self.chunk_events:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            payload = zlib.compress("\n".join(self._buffer).encode(), self.level)
+            self._file.write(_CHUNK_HEADER.pack(len(payload)))
+            self._file.write(payload)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_events(path):
+    """Yields recorded events one chunk at a time."""
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                return
+            (length,) = _CHUNK_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return # Truncated final chunk from an interrupted writer
+            for line in zlib.decompress(payload).decode().split("\n"):
+                yield json.loads(line)
+
+
+class Episode:
+    def __init__(self, start_event):
+        self.episode = start_event["episode"]
+        self.seed = start_event.get("seed")
+        self.grid_size = start_event["grid_size"]
+        self.num_pits = start_event["num_pits"]
+        # Fixed worlds are recorded by their layout, lazy ones by their layout_seed()
+        self.layout = None
+        self.layout_seed = None
+        if "lazy" in start_event:
+            world_seed, wumpus, gold = start_event["lazy"]
+            self.layout_seed = (int(world_seed, 16), tuple(wumpus), tuple(gold))
+        else:
+            wumpus, gold, pits = start_event["layout"]
+            self.layout = (tuple(wumpus), tuple(gold), int(pits, 16))
+        self.steps = []
+        self.final_score = None
+        self.final_state = None
+
+
+def iter_episodes(path):
+    """Yields complete Episode objects; only one episode is held in memory at a time."""
+    current = None
+    for event in iter_events(path):
+        kind = event["t"]
+        if kind == "episode":
+            current = Episode(event)
+        elif current is None:
+            continue
+        elif kind == "step":
+            current.steps.append(event)
+        elif kind == "end":
+            current.final_score = event["score"]
+            current.final_state = event["state"]
+            yield current
+            current = None
+
+
+def find_episode(path, episode=None, seed=None):
+    """Returns the first recorded episode with the given episode number or world seed."""
+    for candidate in iter_episodes(path):
+        if (episode is not None and candidate.episode == episode) or (seed is not None and candidate.seed == seed):
+            return candidate
+    return None
+
+
+class TrajectoryRecorder:
+    """
+    Records games into a TrajectoryWriter by wrapping the GameLogic action methods (and
+    the agent's turns) of each attached game. Every action is written with the percepts
+    perceived after it, the score change and the resulting game state.
+    """
+
+    def __init__(self, writer: TrajectoryWriter):
+        self.writer = writer
+        self.episodes = 0
+        self._pending = None
+
+    def attach(self, game_logic, seed=None):
+        """Starts recording a new episode on game_logic (call before its first action)."""
+        environment = game_logic.environment
+        config = game_logic.config
+        event = {
+            "t": "episode",
+            "episode": self.episodes,
+            "seed": seed,
+            "grid_size": config.GRID_SIZE,
+            "num_pits": config.NUM_PITS,
+        }
+        layout_seed = environment.layout_seed()
+        if layout_seed is not None:
+            # A lazy world is rebuilt from its seed; materializing its layout would visit every cell
+            world_seed, wumpus, gold = layout_seed
+            event["lazy"] = [format(world_seed, "x"), wumpus, gold]
+        else:
+            wumpus, gold, pits = environment.layout()
+            event["layout"] = [wumpus, gold, format(pits, "x")]
+        self.writer.write(event)
+        self.episodes += 1
+
+        for method_name, action_type in _RECORDED_ACTIONS.items():
+            self._wrap_action(game_logic, method_name, action_type)
+        for method_name, direction in (("turn_left", "left"), ("turn_right", "right")):
+            self._wrap_turn(game_logic, method_name, direction)
+        perceive = game_logic.perceive_current_location
+
+        def recording_perceive():
+            perceive()
+            if self._pending is not None:
+                self._pending["p"] = list(game_logic.agent.percepts)
+                self.writer.write(self._pending)
+                self._pending = None
+        game_logic.perceive_current_location = recording_perceive
+        return game_logic
+
+    def _wrap_action(self, game_logic, method_name, action_type):
+        method = getattr(game_logic, method_name)
+
+        def recording_action(*args):
+            score_before = game_logic.agent.score
+            result = method(*args)
+            self._pending = {
+                "t": "step",
+                "a": action_type,
+                "d": args[0] if args else None,
+                "ds": game_logic.agent.score - score_before,
+                "s": game_logic.game_state,
+            }
+            return result
+        setattr(game_logic, method_name, recording_action)
+
+    def _wrap_turn(self, game_logic, method_name, direction):
+        agent = game_logic.agent
+        method = getattr(agent, method_name)
+
+        def recording_turn():
+            method()
+            self._pending = {"t": "step", "a": "turn", "d": direction, "ds": 0, "s": game_logic.game_state}
+        setattr(agent, method_name, recording_turn)
+
+    def finish(self, game_logic):
+        """Ends the current episode with its final score and state."""
+        if self._pending is not None:
+            self.writer.write(self._pending)
+            self._pending = None
+        self.writer.write({"t": "end", "score": game_logic.agent.score, "state": game_logic.game_state})
+
+
+def _config_for(episode: Episode, base_config: Config = None):
+    config = copy.copy(base_config) if base_config is not None else Config()
+    config.GRID_SIZE = episode.grid_size
+    config.NUM_PITS = episode.num_pits
+    return config
+
+
+def rebuild_game(episode: Episode, config: Config = None, agent_class=WumpusAgent):
+    """Recreates the recorded world and a fresh agent, ready for the first action."""
+    config = _config_for(episode, config)
+    if episode.layout_seed is not None:
+        environment = LazyWumpusEnvironment(config, layout_seed=episode.layout_seed)
+    else:
+        environment = WumpusEnvironment(config, layout=episode.layout)
+    agent = agent_class(config)
+    game_logic = GameLogic(environment, agent, config)
+    game_logic.perceive_current_location()
+    agent.infer_from_percepts()
+    return game_logic
+
+
+def replay(episode: Episode, config: Config = None, agent_class=WumpusAgent):
+    """
+    Re-runs a recorded episode headlessly at full speed. Returns (game_logic, mismatches),
+    where mismatches lists (step index, field, recorded, replayed) wherever the replay
+    diverged from the recording.
+    """
+    game_logic = rebuild_game(episode, config, agent_class)
+    mismatches = []
+    for index, step in enumerate(episode.steps):
+        score_before = game_logic.agent.score
+        apply_action(game_logic, step["a"], step["d"])
+        replayed = {"ds": game_logic.agent.score - score_before, "s": game_logic.game_state}
+        if "p" in step:
+            replayed["p"] = list(game_logic.agent.percepts)
+        for field, value in replayed.items():
+            if step.get(field) != value:
+                mismatches.append((index, field, step.get(field), value))
+    return game_logic, mismatches
+
+
+def replay_in_gui(gui, episode: Episode, delay_ms=300, agent_class=WumpusAgent, on_done=None):
+    """Plays a recorded episode into an existing WumpusGUI, one action every delay_ms."""
+    game_logic = rebuild_game(episode, gui.config, agent_class)
+    gui.load_game(game_logic)
+    steps = iter(episode.steps)
+
+    def next_frame():
+        step = next(steps, None)
+        if step is None:
+            if on_done is not None:
+                on_done(game_logic)
+            return
+        apply_action(game_logic, step["a"], step["d"])
+        agent = game_logic.agent
+        gui.update_grid(agent.known_grid, agent.take_changed_cells())
+        gui.update_percepts_display(agent.percepts)
+        gui.update_score(agent.score)
+        gui.update_arrows(agent.has_arrow)
+        gui.update_gold(agent.has_gold)
+        gui.update_status(game_logic.game_state)
+        gui.after(delay_ms, next_frame)
+
+    gui.after(delay_ms, next_frame)
+    return game_logic
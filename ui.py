@@ -2,26 +2,45 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk # Requires Pillow: pip install Pillow
-import os
+from logic import UndoHistory
+from simulation import apply_action, SimulationEngine
+from sprites import sprite_cache, SPRITE_NAMES
+
+ZOOM_LEVELS = (4, 6, 8, 12, 16, 24, 32, 48, 64, 80, 96, 128) # Allowed cell sizes in pixels
+SPRITE_MIN_CELL_SIZE = 32  # Smaller cells are drawn as plain colored rectangles, without sprites
+OUTLINE_MIN_CELL_SIZE = 8  # Smaller cells are drawn without outlines or grid lines
+MAX_VIEWPORT_SIZE = 800    # Largest initial canvas side in pixels; bigger worlds scroll
+MAX_VISIBLE_CELLS = 40000  # Zooming out stops before the viewport would need more cells than this
+UNDO_LIMIT = 1000          # Moves the Undo button can take back
 
 class WumpusGUI(tk.Frame):
-    def __init__(self, master, game_logic, config, initial_env_grid):
+    def __init__(self, master, game_logic, config, on_reset=None):
         super().__init__(master)
         self.game_logic = game_logic
         self.config = config
         self.master = master
+        self.on_reset = on_reset # Called by the Reset button; builds a new game and passes it to load_game
+        self.undo_history = UndoHistory(UNDO_LIMIT) # The states before the last UNDO_LIMIT actions
 
         self.grid_size = self.config.GRID_SIZE
-        self.cell_size = 80 # Size of each cell in pixels
+        self.cell_size = self._initial_cell_size() # Size of each cell in pixels
+        viewport_size = min(self.grid_size * self.cell_size, MAX_VIEWPORT_SIZE)
 
         self.images = self._load_images()
-        self.canvas = tk.Canvas(self, width=self.grid_size * self.cell_size,
-                                height=self.grid_size * self.cell_size,
+        # The canvas is a viewport onto the world: only the cells inside it have canvas items
+        self.canvas_frame = tk.Frame(self)
+        self.canvas_frame.pack(side=tk.LEFT, expand=True, fill=tk.BOTH, padx=10, pady=10)
+        self.canvas = tk.Canvas(self.canvas_frame, width=viewport_size, height=viewport_size,
                                 bg="white", borderwidth=2, relief="groove")
-        self.canvas.pack(side=tk.LEFT, padx=10, pady=10)
-
-        self.info_frame = tk.Frame(self, width=250, height=self.grid_size * self.cell_size,
+        self.x_scrollbar = tk.Scrollbar(self.canvas_frame, orient=tk.HORIZONTAL, command=self._scroll_x)
+        self.y_scrollbar = tk.Scrollbar(self.canvas_frame, orient=tk.VERTICAL, command=self._scroll_y)
+        self.canvas.config(xscrollcommand=self.x_scrollbar.set, yscrollcommand=self.y_scrollbar.set)
+        self.x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        self._bind_viewport_events()
+
+        self.info_frame = tk.Frame(self, width=250, height=viewport_size,
                                    bg="#F0F0F0", borderwidth=2, relief="solid")
         self.info_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
         self.info_frame.pack_propagate(False) # Prevent frame from shrinking to fit content
@@ -32,33 +51,35 @@ class WumpusGUI(tk.Frame):
         self._create_info_widgets()
         self._create_control_buttons()
 
-        self.draw_grid_lines()
-        self.update_grid(self.game_logic.agent.known_grid) # Initial draw
+        # Persistent canvas items, so an update only touches the cells that changed
+        self.cell_rects = {}       # (r, c) -> rectangle id
+        self.cell_sprites = {}     # (r, c) -> image ids drawn on the cell
+        self.cell_appearance = {}  # (r, c) -> (fill color, sprites) currently shown
+        self.agent_sprite = None
+        self.visible = (0, 0, 0, 0) # Drawn cell range as (first row, end row, first col, end col)
+        self.follow_agent = True    # Scroll to keep the agent in view when it walks out of it
+
+        self._configure_scroll_region()
+        self.refresh_viewport()
+        self.game_logic.agent.take_changed_cells()
+
+    def _initial_cell_size(self):
+        # The classic 80 px cells when the world fits, otherwise the largest size that still shows sprites
+        for size in reversed(ZOOM_LEVELS):
+            if size <= 80 and self.grid_size * size <= MAX_VIEWPORT_SIZE:
+                return size
+        return SPRITE_MIN_CELL_SIZE
 
     def _load_images(self):
-        images = {}
-        script_dir = os.path.dirname(__file__)
-        assets_path = os.path.join(script_dir, "assets")
-
+        if self.cell_size < SPRITE_MIN_CELL_SIZE:
+            return {} # Plain colored cells only; the agent is drawn as a marker
+        # Sprites come from the process-wide cache, so only the first game pays for decoding
         try:
-            images["agent"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "agent.png")).resize((self.cell_size - 10, self.cell_size - 10)))
-            images["gold"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "gold.png")).resize((self.cell_size - 20, self.cell_size - 20)))
-            images["wumpus"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "wumpus.png")).resize((self.cell_size - 10, self.cell_size - 10)))
-            images["pit"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "pit.png")).resize((self.cell_size - 10, self.cell_size - 10)))
-            images["breeze"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "breeze.png")).resize((self.cell_size // 3, self.cell_size // 3)))
-            images["stench"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "stench.png")).resize((self.cell_size // 3, self.cell_size // 3)))
-            images["glitter"] = ImageTk.PhotoImage(Image.open(os.path.join(assets_path, "glitter.png")).resize((self.cell_size // 3, self.cell_size // 3)))
+            return sprite_cache.sprites_for_cell_size(self.cell_size, self.master)
         except FileNotFoundError as e:
             messagebox.showerror("Image Load Error", f"Could not load image: {e}\nPlease ensure 'assets' folder is in the same directory as 'ui.py'")
             # Create dummy images if not found, to prevent crash
-            images["agent"] = tk.PhotoImage(width=1, height=1)
-            images["gold"] = tk.PhotoImage(width=1, height=1)
-            images["wumpus"] = tk.PhotoImage(width=1, height=1)
-            images["pit"] = tk.PhotoImage(width=1, height=1)
-            images["breeze"] = tk.PhotoImage(width=1, height=1)
-            images["stench"] = tk.PhotoImage(width=1, height=1)
-            images["glitter"] = tk.PhotoImage(width=1, height=1)
-        return images
+            return {name: tk.PhotoImage(master=self.master, width=1, height=1) for name in SPRITE_NAMES}
 
     def _create_info_widgets(self):
         tk.Label(self.info_frame, text="Game Status", font=("Arial", 14, "bold"), bg="#F0F0F0").pack(pady=10)
@@ -97,69 +118,250 @@ class WumpusGUI(tk.Frame):
 
         game_control_frame = tk.Frame(self.controls_frame)
         game_control_frame.pack(pady=padding)
+        tk.Button(game_control_frame, text="Undo", command=self._undo, font=button_font, width=8).pack(side=tk.LEFT, padx=5, pady=5)
         tk.Button(game_control_frame, text="Reset Game", command=self._reset_game, font=button_font, bg="red", fg="white", width=12).pack(side=tk.LEFT, padx=5, pady=5)
 
+        zoom_frame = tk.Frame(self.controls_frame)
+        zoom_frame.pack(pady=padding)
+        tk.Button(zoom_frame, text="Zoom In", command=lambda: self.zoom(1), font=button_font, width=8).pack(side=tk.LEFT, padx=2, pady=2)
+        tk.Button(zoom_frame, text="Zoom Out", command=lambda: self.zoom(-1), font=button_font, width=8).pack(side=tk.LEFT, padx=2, pady=2)
+        tk.Button(zoom_frame, text="Find Agent", command=self.center_on_agent, font=button_font, width=8).pack(side=tk.LEFT, padx=2, pady=2)
+
+    # --- Viewport -----------------------------------------------------------
+
+    def _bind_viewport_events(self):
+        self.canvas.bind("<Configure>", lambda event: self.refresh_viewport())
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel) # X11 wheel up
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel) # X11 wheel down
+        self.canvas.bind("<ButtonPress-2>", lambda event: self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind("<B2-Motion>", self._on_drag)
+
+    def _configure_scroll_region(self):
+        world_size = self.grid_size * self.cell_size
+        self.canvas.config(scrollregion=(0, 0, world_size, world_size),
+                           xscrollincrement=max(self.cell_size, SPRITE_MIN_CELL_SIZE),
+                           yscrollincrement=max(self.cell_size, SPRITE_MIN_CELL_SIZE))
+
+    def _viewport_size(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1 or height <= 1: # Not mapped yet; use the requested size
+            width, height = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        return width, height
+
+    def _visible_range(self):
+        width, height = self._viewport_size()
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        size = self.cell_size
+        return (max(0, int(y0 // size)), min(self.grid_size, int((y0 + height) // size) + 1),
+                max(0, int(x0 // size)), min(self.grid_size, int((x0 + width) // size) + 1))
+
+    def refresh_viewport(self):
+        """Creates items for cells that scrolled into view and deletes those that left it."""
+        visible = self._visible_range()
+        if visible == self.visible and self.cell_rects:
+            return
+        self.visible = r0, r1, c0, c1 = visible
+        for cell in [cell for cell in self.cell_rects if not (r0 <= cell[0] < r1 and c0 <= cell[1] < c1)]:
+            self._forget_cell(cell)
+        known_grid = self.game_logic.agent.known_grid
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                if (r, c) not in self.cell_rects:
+                    self._draw_cell(r, c, known_grid[(r, c)])
+        self.draw_grid_lines()
+        self._draw_agent()
 
-    def draw_grid_lines(self):
-        for i in range(self.grid_size + 1):
-            x = i * self.cell_size
-            y = i * self.cell_size
-            self.canvas.create_line(x, 0, x, self.grid_size * self.cell_size, fill="gray")
-            self.canvas.create_line(0, y, self.grid_size * self.cell_size, y, fill="gray")
-
-    def update_grid(self, known_grid):
-        self.canvas.delete("all_cells") # Clear previous cell content
-
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                x1, y1 = c * self.cell_size, r * self.cell_size
-                x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-
-                cell_status = known_grid[(r, c)]["status"]
-                is_visited = known_grid[(r, c)]["visited"]
-                percepts_at_cell = known_grid[(r, c)]["percepts"]
-
-                fill_color = self.config.COLOR_UNKNOWN
-                if is_visited:
-                    fill_color = self.config.COLOR_KNOWN
-                    if cell_status == "Safe":
-                        fill_color = self.config.COLOR_SAFE
-                    elif "Breeze" in percepts_at_cell or "Stench" in percepts_at_cell:
-                        fill_color = self.config.COLOR_DANGER # Indicate perceived danger
-                elif cell_status == "Pit?":
-                    fill_color = self.config.COLOR_PIT_PERCEIVED
-                elif cell_status == "Wumpus?":
-                    fill_color = self.config.COLOR_WUMPUS_PERCEIVED
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline="gray", tags="all_cells")
-
-                # Add percepts and known entities if cell is visited
-                if is_visited:
-                    # Display percept icons
-                    icon_offset_x = 5
-                    icon_offset_y = 5
-                    if self.config.BREEZE in percepts_at_cell:
-                        self.canvas.create_image(x1 + icon_offset_x, y1 + icon_offset_y, anchor='nw', image=self.images["breeze"], tags="all_cells")
-                        icon_offset_x += self.cell_size // 3 + 5
-                    if self.config.STENCH in percepts_at_cell:
-                        self.canvas.create_image(x1 + icon_offset_x, y1 + icon_offset_y, anchor='nw', image=self.images["stench"], tags="all_cells")
-                        icon_offset_x += self.cell_size // 3 + 5
-                    if self.config.GLITTER in percepts_at_cell:
-                        self.canvas.create_image(x1 + icon_offset_x, y1 + icon_offset_y, anchor='nw', image=self.images["glitter"], tags="all_cells")
-
-
-                    # Display known entities
-                    if "Wumpus" in percepts_at_cell: # This would only be known if Wumpus is in visited square
-                         self.canvas.create_image(x1 + self.cell_size // 2, y1 + self.cell_size // 2, anchor='center', image=self.images["wumpus"], tags="all_cells")
-                    if "Pit" in percepts_at_cell:
-                        self.canvas.create_image(x1 + self.cell_size // 2, y1 + self.cell_size // 2, anchor='center', image=self.images["pit"], tags="all_cells")
-                    if "Gold" in percepts_at_cell and not self.game_logic.environment.gold_collected:
-                        self.canvas.create_image(x1 + self.cell_size // 2, y1 + self.cell_size // 2, anchor='center', image=self.images["gold"], tags="all_cells")
-
-                # Always draw agent at its current position
-                if (r, c) == (self.game_logic.agent.row, self.game_logic.agent.col):
-                    self.canvas.create_image(x1 + self.cell_size // 2, y1 + self.cell_size // 2, anchor='center', image=self.images["agent"], tags="all_cells")
+    def _scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.refresh_viewport()
 
+    def _scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.refresh_viewport()
+
+    def _on_drag(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.refresh_viewport()
+
+    def _on_mouse_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        if event.state & 0x0004: # Control: zoom around the pointer
+            self.zoom(1 if up else -1, event.x, event.y)
+            return
+        if event.state & 0x0001: # Shift: scroll sideways
+            self.canvas.xview_scroll(-1 if up else 1, "units")
+        else:
+            self.canvas.yview_scroll(-1 if up else 1, "units")
+        self.refresh_viewport()
+
+    def _min_zoom_index(self):
+        width, height = self._viewport_size()
+        for index, size in enumerate(ZOOM_LEVELS):
+            if (width // size + 2) * (height // size + 2) <= MAX_VISIBLE_CELLS:
+                return index
+        return len(ZOOM_LEVELS) - 1
+
+    def zoom(self, steps, x=None, y=None):
+        """Moves steps zoom levels in (positive) or out, keeping the world point under viewport pixel (x, y) fixed."""
+        current = ZOOM_LEVELS.index(self.cell_size) if self.cell_size in ZOOM_LEVELS else ZOOM_LEVELS.index(SPRITE_MIN_CELL_SIZE)
+        index = max(self._min_zoom_index(), min(len(ZOOM_LEVELS) - 1, current + steps))
+        self.set_cell_size(ZOOM_LEVELS[index], x, y)
+
+    def set_cell_size(self, cell_size, x=None, y=None):
+        if cell_size == self.cell_size:
+            return
+        width, height = self._viewport_size()
+        x = width / 2 if x is None else x
+        y = height / 2 if y is None else y
+        world_x = (self.canvas.canvasx(x)) / self.cell_size
+        world_y = (self.canvas.canvasy(y)) / self.cell_size
+
+        self._clear_cells()
+        self.cell_size = cell_size
+        self.images = self._load_images()
+        self._configure_scroll_region()
+        self._scroll_to(world_x * cell_size - x, world_y * cell_size - y)
+
+    def _scroll_to(self, left, top):
+        world_size = self.grid_size * self.cell_size
+        self.canvas.xview_moveto(max(0, left) / world_size)
+        self.canvas.yview_moveto(max(0, top) / world_size)
+        self.refresh_viewport()
+
+    def center_on(self, r, c):
+        width, height = self._viewport_size()
+        self._scroll_to((c + 0.5) * self.cell_size - width / 2, (r + 0.5) * self.cell_size - height / 2)
+
+    def center_on_agent(self):
+        self.center_on(self.game_logic.agent.row, self.game_logic.agent.col)
+
+    def _clear_cells(self):
+        for cell in list(self.cell_rects):
+            self._forget_cell(cell)
+        self.canvas.delete("grid_lines")
+        if self.agent_sprite is not None:
+            self.canvas.delete(self.agent_sprite)
+            self.agent_sprite = None
+
+    def _forget_cell(self, cell):
+        self.canvas.delete(self.cell_rects.pop(cell))
+        for item_id in self.cell_sprites.pop(cell, ()):
+            self.canvas.delete(item_id)
+        self.cell_appearance.pop(cell, None)
+
+    def draw_grid_lines(self):
+        # Only the lines crossing the viewport; tiny cells get none
+        self.canvas.delete("grid_lines")
+        if self.cell_size < OUTLINE_MIN_CELL_SIZE:
+            return
+        r0, r1, c0, c1 = self.visible
+        size = self.cell_size
+        for c in range(c0, c1 + 1):
+            self.canvas.create_line(c * size, r0 * size, c * size, r1 * size, fill="gray", tags="grid_lines")
+        for r in range(r0, r1 + 1):
+            self.canvas.create_line(c0 * size, r * size, c1 * size, r * size, fill="gray", tags="grid_lines")
+
+    def update_grid(self, known_grid, changed_cells=None):
+        """
+        Redraws the visible cells in changed_cells (every visible cell if None) and moves the
+        agent sprite. Canvas items are kept per cell and only reconfigured when what the cell
+        shows changed; cells outside the viewport are drawn when they scroll into view.
+        """
+        r0, r1, c0, c1 = self.visible
+        if changed_cells is None:
+            cells = [(r, c) for r in range(r0, r1) for c in range(c0, c1)]
+        else:
+            cells = [(r, c) for r, c in changed_cells if r0 <= r < r1 and c0 <= c < c1]
+        for r, c in cells:
+            self._draw_cell(r, c, known_grid[(r, c)])
+        agent = self.game_logic.agent
+        if self.follow_agent and not (r0 <= agent.row < r1 and c0 <= agent.col < c1):
+            self.center_on(agent.row, agent.col) # Refreshing the viewport draws the agent as well
+        else:
+            self._draw_agent()
+
+    def _cell_appearance(self, cell):
+        cell_status = cell["status"]
+        is_visited = cell["visited"]
+        percepts_at_cell = cell["percepts"]
+
+        fill_color = self.config.COLOR_UNKNOWN
+        if is_visited:
+            fill_color = self.config.COLOR_KNOWN
+            if cell_status == "Safe":
+                fill_color = self.config.COLOR_SAFE
+            elif "Breeze" in percepts_at_cell or "Stench" in percepts_at_cell:
+                fill_color = self.config.COLOR_DANGER # Indicate perceived danger
+        elif cell_status == "Pit":
+            fill_color = self.config.COLOR_PIT_KNOWN
+        elif cell_status == "Wumpus":
+            fill_color = self.config.COLOR_WUMPUS_KNOWN
+        elif cell_status == "Pit?":
+            fill_color = self.config.COLOR_PIT_PERCEIVED
+        elif cell_status == "Wumpus?":
+            fill_color = self.config.COLOR_WUMPUS_PERCEIVED
+
+        # Sprites as (image name, dx, dy, anchor) relative to the cell's top-left corner
+        sprites = []
+        if is_visited and self.cell_size >= SPRITE_MIN_CELL_SIZE:
+            # Display percept icons
+            icon_offset_x = 5
+            icon_offset_y = 5
+            for percept, image_name in ((self.config.BREEZE, "breeze"), (self.config.STENCH, "stench"), (self.config.GLITTER, "glitter")):
+                if percept in percepts_at_cell:
+                    sprites.append((image_name, icon_offset_x, icon_offset_y, 'nw'))
+                    icon_offset_x += self.cell_size // 3 + 5
+
+            # Display known entities
+            center = self.cell_size // 2
+            if "Wumpus" in percepts_at_cell: # This would only be known if Wumpus is in visited square
+                sprites.append(("wumpus", center, center, 'center'))
+            if "Pit" in percepts_at_cell:
+                sprites.append(("pit", center, center, 'center'))
+            if "Gold" in percepts_at_cell and not self.game_logic.environment.gold_collected:
+                sprites.append(("gold", center, center, 'center'))
+        return fill_color, tuple(sprites)
+
+    def _draw_cell(self, r, c, cell):
+        appearance = self._cell_appearance(cell)
+        if self.cell_appearance.get((r, c)) == appearance:
+            return
+        self.cell_appearance[(r, c)] = appearance
+        fill_color, sprites = appearance
+        x1, y1 = c * self.cell_size, r * self.cell_size
+
+        rect_id = self.cell_rects.get((r, c))
+        if rect_id is None:
+            outline = "gray" if self.cell_size >= OUTLINE_MIN_CELL_SIZE else ""
+            self.cell_rects[(r, c)] = self.canvas.create_rectangle(x1, y1, x1 + self.cell_size, y1 + self.cell_size,
+                                                                   fill=fill_color, outline=outline, tags="all_cells")
+        else:
+            self.canvas.itemconfig(rect_id, fill=fill_color)
+
+        for item_id in self.cell_sprites.pop((r, c), ()):
+            self.canvas.delete(item_id)
+        if sprites:
+            self.cell_sprites[(r, c)] = [
+                self.canvas.create_image(x1 + dx, y1 + dy, anchor=anchor, image=self.images[name], tags="all_cells")
+                for name, dx, dy, anchor in sprites
+            ]
+
+    def _draw_agent(self):
+        agent = self.game_logic.agent
+        # Always draw agent at its current position
+        x = agent.col * self.cell_size + self.cell_size // 2
+        y = agent.row * self.cell_size + self.cell_size // 2
+        if self.agent_sprite is None:
+            if self.cell_size >= SPRITE_MIN_CELL_SIZE:
+                self.agent_sprite = self.canvas.create_image(x, y, anchor='center', image=self.images["agent"], tags="agent")
+            else:
+                self.agent_sprite = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.config.COLOR_AGENT, outline="black", tags="agent")
+        if self.cell_size >= SPRITE_MIN_CELL_SIZE:
+            self.canvas.coords(self.agent_sprite, x, y)
+        else:
+            half = max(self.cell_size // 2, 2)
+            self.canvas.coords(self.agent_sprite, x - half, y - half, x + half, y + half)
         self.canvas.tag_raise("agent") # Ensure agent is always on top
 
     def update_percepts_display(self, percepts):
@@ -187,22 +389,13 @@ class WumpusGUI(tk.Frame):
             messagebox.showinfo("Game Over", "The game is over. Please reset to play again.")
             return
 
-        result_message = ""
-        game_over = False
+        self.undo_history.push(self.game_logic)
 
-        if action_type == "move":
-            game_over, result_message = self.game_logic.move_agent(direction)
-        elif action_type == "shoot":
-            game_over, result_message = self.game_logic.shoot_arrow()
-        elif action_type == "grab":
-            game_over, result_message = self.game_logic.grab_gold()
-        elif action_type == "climb":
-            game_over, result_message = self.game_logic.climb_out()
+        # Apply the action and let the agent perceive and reason about the result
+        game_over, result_message = apply_action(self.game_logic, action_type, direction)
 
         # Update UI after action
-        self.game_logic.perceive_current_location() # Agent perceives new location
-        self.game_logic.agent.infer_from_percepts() # Agent updates its knowledge
-        self.update_grid(self.game_logic.agent.known_grid)
+        self.update_grid(self.game_logic.agent.known_grid, self.game_logic.agent.take_changed_cells())
         self.update_percepts_display(self.game_logic.agent.percepts)
         self.update_score(self.game_logic.agent.score)
         self.update_arrows(self.game_logic.agent.has_arrow)
@@ -219,10 +412,59 @@ class WumpusGUI(tk.Frame):
                 messagebox.showerror("Game Over!", f"You lost! Final score: {self.game_logic.agent.score}")
             # Optionally disable buttons or prompt for reset
 
+    def load_game(self, game_logic):
+        """
+        Shows a new game in this window, reusing the canvas and every widget. Only the
+        sprites drawn on cells are dropped; cell rectangles are recolored in place.
+        """
+        self.game_logic = game_logic
+        self.undo_history.clear()
+        if game_logic.config.GRID_SIZE != self.grid_size:
+            # Pick the scale and viewport for the new world the same way __init__ does
+            self._clear_cells()
+            self.grid_size = game_logic.config.GRID_SIZE
+            self.cell_size = self._initial_cell_size()
+            self.images = self._load_images()
+            viewport_size = min(self.grid_size * self.cell_size, MAX_VIEWPORT_SIZE)
+            self.canvas.config(width=viewport_size, height=viewport_size)
+            self.info_frame.config(height=viewport_size)
+            self._configure_scroll_region()
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+            self.follow_agent = True
+            self.visible = (0, 0, 0, 0)
+            self.refresh_viewport()
+        self._redraw_game()
+
+    def _redraw_game(self):
+        # Drops every cell sprite and redraws the whole known map and the info panel
+        for item_ids in self.cell_sprites.values():
+            for item_id in item_ids:
+                self.canvas.delete(item_id)
+        self.cell_sprites.clear()
+        self.cell_appearance.clear()
+
+        agent = self.game_logic.agent
+        self.update_grid(agent.known_grid)
+        agent.take_changed_cells()
+        self.update_percepts_display(agent.percepts)
+        self.update_score(agent.score)
+        self.update_arrows(agent.has_arrow)
+        self.update_gold(agent.has_gold)
+        self.update_status(self.game_logic.game_state)
+
+    def _undo(self):
+        if not self.undo_history:
+            messagebox.showinfo("Undo", "Nothing to undo.")
+            return
+        # The world and the agent are rolled back in place, then everything is redrawn
+        self.undo_history.pop(self.game_logic)
+        self._redraw_game()
+
     def _reset_game(self):
-        # This will trigger the main application to re-initialize the game
-        self.master.winfo_toplevel().destroy() # Close current window
-        import main # Re-import main to re-run the startup
-        root = tk.Tk()
-        app = main.WumpusGameApp(root)
-        root.mainloop()
\ No newline at end of file
+        # Start a new world in place: the Tk root, this frame and the canvas are kept
+        if self.on_reset is not None:
+            self.on_reset()
+        else:
+            engine = SimulationEngine(self.config, type(self.game_logic.agent))
+            self.load_game(engine.new_game())
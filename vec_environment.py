@@ -0,0 +1,213 @@
+# WumpusWorldGame/vec_environment.py
+
+import numpy as np
+from config import Config
+
+# Action codes accepted by VecWumpusEnvironment.step
+MOVE_UP = 0
+MOVE_DOWN = 1
+MOVE_LEFT = 2
+MOVE_RIGHT = 3
+TURN_LEFT = 4
+TURN_RIGHT = 5
+SHOOT = 6
+GRAB = 7
+CLIMB = 8
+NUM_ACTIONS = 9
+
+# Percept bits in the returned percept array
+BREEZE_BIT = 1
+STENCH_BIT = 2
+GLITTER_BIT = 4
+BUMP_BIT = 8
+SCREAM_BIT = 16
+
+# Directions use the same order as WumpusAgent.turn_left: right, up, left, down
+_DIRECTION_DR = np.array([0, -1, 0, 1], dtype=np.int64)
+_DIRECTION_DC = np.array([1, 0, -1, 0], dtype=np.int64)
+# Row/col offsets for MOVE_UP .. MOVE_RIGHT
+_MOVE_DR = np.array([-1, 1, 0, 0], dtype=np.int64)
+_MOVE_DC = np.array([0, 0, -1, 1], dtype=np.int64)
+
+
+class VecWumpusEnvironment:
+    """
+    N independent Wumpus worlds held as stacked arrays and stepped in lockstep.
+    The rules mirror GameLogic.move_agent, shoot_arrow, grab_gold and climb_out
+    (plus the agent's turn_left/turn_right), and rewards are the score changes
+    those methods would apply. Finished worlds are reset automatically.
+    """
+
+    def __init__(self, config: Config, num_envs, seed=None, max_steps=None):
+        self.config = config
+        self.num_envs = num_envs
+        self.grid_size = config.GRID_SIZE
+        self.num_cells = self.grid_size * self.grid_size
+        self.max_steps = max_steps if max_steps is not None else 4 * self.num_cells
+        self.rng = np.random.default_rng(seed)
+        self._env_index = np.arange(num_envs)
+
+        shape = (num_envs, self.grid_size, self.grid_size)
+        self.pits = np.zeros(shape, dtype=bool)
+        self.wumpus = np.zeros(shape, dtype=bool)
+        self.gold = np.zeros(shape, dtype=bool)
+        self.breeze = np.zeros(shape, dtype=bool)
+        self.stench = np.zeros(shape, dtype=bool)
+
+        self.wumpus_alive = np.ones(num_envs, dtype=bool)
+        self.gold_collected = np.zeros(num_envs, dtype=bool)
+        self.has_gold = np.zeros(num_envs, dtype=bool)
+        self.has_arrow = np.ones(num_envs, dtype=bool)
+        self.row = np.zeros(num_envs, dtype=np.int64)
+        self.col = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64) # 0 = right
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.won = np.zeros(num_envs, dtype=bool)
+        # Score and outcome of the episodes that ended on the last step (zero/False elsewhere)
+        self.final_score = np.zeros(num_envs, dtype=np.int64)
+        self.final_won = np.zeros(num_envs, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Generates fresh worlds for the envs selected by mask (all envs if None) and returns their percepts."""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        idx = np.flatnonzero(mask)
+        if idx.size:
+            self._generate_worlds(idx)
+            start_r, start_c = self.config.AGENT_START
+            self.wumpus_alive[idx] = True
+            self.gold_collected[idx] = False
+            self.has_gold[idx] = False
+            self.has_arrow[idx] = True
+            self.row[idx] = start_r
+            self.col[idx] = start_c
+            self.direction[idx] = 0
+            self.score[idx] = 0
+            self.steps[idx] = 0
+            self.won[idx] = False
+        return self._percepts()
+
+    def _generate_worlds(self, idx):
+        n = self.grid_size
+        start = self.config.AGENT_START[0] * n + self.config.AGENT_START[1]
+        # A random permutation of the non-start cells per world: wumpus, gold, then pits
+        keys = self.rng.random((idx.size, self.num_cells))
+        keys[:, start] = np.inf
+        num_pits = min(self.config.NUM_PITS, self.num_cells - 3)
+        order = np.argsort(keys, axis=1)[:, :2 + num_pits]
+
+        pits = np.zeros((idx.size, self.num_cells), dtype=bool)
+        wumpus = np.zeros_like(pits)
+        gold = np.zeros_like(pits)
+        rows = np.arange(idx.size)
+        wumpus[rows, order[:, 0]] = True
+        gold[rows, order[:, 1]] = True
+        if num_pits:
+            pits[rows[:, None], order[:, 2:]] = True
+
+        shape = (idx.size, n, n)
+        self.wumpus[idx] = wumpus.reshape(shape)
+        self.gold[idx] = gold.reshape(shape)
+        self.pits[idx] = pits.reshape(shape)
+        self.stench[idx] = self._neighbors(self.wumpus[idx])
+        self.breeze[idx] = self._neighbors(self.pits[idx])
+
+    @staticmethod
+    def _neighbors(planes):
+        # Cells orthogonally adjacent to any set cell, for a stack of (k, n, n) planes
+        out = np.zeros_like(planes)
+        out[:, 1:, :] |= planes[:, :-1, :]
+        out[:, :-1, :] |= planes[:, 1:, :]
+        out[:, :, 1:] |= planes[:, :, :-1]
+        out[:, :, :-1] |= planes[:, :, 1:]
+        return out
+
+    def _percepts(self):
+        ei, r, c = self._env_index, self.row, self.col
+        percepts = np.where(self.breeze[ei, r, c], BREEZE_BIT, 0)
+        percepts |= np.where(self.stench[ei, r, c] & self.wumpus_alive, STENCH_BIT, 0)
+        percepts |= np.where(self.gold[ei, r, c] & ~self.gold_collected, GLITTER_BIT, 0)
+        return percepts.astype(np.uint8)
+
+    def step(self, actions):
+        """
+        Applies one action per env. Returns (percepts, rewards, dones): percepts are
+        bitmasks of the *_BIT constants, rewards are score deltas and dones marks worlds
+        that finished (won, lost or hit max_steps) on this step. Those worlds have already
+        been reset, so their percepts describe the first cell of the next episode.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got an array of shape {actions.shape}")
+        # Out-of-range codes would otherwise wrap around in the lookup tables and act as another action
+        if ((actions < 0) | (actions >= NUM_ACTIONS)).any():
+            raise ValueError(f"Action codes must be in 0..{NUM_ACTIONS - 1}")
+        cfg = self.config
+        ei = self._env_index
+        n = self.grid_size
+        reward = np.zeros(self.num_envs, dtype=np.int64)
+        lost = np.zeros(self.num_envs, dtype=bool)
+        event_bits = np.zeros(self.num_envs, dtype=np.uint8)
+
+        # Moves: a bump leaves the agent in place at no cost
+        is_move = actions <= MOVE_RIGHT
+        move_code = np.where(is_move, actions, 0)
+        new_r = self.row + np.where(is_move, _MOVE_DR[move_code], 0)
+        new_c = self.col + np.where(is_move, _MOVE_DC[move_code], 0)
+        in_bounds = (new_r >= 0) & (new_r < n) & (new_c >= 0) & (new_c < n)
+        bumped = is_move & ~in_bounds
+        moved = is_move & in_bounds
+        event_bits[bumped] |= BUMP_BIT
+        self.row = np.where(moved, new_r, self.row)
+        self.col = np.where(moved, new_c, self.col)
+        reward[moved] += cfg.MOVE_COST
+        fell = moved & self.pits[ei, self.row, self.col]
+        eaten = moved & ~fell & self.wumpus[ei, self.row, self.col] & self.wumpus_alive
+        reward[fell] += cfg.FALL_IN_PIT_COST
+        reward[eaten] += cfg.WUMPUS_KILL_COST
+        lost |= fell | eaten
+
+        # Turns
+        self.direction = np.where(actions == TURN_LEFT, (self.direction + 1) % 4, self.direction)
+        self.direction = np.where(actions == TURN_RIGHT, (self.direction + 3) % 4, self.direction)
+
+        # Shooting: the arrow flies one square in the facing direction
+        shot = (actions == SHOOT) & self.has_arrow
+        self.has_arrow &= ~shot
+        reward[shot] += cfg.SHOOT_COST
+        target_r = self.row + _DIRECTION_DR[self.direction]
+        target_c = self.col + _DIRECTION_DC[self.direction]
+        target_ok = (target_r >= 0) & (target_r < n) & (target_c >= 0) & (target_c < n)
+        hit = np.zeros(self.num_envs, dtype=bool)
+        aim = np.flatnonzero(shot & target_ok)
+        if aim.size:
+            hit[aim] = self.wumpus[aim, target_r[aim], target_c[aim]] & self.wumpus_alive[aim]
+        self.wumpus_alive &= ~hit
+        reward[hit] += cfg.WUMPUS_DEFEAT_REWARD
+        event_bits[hit] |= SCREAM_BIT
+
+        # Grabbing
+        grabbed = (actions == GRAB) & self.gold[ei, self.row, self.col] & ~self.gold_collected & ~self.has_gold
+        self.has_gold |= grabbed
+        self.gold_collected |= grabbed
+        reward[grabbed] += cfg.GRAB_GOLD_REWARD
+
+        # Climbing out
+        start_r, start_c = cfg.AGENT_START
+        climbed = (actions == CLIMB) & self.has_gold & (self.row == start_r) & (self.col == start_c)
+        reward[climbed] += cfg.CLIMB_OUT_REWARD
+        self.won |= climbed
+
+        self.score += reward
+        self.steps += 1
+        dones = lost | climbed | (self.steps >= self.max_steps)
+
+        percepts = self._percepts() | event_bits
+        self.final_score = np.where(dones, self.score, 0)
+        self.final_won = dones & self.won
+        if dones.any():
+            percepts = np.where(dones, self.reset(dones), percepts)
+        return percepts, reward, dones